@@ -0,0 +1,28 @@
+"""
+Reproducible performance benchmarks for the TTS models.
+
+Run with `python -m benchmarks.run`; see benchmarks/run.py for options.
+"""
+
+from .backends import BACKENDS, WEIGHTLESS_BACKENDS, StubBackend, ModelBackend
+from .harness import (
+    SCHEMA_VERSION,
+    TEXTS,
+    benchmark_backend,
+    run_isolated,
+    make_run_record,
+    append_history
+)
+
+__all__ = [
+    "BACKENDS",
+    "WEIGHTLESS_BACKENDS",
+    "StubBackend",
+    "ModelBackend",
+    "SCHEMA_VERSION",
+    "TEXTS",
+    "benchmark_backend",
+    "run_isolated",
+    "make_run_record",
+    "append_history",
+]
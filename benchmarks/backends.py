@@ -0,0 +1,86 @@
+"""
+Benchmark backends.
+
+A backend loads a model and exposes `synthesize(text, reference_audio_path)`
+returning `(audio_array, sample_rate)`, so the harness times synthesis only
+(no directory creation or file writes). The stub backend needs no model
+weights and lets the harness run in CI; the real backends are opt-in.
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+class StubBackend:
+    """
+    Deterministic stand-in for a TTS model.
+
+    Sleeps in proportion to the text length and returns a sine tone whose
+    duration is also proportional to the text length, so RTF and latency
+    percentiles are stable across runs.
+    """
+
+    sample_rate = 22050
+
+    def __init__(
+        self,
+        load_seconds: float = 0.05,
+        seconds_per_char: float = 0.0005,
+        audio_seconds_per_char: float = 0.06
+    ):
+        """
+        Initialize stub (the sleep simulates model loading).
+
+        Args:
+            load_seconds: Simulated load time
+            seconds_per_char: Simulated synthesis time per input character
+            audio_seconds_per_char: Generated audio duration per character
+        """
+        time.sleep(load_seconds)
+        self.seconds_per_char = seconds_per_char
+        self.audio_seconds_per_char = audio_seconds_per_char
+
+    def synthesize(self, text: str, reference_audio_path: Path) -> Tuple[np.ndarray, int]:
+        """Return a tone whose length depends on the text."""
+        time.sleep(self.seconds_per_char * len(text))
+        num_samples = int(self.sample_rate * self.audio_seconds_per_char * len(text))
+        t = np.arange(num_samples, dtype=np.float32) / self.sample_rate
+        return 0.1 * np.sin(2 * np.pi * 220.0 * t), self.sample_rate
+
+
+class ModelBackend:
+    """Adapter exposing a registered model wrapper as a benchmark backend."""
+
+    def __init__(self, model_name: str, **model_kwargs):
+        """
+        Load a model through the registry.
+
+        Args:
+            model_name: Registered model name ("yourtts" or "xtts")
+            **model_kwargs: Constructor options (e.g. backend="onnx")
+        """
+        from models import load_model
+
+        self.model = load_model(model_name, **model_kwargs)
+        self.sample_rate = self.model.sample_rate
+
+    def synthesize(self, text: str, reference_audio_path: Path) -> Tuple[np.ndarray, int]:
+        """Synthesize in memory without writing a file."""
+        result = self.model.generate(
+            text, reference_audio_path, save=False, use_cache=False)
+        return result.audio, result.sample_rate
+
+
+# Backend name -> factory. Only "stub" runs by default.
+BACKENDS: Dict[str, Callable[[], object]] = {
+    'stub': StubBackend,
+    'yourtts': lambda: ModelBackend('yourtts'),
+    'yourtts-onnx': lambda: ModelBackend('yourtts', backend='onnx'),
+    'xtts': lambda: ModelBackend('xtts'),
+}
+
+# Backends that need no model weights or reference audio
+WEIGHTLESS_BACKENDS = {'stub'}
@@ -0,0 +1,224 @@
+"""
+Benchmark harness measuring load time, latency percentiles, RTF and peak RSS.
+"""
+
+import datetime
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .backends import BACKENDS
+
+
+# Version of the history file layout; bump when fields change meaning
+SCHEMA_VERSION = 1
+
+# Benchmark texts by length class
+TEXTS = {
+    'short': "Hello, this is a test of voice cloning.",
+    'medium': (
+        "Zero-shot voice cloning reproduces a speaker's voice from a few "
+        "seconds of reference audio. The model has never seen this speaker "
+        "during training."
+    ),
+    'long': (
+        "Zero-shot voice cloning reproduces a speaker's voice from a few "
+        "seconds of reference audio. The model has never seen this speaker "
+        "during training, so everything it knows about the voice comes from "
+        "the reference clip. Speaker similarity, intelligibility and speed "
+        "all depend on how well the conditioning captures timbre and "
+        "prosody. Longer inputs are split into sentences and synthesized one "
+        "after another, which is why latency grows with the amount of text. "
+        "This paragraph exercises that path."
+    ),
+}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _library_versions() -> Dict[str, str]:
+    """Versions of the model libraries loaded in this process."""
+    versions = {}
+    for module_name in ('torch', 'TTS'):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            versions[module_name.lower()] = getattr(module, '__version__', None)
+    return versions
+
+
+def _summarize(latencies: List[float], audio_durations: List[float]) -> Dict[str, float]:
+    """Latency percentiles and RTF for a list of timed calls."""
+    latencies = np.array(latencies)
+    rtfs = latencies / np.maximum(np.array(audio_durations), 1e-9)
+    return {
+        'calls': int(len(latencies)),
+        'latency_mean': float(latencies.mean()),
+        'latency_p50': float(np.percentile(latencies, 50)),
+        'latency_p95': float(np.percentile(latencies, 95)),
+        'latency_p99': float(np.percentile(latencies, 99)),
+        'audio_duration': float(np.mean(audio_durations)),
+        'rtf_mean': float(rtfs.mean()),
+        'rtf_p50': float(np.percentile(rtfs, 50)),
+    }
+
+
+def benchmark_backend(
+    name: str,
+    reference_audio_path: Optional[Path],
+    repeats: int = 5
+) -> Dict:
+    """
+    Benchmark one backend in the current process.
+
+    The first call after loading is timed separately (it includes lazy
+    initialization and allocator warm-up). Every text class is then run
+    `repeats` times warm.
+
+    Args:
+        name: Backend name in BACKENDS
+        reference_audio_path: Reference audio for voice cloning
+        repeats: Warm calls per text class
+
+    Returns:
+        Dictionary with load_time, first_call, per-text stats, overall warm
+        stats, peak_rss_mb and library versions
+    """
+    load_start = time.perf_counter()
+    backend = BACKENDS[name]()
+    load_time = time.perf_counter() - load_start
+
+    start_time = time.perf_counter()
+    audio, sr = backend.synthesize(TEXTS['short'], reference_audio_path)
+    first_call_latency = time.perf_counter() - start_time
+    first_call_duration = len(audio) / sr
+
+    per_text = {}
+    all_latencies, all_durations = [], []
+    for text_class, text in TEXTS.items():
+        latencies, durations = [], []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            audio, sr = backend.synthesize(text, reference_audio_path)
+            latencies.append(time.perf_counter() - start_time)
+            durations.append(len(audio) / sr)
+
+        per_text[text_class] = _summarize(latencies, durations)
+        all_latencies.extend(latencies)
+        all_durations.extend(durations)
+
+    return {
+        'load_time': load_time,
+        'first_call': {
+            'latency': first_call_latency,
+            'rtf': first_call_latency / first_call_duration if first_call_duration else float('inf')
+        },
+        'warm': _summarize(all_latencies, all_durations),
+        'texts': per_text,
+        'peak_rss_mb': _peak_rss_mb(),
+        'versions': _library_versions(),
+    }
+
+
+def run_isolated(name: str, reference_audio_path: Optional[Path], repeats: int = 5) -> Dict:
+    """
+    Benchmark a backend in a fresh spawned process.
+
+    A separate process per backend keeps load time cold and peak RSS
+    attributable to a single model.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+        return executor.submit(benchmark_backend, name, reference_audio_path, repeats).result()
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the project, if available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment() -> Dict:
+    """Host details recorded with each run."""
+    return {
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+
+
+def make_run_record(results: Dict[str, Dict], repeats: int) -> Dict:
+    """
+    Wrap backend results with run metadata.
+
+    Args:
+        results: Backend name -> benchmark_backend() result
+        repeats: Warm calls per text class
+
+    Returns:
+        Run record for the history file
+    """
+    return {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'git_commit': _git_commit(),
+        'environment': _environment(),
+        'config': {
+            'repeats': repeats,
+            'texts': {text_class: len(text) for text_class, text in TEXTS.items()}
+        },
+        'backends': results,
+    }
+
+
+def append_history(history_path: Path, run_record: Dict) -> None:
+    """
+    Append a run to the versioned JSON history file.
+
+    Args:
+        history_path: History file path
+        run_record: Record from make_run_record()
+
+    Raises:
+        ValueError: If the file was written with a different schema version
+    """
+    history = {'schema_version': SCHEMA_VERSION, 'runs': []}
+    if history_path.exists():
+        with open(history_path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        if history.get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(
+                f"{history_path} has schema version {history.get('schema_version')}, "
+                f"expected {SCHEMA_VERSION}")
+
+    history['runs'].append(run_record)
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = history_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, history_path)
@@ -0,0 +1,150 @@
+"""
+Run the benchmark suite and append the results to the history file.
+
+Only the stub backend runs by default, so the harness works without model
+weights (e.g. in CI). Real models are opt-in:
+
+    python -m benchmarks.run --backends yourtts xtts
+
+Benchmark YourTTS on ONNX Runtime next to eager PyTorch:
+
+    python -m benchmarks.run --backends yourtts yourtts-onnx
+"""
+
+import argparse
+from pathlib import Path
+
+from utils import REFERENCE_DIR, REFERENCE_AUDIO_EXTENSIONS, BENCHMARK_HISTORY_FILE
+
+from .backends import BACKENDS, WEIGHTLESS_BACKENDS
+from .harness import append_history, make_run_record, run_isolated
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark load time, latency percentiles, RTF and peak RSS"
+    )
+
+    parser.add_argument(
+        '--backends',
+        type=str,
+        nargs='+',
+        choices=sorted(BACKENDS),
+        default=['stub'],
+        help='Backends to benchmark (default: stub only)'
+    )
+    parser.add_argument(
+        '--repeats',
+        type=int,
+        default=5,
+        help='Warm calls per text length'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--history',
+        type=str,
+        default=str(BENCHMARK_HISTORY_FILE),
+        help='Versioned JSON history file to append to'
+    )
+    parser.add_argument(
+        '--no-save',
+        action='store_true',
+        help='Print results without appending them to the history'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = sorted(
+        path for path in REFERENCE_DIR.glob("*")
+        if path.suffix.lower() in REFERENCE_AUDIO_EXTENSIONS
+    )
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def display_results(results: dict) -> None:
+    """Print a summary table per backend."""
+    for name, result in results.items():
+        print("\n" + "=" * 60)
+        print(f"{name}: load {result['load_time']:.2f}s, "
+              f"first call {result['first_call']['latency']:.3f}s, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MiB")
+        print("-" * 60)
+        print(f"{'Text':<10}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}"
+              f"{'Audio (s)':>11}{'RTF':>9}")
+        rows = list(result['texts'].items()) + [('all warm', result['warm'])]
+        for text_class, stats in rows:
+            print(f"{text_class:<10}{stats['latency_p50']:>10.3f}{stats['latency_p95']:>10.3f}"
+                  f"{stats['latency_p99']:>10.3f}{stats['audio_duration']:>11.2f}"
+                  f"{stats['rtf_mean']:>9.3f}")
+    print("=" * 60)
+
+
+def display_comparison(results: dict) -> None:
+    """Print load time and warm RTF per backend relative to the first one."""
+    names = list(results)
+    baseline = results[names[0]]
+    print(f"\nComparison (relative to {names[0]})")
+    print("-" * 60)
+    print(f"{'Backend':<16}{'Load (s)':>10}{'x':>7}{'Warm RTF':>11}{'x':>7}")
+    for name in names:
+        result = results[name]
+        load_ratio = baseline['load_time'] / max(result['load_time'], 1e-9)
+        rtf_ratio = baseline['warm']['rtf_mean'] / max(result['warm']['rtf_mean'], 1e-9)
+        print(f"{name:<16}{result['load_time']:>10.2f}{load_ratio:>7.2f}"
+              f"{result['warm']['rtf_mean']:>11.3f}{rtf_ratio:>7.2f}")
+    print("=" * 60)
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("TTS Benchmark Suite")
+    print("=" * 60)
+
+    reference_audio_path = None
+    if any(name not in WEIGHTLESS_BACKENDS for name in args.backends):
+        reference_audio_path = find_reference_audio(args.reference)
+        print(f"Reference audio: {reference_audio_path}")
+
+    results = {}
+    for name in args.backends:
+        print(f"\nBenchmarking {name} ({args.repeats} warm calls per text)...")
+        results[name] = run_isolated(name, reference_audio_path, args.repeats)
+
+    display_results(results)
+    if len(results) > 1:
+        display_comparison(results)
+
+    if not args.no_save:
+        history_path = Path(args.history)
+        append_history(history_path, make_run_record(results, args.repeats))
+        print(f"\n✓ Results appended to: {history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Evaluation utilities for generated speech (speaker similarity, PESQ, STOI).
+"""
+
+from .metrics import (
+    METRIC_SAMPLE_RATE,
+    METRIC_VERSIONS,
+    calculate_speaker_similarity,
+    calculate_pesq_score,
+    calculate_stoi_score,
+    embed_speaker,
+    pesq_from_audio,
+    stoi_from_audio
+)
+
+from .cache import MetricCache
+
+from .embedding_index import EmbeddingIndex, pair_similarity
+
+from .engine import (
+    AudioBank,
+    evaluate_pairs,
+    evaluate_rows,
+    load_metrics_from_json,
+    resolve_audio_paths,
+    summarize,
+    update_evaluation
+)
+
+__all__ = [
+    # Metrics
+    "METRIC_SAMPLE_RATE",
+    "METRIC_VERSIONS",
+    "calculate_speaker_similarity",
+    "calculate_pesq_score",
+    "calculate_stoi_score",
+    "embed_speaker",
+    "pesq_from_audio",
+    "stoi_from_audio",
+    # Batch engine
+    "AudioBank",
+    "evaluate_pairs",
+    "evaluate_rows",
+    "load_metrics_from_json",
+    "resolve_audio_paths",
+    "summarize",
+    "update_evaluation",
+    # Metric cache
+    "MetricCache",
+    # Embedding index
+    "EmbeddingIndex",
+    "pair_similarity",
+]
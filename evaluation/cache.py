@@ -0,0 +1,128 @@
+"""
+Content-addressed cache of computed metric values.
+
+A value is keyed by (reference content hash, generated content hash, metric
+name, metric version), so renaming or moving files keeps their scores, while
+re-generating a file or changing how a metric is computed (bumping its entry
+in METRIC_VERSIONS) invalidates them.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils import METRIC_CACHE_FILE, make_cache_key
+
+from .metrics import METRIC_VERSIONS
+
+
+# Layout version of the cache file
+_CACHE_FILE_VERSION = 1
+
+
+class MetricCache:
+    """Metric values stored in a single JSON file, loaded once and saved atomically."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize cache.
+
+        Args:
+            path: Cache file (uses config default if None)
+        """
+        self.path = Path(path or METRIC_CACHE_FILE)
+        self._entries = self._read()
+        self._pending: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def _read(self) -> Dict[str, float]:
+        """Load entries from disk (empty if missing, unreadable or from another layout)."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != _CACHE_FILE_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    @staticmethod
+    def make_key(reference_hash: str, generated_hash: str, metric: str) -> str:
+        """Cache key for a metric of a (reference, generated) pair."""
+        return make_cache_key(reference_hash, generated_hash, metric, METRIC_VERSIONS[metric])
+
+    def get(self, reference_hash: str, generated_hash: str, metric: str) -> Optional[float]:
+        """
+        Look up a metric value.
+
+        Args:
+            reference_hash: Content hash of the reference file
+            generated_hash: Content hash of the generated file
+            metric: Metric name ("similarity", "pesq" or "stoi")
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        value = self._entries.get(self.make_key(reference_hash, generated_hash, metric))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, reference_hash: str, generated_hash: str, metric: str, value: float) -> None:
+        """
+        Store a metric value (kept in memory until save()).
+
+        Args:
+            reference_hash: Content hash of the reference file
+            generated_hash: Content hash of the generated file
+            metric: Metric name
+            value: Computed value
+        """
+        key = self.make_key(reference_hash, generated_hash, metric)
+        self._entries[key] = value
+        self._pending[key] = value
+        self.stored += 1
+
+    def save(self) -> None:
+        """Write new entries, merged with whatever other processes saved meanwhile."""
+        if not self._pending:
+            return
+
+        entries = self._read()
+        entries.update(self._pending)
+        self._entries.update(entries)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': _CACHE_FILE_VERSION, 'entries': entries}, f)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, stored (new this
+            session) and entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stored': self.stored,
+            'entries': len(self._entries),
+        }
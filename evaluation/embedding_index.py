@@ -0,0 +1,293 @@
+"""
+Append-only on-disk index of Resemblyzer speaker embeddings.
+
+Embeddings of reference and generated files are stored as rows of a
+float32 matrix (`embeddings.f32`), with one JSON line per row in
+`index.jsonl` recording the file's content hash, path and kind. Rows are
+only ever appended, so the matrix can be memory-mapped and similarities for
+any set of pairs come from one vectorized product. Resemblyzer embeddings
+are L2-normalized, so dot products are cosine similarities.
+
+Appends take an exclusive lock on the index directory, so several processes
+can share it.
+"""
+
+import fcntl
+import json
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import EMBEDDING_INDEX_DIR, hash_file
+
+from .metrics import METRIC_SAMPLE_RATE, METRIC_VERSIONS, embed_speaker
+
+
+def pair_similarity(matrix: np.ndarray, rows_a: Sequence[int], rows_b: Sequence[int]) -> np.ndarray:
+    """
+    Row-wise dot products of two sets of embedding rows.
+
+    Args:
+        matrix: Embedding matrix [N, D]
+        rows_a: Row indices of the first element of each pair
+        rows_b: Row indices of the second element of each pair
+
+    Returns:
+        Similarity per pair
+    """
+    if len(rows_a) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.einsum('ij,ij->i', matrix[np.asarray(rows_a)], matrix[np.asarray(rows_b)])
+
+
+class EmbeddingIndex:
+    """Content-addressed, append-only matrix of speaker embeddings."""
+
+    def __init__(self, index_dir: Optional[Path] = None, version: str = METRIC_VERSIONS['similarity']):
+        """
+        Open (or create) an index.
+
+        An index written with a different embedding version is discarded.
+
+        Args:
+            index_dir: Index directory (uses config default if None)
+            version: Embedding version stored with the index
+        """
+        self.index_dir = Path(index_dir or EMBEDDING_INDEX_DIR)
+        self.version = version
+        self.dim: Optional[int] = None
+        self.hashes: List[str] = []
+        self.paths: List[str] = []
+        self.kinds: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix: Optional[np.ndarray] = None
+        self.added = 0
+
+        meta = self._read_meta()
+        if meta is not None and meta.get('version') != version:
+            print(f"Embedding index version changed ({meta.get('version')} -> {version}), rebuilding")
+            shutil.rmtree(self.index_dir)
+            meta = None
+        if meta is not None:
+            self.dim = meta['dim']
+            self._read_new_rows()
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self.index_dir / "embeddings.f32"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.index_dir / "index.jsonl"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.index_dir / "meta.json"
+
+    def _read_meta(self) -> Optional[Dict]:
+        """Read the index metadata, or None for a new index."""
+        try:
+            with open(self._meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index's exclusive append lock."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / ".lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_new_rows(self) -> None:
+        """Pick up rows appended since the last read (by this or another process)."""
+        try:
+            with open(self._index_path, 'rb') as f:
+                f.seek(self._index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Ignore a trailing partial line
+        complete = data[:data.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            self._rows.setdefault(entry['hash'], len(self.hashes))
+            self.hashes.append(entry['hash'])
+            self.paths.append(entry.get('path'))
+            self.kinds.append(entry.get('kind'))
+        self._index_offset += len(complete)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._rows
+
+    def row_of(self, content_hash: str) -> Optional[int]:
+        """Row of an embedding by file content hash, or None if absent."""
+        return self._rows.get(content_hash)
+
+    def rows_of_kind(self, kind: str) -> List[int]:
+        """Rows added with the given kind ("reference" or "generated")."""
+        return [row for row, row_kind in enumerate(self.kinds) if row_kind == kind]
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Read-only memory map of the embedding matrix [N, D]."""
+        if self._matrix is None or len(self._matrix) != len(self):
+            if not len(self):
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self._matrix_path, dtype=np.float32, mode='r', shape=(len(self), self.dim))
+        return self._matrix
+
+    def add(
+        self,
+        content_hashes: Sequence[str],
+        embeddings: np.ndarray,
+        paths: Optional[Sequence[str]] = None,
+        kinds: Optional[Sequence[Optional[str]]] = None
+    ) -> List[int]:
+        """
+        Append embeddings for files not yet in the index.
+
+        Args:
+            content_hashes: Content hash per embedding
+            embeddings: Embedding matrix [M, D]
+            paths: Optional source path per embedding
+            kinds: Optional kind per embedding ("reference" or "generated")
+
+        Returns:
+            Row of every given hash (existing rows are kept)
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(content_hashes), -1)
+        paths = paths or [None] * len(content_hashes)
+        kinds = kinds or [None] * len(content_hashes)
+
+        with self._locked():
+            if self.dim is None:
+                meta = self._read_meta()
+                if meta is None:
+                    meta = {'dim': int(embeddings.shape[1]), 'version': self.version}
+                    with open(self._meta_path, 'w', encoding='utf-8') as f:
+                        json.dump(meta, f)
+                self.dim = meta['dim']
+            if embeddings.shape[1] != self.dim:
+                raise ValueError(f"Embedding size {embeddings.shape[1]} does not match index size {self.dim}")
+            self._read_new_rows()
+
+            new = {}
+            for i, content_hash in enumerate(content_hashes):
+                if content_hash not in self._rows and content_hash not in new:
+                    new[content_hash] = i
+
+            if new:
+                # Drop vectors left by an append that crashed before its index line
+                row_bytes = self.dim * 4
+                with open(self._matrix_path, 'ab') as f:
+                    if f.tell() != len(self) * row_bytes:
+                        f.truncate(len(self) * row_bytes)
+                    f.write(embeddings[list(new.values())].tobytes())
+                with open(self._index_path, 'ab') as f:
+                    for content_hash, i in new.items():
+                        f.write((json.dumps({
+                            'hash': content_hash,
+                            'path': str(paths[i]) if paths[i] is not None else None,
+                            'kind': kinds[i]
+                        }) + '\n').encode('utf-8'))
+                self._read_new_rows()
+                self.added += len(new)
+
+        return [self._rows[content_hash] for content_hash in content_hashes]
+
+    def ensure(
+        self,
+        audio_paths: Iterable[Path],
+        kind: Optional[str] = None,
+        loader: Optional[Callable[[Path], np.ndarray]] = None
+    ) -> Dict[Path, Optional[int]]:
+        """
+        Make sure every file has an embedding, computing only missing ones.
+
+        Args:
+            audio_paths: Audio files
+            kind: Kind recorded for newly added rows
+            loader: Function returning a file's audio at METRIC_SAMPLE_RATE
+                (librosa decode if None)
+
+        Returns:
+            Row per path (None where the embedding could not be computed)
+        """
+        if loader is None:
+            import librosa
+            loader = lambda path: librosa.load(path, sr=METRIC_SAMPLE_RATE, mono=True)[0]
+
+        audio_paths = list(dict.fromkeys(audio_paths))
+        hashes = {path: hash_file(path) for path in audio_paths}
+
+        new_hashes, new_embeddings, new_paths = [], [], []
+        for path in audio_paths:
+            if hashes[path] in self._rows or hashes[path] in new_hashes:
+                continue
+            try:
+                new_embeddings.append(embed_speaker(loader(path), METRIC_SAMPLE_RATE))
+            except Exception as e:
+                print(f"Error calculating similarity: {e}")
+                continue
+            new_hashes.append(hashes[path])
+            new_paths.append(str(path))
+
+        if new_hashes:
+            self.add(new_hashes, np.stack(new_embeddings), new_paths, [kind] * len(new_hashes))
+        return {path: self._rows.get(hashes[path]) for path in audio_paths}
+
+    def similarity(self, rows_a: Sequence[int], rows_b: Sequence[int]) -> np.ndarray:
+        """Cosine similarity of each (rows_a[i], rows_b[i]) pair."""
+        return pair_similarity(self.embeddings, rows_a, rows_b)
+
+    def nearest(
+        self,
+        query_rows: Sequence[int],
+        candidate_rows: Sequence[int],
+        k: int = 1,
+        chunk_size: int = 4096
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the most similar candidates for each query.
+
+        Args:
+            query_rows: Rows to look up (e.g. generated files)
+            candidate_rows: Rows to search (e.g. references)
+            k: Number of neighbours per query
+            chunk_size: Queries per matrix product (bounds memory)
+
+        Returns:
+            Tuple of (candidate rows [Q, k], similarities [Q, k]), best first
+        """
+        matrix = self.embeddings
+        candidate_rows = np.asarray(candidate_rows)
+        candidates = np.ascontiguousarray(matrix[candidate_rows])
+        k = min(k, len(candidate_rows))
+
+        nearest_rows, nearest_scores = [], []
+        query_rows = np.asarray(query_rows)
+        for start in range(0, len(query_rows), chunk_size):
+            scores = matrix[query_rows[start:start + chunk_size]] @ candidates.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            nearest_rows.append(candidate_rows[np.take_along_axis(top, order, axis=1)])
+            nearest_scores.append(np.take_along_axis(top_scores, order, axis=1))
+
+        if not nearest_rows:
+            return np.zeros((0, k), dtype=np.int64), np.zeros((0, k), dtype=np.float32)
+        return np.concatenate(nearest_rows), np.concatenate(nearest_scores)
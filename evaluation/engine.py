@@ -0,0 +1,444 @@
+"""
+Batch evaluation engine for generated speech.
+
+Scoring many files with the per-file metric functions decodes every file
+three times (once per metric) and reloads the speaker encoder per call.
+The engine instead:
+
+- decodes each unique file once per sample rate and shares the buffer
+  across metrics (a reference used by many rows is decoded once),
+- embeds each unique file once with a single Resemblyzer encoder (with an
+  EmbeddingIndex, once ever) and scores all similarity pairs with one
+  vectorized product,
+- computes PESQ and STOI in a process pool while the main process runs the
+  speaker encoder,
+- with a MetricCache, skips metrics already computed for the same file
+  contents, and update_evaluation() only evaluates rows that are new or
+  whose files changed.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import REFERENCE_DIR, GENERATED_YOURTTS_DIR, GENERATED_XTTS_DIR, ResultsStore, hash_file
+
+from .cache import MetricCache
+from .embedding_index import EmbeddingIndex, pair_similarity
+from .metrics import METRIC_SAMPLE_RATE, embed_speaker, pesq_from_audio, stoi_from_audio
+
+
+# Metrics computed for every pair
+METRICS = ('similarity', 'pesq', 'stoi')
+
+# Columns aggregated per model in the summary
+SUMMARY_COLUMNS = ['rtf', 'similarity', 'pesq', 'stoi']
+
+
+class AudioBank:
+    """In-memory decode-once store of audio buffers keyed by (path, sample rate)."""
+
+    def __init__(self):
+        self._buffers: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def get(self, audio_path: Path, sample_rate: int) -> np.ndarray:
+        """
+        Get a file decoded at `sample_rate`, decoding it on first request.
+
+        Args:
+            audio_path: Path to audio file
+            sample_rate: Target sample rate
+
+        Returns:
+            Mono float32 waveform
+        """
+        key = (str(audio_path), sample_rate)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            import librosa
+            buffer, _ = librosa.load(audio_path, sr=sample_rate, mono=True)
+            self._buffers[key] = buffer
+        return buffer
+
+    def load_all(self, audio_paths: Iterable[Path], sample_rate: int, workers: int = 1) -> None:
+        """
+        Decode several files concurrently (decoding and resampling release the GIL).
+
+        Args:
+            audio_paths: Files to decode
+            sample_rate: Target sample rate
+            workers: Decoder threads
+        """
+        missing = [
+            path for path in dict.fromkeys(audio_paths)
+            if (str(path), sample_rate) not in self._buffers
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            list(executor.map(lambda path: self.get(path, sample_rate), missing))
+
+
+def _quality_scores(
+    ref_audio: np.ndarray,
+    gen_audio: np.ndarray,
+    sr: int
+) -> Tuple[Optional[float], Optional[float]]:
+    """PESQ and STOI of one pair (runs in a pool worker; errors become None)."""
+    try:
+        pesq_value = pesq_from_audio(ref_audio, gen_audio, sr)
+    except Exception as e:
+        print(f"Error calculating PESQ: {e}")
+        pesq_value = None
+    try:
+        stoi_value = stoi_from_audio(ref_audio, gen_audio, sr)
+    except Exception as e:
+        print(f"Error calculating STOI: {e}")
+        stoi_value = None
+    return pesq_value, stoi_value
+
+
+def _embed(audio: np.ndarray, sr: int) -> Optional[np.ndarray]:
+    """Speaker embedding of one buffer (errors become None)."""
+    try:
+        return embed_speaker(audio, sr)
+    except Exception as e:
+        print(f"Error calculating similarity: {e}")
+        return None
+
+
+def evaluate_pairs(
+    pairs: Sequence[Tuple[Path, Path]],
+    workers: Optional[int] = None,
+    sample_rate: int = METRIC_SAMPLE_RATE,
+    cache: Optional[MetricCache] = None,
+    index: Optional[EmbeddingIndex] = None
+) -> List[Dict[str, Optional[float]]]:
+    """
+    Compute similarity, PESQ and STOI for (reference, generated) pairs.
+
+    With a cache, only metrics without a cached value are computed, and
+    only files taking part in those computations are decoded. With an
+    embedding index, files already embedded are not decoded for similarity.
+
+    Args:
+        pairs: (reference_path, generated_path) tuples; both files must exist
+        workers: PESQ/STOI worker processes (CPU count if None; 1 runs
+            everything in this process)
+        sample_rate: Rate all metrics are computed at
+        cache: Optional metric cache to read from and update
+        index: Optional embedding index to read from and append to
+
+    Returns:
+        One dictionary with similarity, pesq and stoi per pair, in order
+        (None where a metric could not be computed)
+    """
+    results = [dict.fromkeys(METRICS) for _ in pairs]
+    if not pairs:
+        return results
+    workers = workers or os.cpu_count() or 1
+
+    hashes = {}
+    if cache is not None or index is not None:
+        for ref, gen in pairs:
+            hashes.setdefault(ref, hash_file(ref))
+            hashes.setdefault(gen, hash_file(gen))
+    if cache is not None:
+        for (ref, gen), result in zip(pairs, results):
+            for metric in METRICS:
+                result[metric] = cache.get(hashes[ref], hashes[gen], metric)
+
+    need_similarity = [i for i, result in enumerate(results) if result['similarity'] is None]
+    need_quality = [
+        i for i, result in enumerate(results)
+        if result['pesq'] is None or result['stoi'] is None
+    ]
+    if not need_similarity and not need_quality:
+        print(f"All {len(pairs)} pairs served from the metric cache")
+        return results
+
+    # Decode every file that still needs scoring, once
+    start_time = time.perf_counter()
+    bank = AudioBank()
+    embed_paths = list(dict.fromkeys(path for i in need_similarity for path in pairs[i]))
+    if index is not None:
+        unembedded = [path for path in embed_paths if hashes[path] not in index]
+    else:
+        unembedded = embed_paths
+    decode_paths = list(dict.fromkeys(
+        unembedded + [path for i in need_quality for path in pairs[i]]))
+    bank.load_all(decode_paths, sample_rate, workers)
+    print(f"Decoded {len(decode_paths)} files in {time.perf_counter() - start_time:.1f}s")
+
+    start_time = time.perf_counter()
+    executor = None
+    if workers > 1 and need_quality:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+    try:
+        if executor is not None:
+            futures = [
+                executor.submit(_quality_scores, bank.get(pairs[i][0], sample_rate),
+                                bank.get(pairs[i][1], sample_rate), sample_rate)
+                for i in need_quality
+            ]
+
+        # The speaker encoder runs here while the pool works on PESQ/STOI
+        if index is not None:
+            loader = lambda path: bank.get(path, sample_rate)
+            rows = index.ensure([pairs[i][0] for i in need_similarity], 'reference', loader)
+            rows.update(index.ensure([pairs[i][1] for i in need_similarity], 'generated', loader))
+            matrix = index.embeddings
+        else:
+            embeddings = {path: _embed(bank.get(path, sample_rate), sample_rate) for path in embed_paths}
+            embedded = [path for path in embed_paths if embeddings[path] is not None]
+            rows = {path: row for row, path in enumerate(embedded)}
+            matrix = np.stack([embeddings[path] for path in embedded]) if embedded else None
+
+        if executor is not None:
+            scores = [future.result() for future in futures]
+        else:
+            scores = [
+                _quality_scores(bank.get(pairs[i][0], sample_rate),
+                                bank.get(pairs[i][1], sample_rate), sample_rate)
+                for i in need_quality
+            ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print(f"Scored {len(set(need_similarity) | set(need_quality))} pairs in "
+          f"{time.perf_counter() - start_time:.1f}s "
+          f"({workers} worker{'s' if workers != 1 else ''})")
+
+    # All similarities in one vectorized product
+    computed = {}
+    embedded_pairs = [
+        i for i in need_similarity
+        if rows.get(pairs[i][0]) is not None and rows.get(pairs[i][1]) is not None
+    ]
+    if embedded_pairs:
+        similarities = pair_similarity(
+            matrix,
+            [rows[pairs[i][0]] for i in embedded_pairs],
+            [rows[pairs[i][1]] for i in embedded_pairs])
+        for i, value in zip(embedded_pairs, similarities):
+            computed[(i, 'similarity')] = float(value)
+    for i, (pesq_value, stoi_value) in zip(need_quality, scores):
+        computed[(i, 'pesq')] = pesq_value
+        computed[(i, 'stoi')] = stoi_value
+
+    for (i, metric), value in computed.items():
+        if results[i][metric] is None:
+            results[i][metric] = value
+            # Failed computations are not cached, so they are retried
+            if cache is not None and value is not None:
+                ref, gen = pairs[i]
+                cache.put(hashes[ref], hashes[gen], metric, value)
+
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def load_metrics_from_json(json_path: Path) -> List[Dict]:
+    """
+    Load successful generations from a legacy run_all results file.
+
+    New runs are recorded in the results store (see ResultsStore.generations).
+
+    Args:
+        json_path: Path to a metrics_*.json file
+
+    Returns:
+        One row per successful model run
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    reference_audio = data.get('reference_audio', '')
+    rows = []
+    for model in data.get('models', []):
+        if model.get('success', False):
+            rows.append({
+                'timestamp': data.get('timestamp', 'unknown'),
+                'model': model['model'],
+                'reference_audio': reference_audio,
+                'output_path': model['output_path'],
+                'audio_duration': model['audio_duration'],
+                'generation_time': model['generation_time'],
+                'rtf': model['rtf'],
+                'success': True
+            })
+    return rows
+
+
+def resolve_audio_paths(row: Dict) -> Tuple[Path, Path]:
+    """
+    Locate a row's reference and generated files on this machine.
+
+    Results may have been written inside the container or on another host;
+    files that are not found at the recorded path are looked up by name in
+    the project's reference and generated directories.
+
+    Args:
+        row: Result row with reference_audio and output_path
+
+    Returns:
+        Tuple of (reference_path, generated_path), which may not exist
+    """
+    ref_path = Path(row['reference_audio'])
+    gen_path = Path(row['output_path'])
+
+    if not ref_path.exists():
+        ref_path = REFERENCE_DIR / ref_path.name
+    if not gen_path.exists():
+        for directory in (GENERATED_YOURTTS_DIR, GENERATED_XTTS_DIR):
+            if (directory / gen_path.name).exists():
+                gen_path = directory / gen_path.name
+                break
+
+    return ref_path, gen_path
+
+
+def evaluate_rows(
+    rows: List[Dict],
+    workers: Optional[int] = None,
+    cache: Optional[MetricCache] = None,
+    index: Optional[EmbeddingIndex] = None
+) -> List[Dict]:
+    """
+    Add similarity, pesq and stoi to each result row.
+
+    Rows also get reference_hash and generated_hash (content hashes of the
+    scored files). Rows whose audio files cannot be found get None for every
+    metric and hash.
+
+    Args:
+        rows: Rows from ResultsStore.generations or load_metrics_from_json
+        workers: PESQ/STOI worker processes (CPU count if None)
+        cache: Optional metric cache
+        index: Optional embedding index
+
+    Returns:
+        New rows with the metric and hash columns added
+    """
+    located = [resolve_audio_paths(row) for row in rows]
+    scorable = [i for i, (ref, gen) in enumerate(located) if ref.exists() and gen.exists()]
+    if len(scorable) < len(rows):
+        print(f"Skipping {len(rows) - len(scorable)} rows with missing audio files")
+
+    scores = dict(zip(scorable, evaluate_pairs(
+        [located[i] for i in scorable], workers, cache=cache, index=index)))
+    evaluated = []
+    for i, row in enumerate(rows):
+        ref, gen = located[i]
+        hashes = {'reference_hash': None, 'generated_hash': None}
+        if i in scores:
+            hashes = {'reference_hash': hash_file(ref), 'generated_hash': hash_file(gen)}
+        evaluated.append({**row, **hashes, **scores.get(i, dict.fromkeys(METRICS))})
+    return evaluated
+
+
+def summarize(df: "pandas.DataFrame") -> "pandas.DataFrame":
+    """Per-model mean, std, min and max of RTF and the quality metrics."""
+    return df.groupby('model')[SUMMARY_COLUMNS].agg(['mean', 'std', 'min', 'max']).round(3)
+
+
+def _row_key(row: Dict) -> Tuple[str, str, str]:
+    """Identity of a result row across runs of the evaluation."""
+    return (str(row['timestamp']), str(row['model']), str(row['output_path']))
+
+
+def update_evaluation(
+    rows: List[Dict],
+    output_csv: Path,
+    summary_csv: Path,
+    workers: Optional[int] = None,
+    cache: Optional[MetricCache] = None,
+    index: Optional[EmbeddingIndex] = None,
+    store: Optional[ResultsStore] = None
+) -> "pandas.DataFrame":
+    """
+    Bring the evaluation CSVs up to date with the given result rows.
+
+    Rows already in `output_csv` whose files still have the same content
+    hashes are reused as they are. Only new or changed rows are evaluated
+    (through the metric cache, if given). When the existing rows are all
+    still valid, the new ones are appended to the CSV; otherwise it is
+    rewritten. The summary is rewritten only if something changed. With a
+    results store, metrics it does not have yet are recorded in it.
+
+    Args:
+        rows: Rows from ResultsStore.generations or load_metrics_from_json
+        output_csv: Per-row results CSV
+        summary_csv: Per-model summary CSV
+        workers: PESQ/STOI worker processes (CPU count if None)
+        cache: Optional metric cache
+        index: Optional embedding index
+        store: Optional results store the rows were read from
+
+    Returns:
+        DataFrame with one evaluated row per input row, in input order
+    """
+    import pandas as pd
+
+    output_csv = Path(output_csv)
+    existing = {}
+    existing_columns = None
+    if output_csv.exists():
+        existing_df = pd.read_csv(output_csv, dtype={
+            'timestamp': str, 'model': str, 'output_path': str,
+            'reference_hash': str, 'generated_hash': str
+        })
+        existing_columns = list(existing_df.columns)
+        for record in existing_df.to_dict('records'):
+            existing[_row_key(record)] = record
+
+    # Reuse rows whose inputs are unchanged
+    reused, pending = {}, []
+    for i, row in enumerate(rows):
+        record = existing.get(_row_key(row))
+        # Rows with a failed (empty) metric are retried
+        if record is not None and all(pd.notna(record.get(metric)) for metric in METRICS):
+            ref, gen = resolve_audio_paths(row)
+            if (ref.exists() and gen.exists()
+                    and record.get('reference_hash') == hash_file(ref)
+                    and record.get('generated_hash') == hash_file(gen)):
+                reused[i] = {**record, **row, **{metric: record[metric] for metric in METRICS}}
+                continue
+        pending.append(i)
+    print(f"{len(reused)} rows unchanged, {len(pending)} to evaluate")
+
+    evaluated = dict(zip(pending, evaluate_rows([rows[i] for i in pending], workers, cache, index)))
+    combined = pd.DataFrame([
+        reused[i] if i in reused else evaluated[i] for i in range(len(rows))
+    ])
+
+    if store is not None:
+        unrecorded = [evaluated[i] for i in pending] + [
+            reused[i] for i in reused if any(metric not in rows[i] for metric in METRICS)]
+        if unrecorded:
+            store.record_quality(unrecorded, METRICS)
+
+    current_keys = {_row_key(row) for row in rows}
+    valid_existing = len(reused) == len(existing) and set(existing) <= current_keys
+    new_rows = pd.DataFrame([evaluated[i] for i in pending])
+    if not pending and valid_existing:
+        return combined
+
+    output_csv.parent.mkdir(parents=True, exist_ok=True)
+    if valid_existing and existing_columns == list(new_rows.columns):
+        new_rows.to_csv(output_csv, mode='a', header=False, index=False)
+        print(f"Appended {len(new_rows)} rows to {output_csv}")
+    else:
+        combined.to_csv(output_csv, index=False)
+        print(f"Rewrote {output_csv} ({len(combined)} rows)")
+
+    summarize(combined).to_csv(summary_csv)
+    return combined
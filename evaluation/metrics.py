@@ -0,0 +1,160 @@
+"""
+Quality and similarity metrics used by the evaluation notebook.
+
+PESQ and STOI compare two signals sample by sample at 16 kHz after
+truncating both to the shorter length. Speaker similarity is the cosine
+similarity of Resemblyzer utterance embeddings.
+
+The `*_from_audio` functions work on decoded buffers (and raise on error) so
+callers that score many files can decode each file once; the
+`calculate_*` functions take paths and return None on error.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# PESQ wideband mode and STOI are computed at 16 kHz
+METRIC_SAMPLE_RATE = 16000
+
+# Bump a metric's version when its computation changes; cached values
+# computed under the old version are then ignored
+METRIC_VERSIONS = {
+    'similarity': 'resemblyzer-16k-1',
+    'pesq': 'pesq-wb-16k-1',
+    'stoi': 'stoi-16k-1',
+}
+
+# Shared Resemblyzer encoder (loading it is the slow part)
+_voice_encoder = None
+
+
+def _get_voice_encoder():
+    """Return the shared Resemblyzer VoiceEncoder, loading it on first use."""
+    global _voice_encoder
+    if _voice_encoder is None:
+        from resemblyzer import VoiceEncoder
+        _voice_encoder = VoiceEncoder(verbose=False)
+    return _voice_encoder
+
+
+def _truncate_pair(ref_audio: np.ndarray, gen_audio: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Truncate both signals to the shorter length."""
+    min_len = min(len(ref_audio), len(gen_audio))
+    return ref_audio[:min_len], gen_audio[:min_len]
+
+
+def _load_pair(
+    reference_path: Path,
+    generated_path: Path,
+    sr: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Load both files at `sr` and truncate them to the same length."""
+    import librosa
+
+    ref_audio, _ = librosa.load(reference_path, sr=sr)
+    gen_audio, _ = librosa.load(generated_path, sr=sr)
+    return _truncate_pair(ref_audio, gen_audio)
+
+
+def embed_speaker(audio: np.ndarray, sr: int) -> np.ndarray:
+    """
+    Compute the Resemblyzer utterance embedding of a decoded signal.
+
+    Args:
+        audio: Mono waveform
+        sr: Sample rate of `audio`
+
+    Returns:
+        L2-normalized speaker embedding
+    """
+    from resemblyzer import preprocess_wav
+
+    return _get_voice_encoder().embed_utterance(preprocess_wav(audio, source_sr=sr))
+
+
+def pesq_from_audio(ref_audio: np.ndarray, gen_audio: np.ndarray, sr: int = METRIC_SAMPLE_RATE) -> float:
+    """Wideband PESQ of two decoded signals at `sr`."""
+    from pesq import pesq
+
+    ref_audio, gen_audio = _truncate_pair(ref_audio, gen_audio)
+    return float(pesq(sr, ref_audio, gen_audio, 'wb'))
+
+
+def stoi_from_audio(ref_audio: np.ndarray, gen_audio: np.ndarray, sr: int = METRIC_SAMPLE_RATE) -> float:
+    """STOI of two decoded signals at `sr`."""
+    from pystoi import stoi
+
+    ref_audio, gen_audio = _truncate_pair(ref_audio, gen_audio)
+    return float(stoi(ref_audio, gen_audio, sr, extended=False))
+
+
+def calculate_speaker_similarity(reference_path: Path, generated_path: Path) -> Optional[float]:
+    """
+    Calculate cosine similarity between speaker embeddings using Resemblyzer.
+
+    Args:
+        reference_path: Path to reference audio
+        generated_path: Path to generated audio
+
+    Returns:
+        Similarity score, or None if it could not be computed
+    """
+    try:
+        from resemblyzer import preprocess_wav
+
+        encoder = _get_voice_encoder()
+        ref_embed = encoder.embed_utterance(preprocess_wav(reference_path))
+        gen_embed = encoder.embed_utterance(preprocess_wav(generated_path))
+        return float(np.dot(ref_embed, gen_embed))
+    except Exception as e:
+        print(f"Error calculating similarity: {e}")
+        return None
+
+
+def calculate_pesq_score(
+    reference_path: Path,
+    generated_path: Path,
+    sr: int = METRIC_SAMPLE_RATE
+) -> Optional[float]:
+    """
+    Calculate PESQ score (Perceptual Evaluation of Speech Quality).
+
+    Args:
+        reference_path: Path to reference audio
+        generated_path: Path to generated audio
+        sr: Sample rate both files are resampled to
+
+    Returns:
+        Wideband PESQ score, or None if it could not be computed
+    """
+    try:
+        return pesq_from_audio(*_load_pair(reference_path, generated_path, sr), sr)
+    except Exception as e:
+        print(f"Error calculating PESQ: {e}")
+        return None
+
+
+def calculate_stoi_score(
+    reference_path: Path,
+    generated_path: Path,
+    sr: int = METRIC_SAMPLE_RATE
+) -> Optional[float]:
+    """
+    Calculate STOI score (Short-Time Objective Intelligibility).
+
+    Args:
+        reference_path: Path to reference audio
+        generated_path: Path to generated audio
+        sr: Sample rate both files are resampled to
+
+    Returns:
+        STOI score, or None if it could not be computed
+    """
+    try:
+        return stoi_from_audio(*_load_pair(reference_path, generated_path, sr), sr)
+    except Exception as e:
+        print(f"Error calculating STOI: {e}")
+        return None
@@ -0,0 +1,153 @@
+"""
+Find which reference voice each generated file actually sounds like.
+
+    python -m evaluation.nearest --top-k 3
+
+Embeds every reference and generated file once (through the embedding
+index, so reruns only embed new files), scores all generated files against
+all references with one matrix product per chunk, and writes the nearest
+references to results/nearest_reference.csv. Where the results store records
+which reference a file was cloned from, files whose nearest voice is a
+different reference are reported as mismatches.
+"""
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+from utils import (
+    RESULTS_DIR, REFERENCE_DIR, GENERATED_DIR, REFERENCE_AUDIO_EXTENSIONS,
+    OUTPUT_FORMATS, EMBEDDING_INDEX_DIR, ResultsStore
+)
+
+from .embedding_index import EmbeddingIndex
+from .engine import resolve_audio_paths
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Match generated audio to its nearest reference voice"
+    )
+
+    parser.add_argument(
+        '--references',
+        type=str,
+        default=str(REFERENCE_DIR),
+        help='Directory of reference audio'
+    )
+    parser.add_argument(
+        '--generated',
+        type=str,
+        default=str(GENERATED_DIR),
+        help='Directory searched recursively for generated audio'
+    )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=1,
+        help='Nearest references reported per file'
+    )
+    parser.add_argument(
+        '--index',
+        type=str,
+        default=str(EMBEDDING_INDEX_DIR),
+        help='Speaker embedding index directory'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(RESULTS_DIR / 'nearest_reference.csv'),
+        help='Output CSV'
+    )
+
+    return parser.parse_args()
+
+
+def find_audio(directory: Path, extensions, recursive: bool = False):
+    """List audio files in a directory by extension."""
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in extensions
+    )
+
+
+def expected_references():
+    """Map generated file -> reference it was cloned from, from the results store."""
+    expected = {}
+    with ResultsStore() as store:
+        for row in store.generations():
+            ref_path, gen_path = resolve_audio_paths(row)
+            expected[gen_path.resolve()] = ref_path.resolve()
+    return expected
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    references = find_audio(Path(args.references), REFERENCE_AUDIO_EXTENSIONS)
+    generated = find_audio(
+        Path(args.generated), tuple(f".{fmt}" for fmt in OUTPUT_FORMATS), recursive=True)
+
+    print("=" * 60)
+    print("Nearest Reference Voices")
+    print("=" * 60)
+    print(f"References: {len(references)}")
+    print(f"Generated files: {len(generated)}")
+    if not references or not generated:
+        print("Nothing to compare")
+        return
+
+    start_time = time.perf_counter()
+    index = EmbeddingIndex(Path(args.index))
+    reference_rows = index.ensure(references, 'reference')
+    generated_rows = index.ensure(generated, 'generated')
+    print(f"✓ Embeddings ready in {time.perf_counter() - start_time:.1f}s "
+          f"({index.added} new, {len(index)} in index)")
+
+    references = [path for path in references if reference_rows[path] is not None]
+    generated = [path for path in generated if generated_rows[path] is not None]
+    reference_by_row = {reference_rows[path]: path for path in references}
+
+    start_time = time.perf_counter()
+    nearest_rows, nearest_scores = index.nearest(
+        [generated_rows[path] for path in generated],
+        [reference_rows[path] for path in references],
+        k=args.top_k
+    )
+    print(f"✓ Scored {len(generated)} x {len(references)} pairs in "
+          f"{time.perf_counter() - start_time:.2f}s")
+
+    expected = expected_references()
+    mismatches = []
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['generated', 'expected_reference', 'rank', 'reference', 'similarity'])
+        for path, rows, scores in zip(generated, nearest_rows, nearest_scores):
+            expected_ref = expected.get(path.resolve())
+            for rank, (row, score) in enumerate(zip(rows, scores), 1):
+                writer.writerow([
+                    path, expected_ref or '', rank, reference_by_row[row], f"{score:.4f}"
+                ])
+            nearest_ref = reference_by_row[rows[0]]
+            if expected_ref is not None and nearest_ref.resolve() != expected_ref:
+                mismatches.append((path, expected_ref, nearest_ref, scores[0]))
+
+    print(f"\n✓ Nearest references: {output_path}")
+    checked = sum(1 for path in generated if path.resolve() in expected)
+    print(f"{len(mismatches)} of {checked} files with a recorded reference sound closer "
+          f"to another voice")
+    for path, expected_ref, nearest_ref, score in mismatches[:20]:
+        print(f"  {path.name}: cloned from {expected_ref.name}, "
+              f"nearest {nearest_ref.name} ({score:.3f})")
+    if len(mismatches) > 20:
+        print(f"  ... and {len(mismatches) - 20} more")
+
+
+if __name__ == "__main__":
+    main()
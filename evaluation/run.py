@@ -0,0 +1,127 @@
+"""
+Score every generation recorded in the results store (results/results.db).
+
+    python -m evaluation.run --workers 8
+
+Updates per-row metrics in results/evaluation_complete.csv and per-model
+statistics in results/evaluation_summary.csv (the same files the notebook
+exports), and records the metrics in the store. Only rows that are new or whose audio changed are evaluated;
+metric values and speaker embeddings are cached by file content across runs.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from utils import RESULTS_DIR, RESULTS_DB_FILE, METRIC_CACHE_FILE, EMBEDDING_INDEX_DIR, ResultsStore
+
+from .cache import MetricCache
+from .embedding_index import EmbeddingIndex
+from .engine import SUMMARY_COLUMNS, update_evaluation
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compute speaker similarity, PESQ and STOI for generated audio"
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=str(RESULTS_DB_FILE),
+        help='Results store database'
+    )
+    parser.add_argument(
+        '--results-dir',
+        type=str,
+        default=str(RESULTS_DIR),
+        help='Directory the CSVs are written to'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='PESQ/STOI worker processes (default: CPU count; 1 runs serially)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Per-row CSV (default: <results-dir>/evaluation_complete.csv)'
+    )
+    parser.add_argument(
+        '--summary',
+        type=str,
+        default=None,
+        help='Per-model summary CSV (default: <results-dir>/evaluation_summary.csv)'
+    )
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=str(METRIC_CACHE_FILE),
+        help='Metric cache file'
+    )
+    parser.add_argument(
+        '--index',
+        type=str,
+        default=str(EMBEDDING_INDEX_DIR),
+        help='Speaker embedding index directory'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Recompute every metric and embedding without reading or writing the caches'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    results_dir = Path(args.results_dir)
+    store = ResultsStore(Path(args.db))
+
+    print("=" * 60)
+    print("TTS Evaluation")
+    print("=" * 60)
+
+    rows = store.generations()
+    if not rows:
+        if list(results_dir.glob('metrics_*.json')):
+            print("No runs in the results store. Import the JSON results with: "
+                  "python scripts/import_results.py")
+        else:
+            print("No metrics found. Run: make run-all TEXT='Your test text'")
+        return
+
+    print(f"Loaded {len(rows)} evaluations\n")
+    cache = None if args.no_cache else MetricCache(Path(args.cache))
+    index = None if args.no_cache else EmbeddingIndex(Path(args.index))
+    output_csv = Path(args.output) if args.output else results_dir / 'evaluation_complete.csv'
+    output_stats = Path(args.summary) if args.summary else results_dir / 'evaluation_summary.csv'
+
+    start_time = time.perf_counter()
+    df = update_evaluation(rows, output_csv, output_stats, workers=args.workers,
+                           cache=cache, index=index, store=store)
+    print(f"\n✓ Metrics up to date in {time.perf_counter() - start_time:.1f}s")
+
+    print("\n" + "=" * 60)
+    print(df.groupby('model')[SUMMARY_COLUMNS].mean().round(3).to_string())
+    print("=" * 60)
+    print(f"\n✓ Detailed results: {output_csv}")
+    print(f"✓ Summary statistics: {output_stats}")
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"\nMetric cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['stored']} stored, "
+              f"{stats['entries']} entries")
+    if index is not None:
+        print(f"Embedding index: {len(index)} embeddings, {index.added} added")
+
+
+if __name__ == "__main__":
+    main()
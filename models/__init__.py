@@ -1,11 +1,62 @@
 """
 TTS model wrappers for zero-shot voice cloning.
+
+Wrapper classes are imported lazily: `import models` is cheap, and TTS/torch
+are only imported when a class is first accessed.
 """
 
-from .yourtts_model import YourTTS
-from .xtts_model import XTTS
+import importlib
+
+from .result import GenerationResult
+from .synthesis_cache import SynthesisCache
+from .aio import AsyncRunner, GenerationCancelled
+from .registry import (
+    MODEL_REGISTRY,
+    available_models,
+    get_model_class,
+    get_display_name,
+    load_model
+)
+
+# Attribute name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "YourTTS": ".yourtts_model",
+    "XTTS": ".xtts_model",
+    "ShardedSynthesizer": ".sharded",
+    "PreforkPool": ".prefork",
+    "MicroBatcher": ".batching",
+    "BatchedYourTTS": ".batching",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
+    "GenerationResult",
+    "SynthesisCache",
+    "AsyncRunner",
+    "GenerationCancelled",
     "YourTTS",
     "XTTS",
+    "ShardedSynthesizer",
+    "PreforkPool",
+    "MicroBatcher",
+    "BatchedYourTTS",
+    "MODEL_REGISTRY",
+    "available_models",
+    "get_model_class",
+    "get_display_name",
+    "load_model",
 ]
@@ -0,0 +1,175 @@
+"""
+Asyncio support for the model wrappers.
+
+`generate()` is blocking, so asyncio services run it through an
+AsyncRunner. Each model has a dedicated inference thread pool and a
+per-event-loop semaphore bounding concurrent requests. Requests waiting
+for the semaphore stay in the event loop, where they can be cancelled or
+time out without occupying a thread. Encoding and writing the output file
+runs on a separate I/O pool, so the inference thread is free for the next
+request.
+
+A running synthesis thread cannot be killed. On cancellation or timeout
+its cancel event is set, and the model stops at the next sentence
+boundary (see check_cancelled()).
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from .result import GenerationResult
+
+
+T = TypeVar('T')
+
+_local = threading.local()
+
+# Shared pool for file encoding/writing (I/O and codec work release the GIL)
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts-io")
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a synthesis thread whose async caller was cancelled or timed out."""
+
+
+def check_cancelled() -> None:
+    """
+    Stop the current synthesis if its async caller has gone away.
+
+    Called by the models between sentences; a no-op outside AsyncRunner.
+
+    Raises:
+        GenerationCancelled: If the request was cancelled or timed out
+    """
+    cancel_event = getattr(_local, 'cancel_event', None)
+    if cancel_event is not None and cancel_event.is_set():
+        raise GenerationCancelled("generation cancelled")
+
+
+class AsyncRunner:
+    """Dedicated executor plus concurrency limit for one model."""
+
+    def __init__(self, name: str, max_concurrency: int = 1):
+        """
+        Initialize runner.
+
+        Args:
+            name: Model name (used for thread names)
+            max_concurrency: Requests run at the same time; more wait in
+                the event loop
+        """
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix=f"{name}-inference")
+        # asyncio.Semaphore is bound to the loop it is first used in
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore of the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Run a blocking call on the model's executor.
+
+        Args:
+            func: Blocking call (e.g. a partial of model.generate)
+            timeout: Seconds allowed, waiting for a free slot included
+                (unbounded if None)
+
+        Returns:
+            Return value of `func`
+
+        Raises:
+            asyncio.TimeoutError: If `timeout` expired
+            asyncio.CancelledError: If the awaiting task was cancelled
+        """
+        cancel_event = threading.Event()
+
+        def job():
+            _local.cancel_event = cancel_event
+            try:
+                return func()
+            finally:
+                _local.cancel_event = None
+
+        async def acquire_and_run():
+            async with self._semaphore():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, job)
+
+        try:
+            return await asyncio.wait_for(acquire_and_run(), timeout)
+        except BaseException:
+            cancel_event.set()
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the executor's threads."""
+        self.executor.shutdown(wait=wait)
+
+
+async def save_async(result: GenerationResult, output_path: Path, **save_kwargs) -> Path:
+    """
+    Encode and write a result on the I/O pool.
+
+    Args:
+        result: Generated audio
+        output_path: Output path (encoding chosen by extension)
+        **save_kwargs: target_sample_rate / bitrate_kbps for GenerationResult.save
+
+    Returns:
+        Path to the saved file
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _io_executor, functools.partial(result.save, output_path, **save_kwargs))
+
+
+async def generate_async(
+    model,
+    text: str,
+    reference_audio_path: Path,
+    output_path: Optional[Path] = None,
+    save: bool = True,
+    use_cache: bool = True,
+    timeout: Optional[float] = None
+) -> GenerationResult:
+    """
+    Run model.generate() on the model's AsyncRunner and save without blocking.
+
+    Args:
+        model: Model wrapper with `async_runner`, `generate` and
+            `default_output_path` (which must return a unique name per
+            call, since overlapping requests save concurrently)
+        text: Text to convert to speech
+        reference_audio_path: Path to reference audio for voice cloning
+        output_path: Optional output path (a unique name from
+            model.default_output_path() if None)
+        save: Whether to write the audio to disk
+        use_cache: Whether to read and update the synthesis cache
+        timeout: Seconds allowed for synthesis, queueing included
+
+    Returns:
+        GenerationResult with waveform, sample rate, duration and timings
+    """
+    result = await model.async_runner.run(
+        functools.partial(
+            model.generate, text, reference_audio_path,
+            save=False, use_cache=use_cache, verbose=False),
+        timeout=timeout
+    )
+    if save:
+        await save_async(result, output_path or model.default_output_path())
+    return result
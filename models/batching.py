@@ -0,0 +1,285 @@
+"""
+Dynamic micro-batching of concurrent synthesis requests.
+"""
+
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils import hash_file, THREAD_PROFILE
+
+from .aio import AsyncRunner, check_cancelled, generate_async
+from .result import GenerationResult
+
+
+class MicroBatcher:
+    """
+    Collect requests for up to `max_wait_ms` or `max_batch_size` items and
+    execute them in batches.
+
+    Requests are grouped by key (e.g. speaker), so every call to `batch_fn`
+    receives items that share a key. Queueing delay and batch sizes are
+    recorded so the window can be tuned.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[Hashable, List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0
+    ):
+        """
+        Start the batching thread.
+
+        Args:
+            batch_fn: Function taking (key, items) and returning one result
+                per item, in order
+            max_batch_size: Maximum items per batch
+            max_wait_ms: Maximum time the first request of a window waits
+                for others to arrive
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: List[int] = []
+        self._queue_waits: List[float] = []
+        self._busy_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Hashable, item: Any) -> Future:
+        """
+        Queue an item for batched execution.
+
+        Args:
+            key: Grouping key; only items with equal keys share a batch
+            item: Request payload passed to batch_fn
+
+        Returns:
+            Future resolved with this item's result
+        """
+        future = Future()
+        self._queue.put((key, item, future, time.perf_counter()))
+        return future
+
+    def _collect_window(self, first: Tuple) -> List[Tuple]:
+        """Gather requests until the window closes or the batch is full."""
+        window = [first]
+        deadline = first[3] + self.max_wait
+        while len(window) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            window.append(request)
+        return window
+
+    def _run(self) -> None:
+        """Batching loop executed on the background thread."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            # Group the window by key, keeping arrival order within groups
+            groups: Dict[Hashable, List[Tuple]] = {}
+            for request in self._collect_window(first):
+                groups.setdefault(request[0], []).append(request)
+
+            for key, requests in groups.items():
+                start_time = time.perf_counter()
+                try:
+                    results = list(self.batch_fn(key, [request[1] for request in requests]))
+                    # A short result list would leave futures unresolved forever
+                    if len(results) != len(requests):
+                        raise RuntimeError(
+                            f"batch_fn returned {len(results)} results for "
+                            f"{len(requests)} requests")
+                except Exception as e:
+                    for request in requests:
+                        request[2].set_exception(e)
+                    continue
+                finally:
+                    busy = time.perf_counter() - start_time
+                    with self._stats_lock:
+                        self._batch_sizes.append(len(requests))
+                        self._queue_waits.extend(start_time - r[3] for r in requests)
+                        self._busy_time += busy
+
+                for request, result in zip(requests, results):
+                    request[2].set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get batching statistics.
+
+        Returns:
+            Dictionary with batch count, item count, mean batch size,
+            queueing delay percentiles (seconds) and busy time
+        """
+        with self._stats_lock:
+            batch_sizes = list(self._batch_sizes)
+            queue_waits = np.array(self._queue_waits)
+            busy_time = self._busy_time
+
+        if not batch_sizes:
+            return {'batches': 0, 'items': 0}
+
+        return {
+            'batches': len(batch_sizes),
+            'items': int(sum(batch_sizes)),
+            'mean_batch_size': float(np.mean(batch_sizes)),
+            'max_batch_size': int(max(batch_sizes)),
+            'queue_wait_mean': float(queue_waits.mean()),
+            'queue_wait_p50': float(np.percentile(queue_waits, 50)),
+            'queue_wait_p95': float(np.percentile(queue_waits, 95)),
+            'busy_time': busy_time
+        }
+
+    def close(self) -> None:
+        """Stop the batching thread after queued requests are processed."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+class BatchedYourTTS:
+    """
+    YourTTS front-end that micro-batches concurrent generate() calls.
+
+    Requests for the same reference voice are merged into one padded VITS
+    forward pass through `YourTTS.synthesize_batch`.
+    """
+
+    def __init__(self, model, max_batch_size: Optional[int] = None, max_wait_ms: float = 20.0):
+        """
+        Initialize batched front-end.
+
+        Args:
+            model: Loaded YourTTS instance
+            max_batch_size: Maximum requests per forward pass (the tuned
+                batch size from the thread profile, or 8, if None)
+            max_wait_ms: Batching window in milliseconds
+        """
+        if max_batch_size is None:
+            max_batch_size = THREAD_PROFILE.get('yourtts', {}).get('batch_size', 8)
+        self.model = model
+        self.sample_rate = model.sample_rate
+        self.batcher = MicroBatcher(
+            self._run_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        # Enough concurrent async requests in flight to fill a batch
+        self.async_runner = AsyncRunner('yourtts-batched', max_batch_size)
+
+    @property
+    def synthesis_cache(self):
+        """Synthesis cache of the wrapped model."""
+        return self.model.synthesis_cache
+
+    @property
+    def frontend(self):
+        """Text frontend of the wrapped model."""
+        return self.model.frontend
+
+    def _run_batch(self, key: str, items: List[Tuple[str, Path]]) -> List[np.ndarray]:
+        """Run one same-speaker batch."""
+        texts = [text for text, _ in items]
+        return self.model.synthesize_batch(texts, items[0][1])
+
+    def _synthesize(self, text: str, reference_audio_path: Path) -> np.ndarray:
+        """Synthesize through the micro-batcher (blocks until done)."""
+        check_cancelled()
+        key = hash_file(reference_audio_path)
+        future = self.batcher.submit(key, (text, reference_audio_path))
+        return future.result()
+
+    def default_output_path(self) -> Path:
+        """Return a timestamped output path (unique across concurrent requests)."""
+        return self.model.default_output_path()
+
+    def generate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        verbose: bool = False
+    ) -> GenerationResult:
+        """
+        Generate audio with voice cloning through the micro-batcher.
+
+        Requests found in the wrapped model's synthesis cache skip the batcher.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            verbose: Unused (nothing is printed); accepted for parity with
+                YourTTS.generate
+
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+        """
+        key = self.model.synthesis_key(text, reference_audio_path) if use_cache else None
+        result = self.synthesis_cache.get(key) if key is not None else None
+
+        if result is None:
+            start_time = time.perf_counter()
+            audio = self._synthesize(text, reference_audio_path)
+            result = GenerationResult(
+                audio, self.sample_rate, {'synthesis': time.perf_counter() - start_time})
+            if key is not None:
+                self.synthesis_cache.put(key, result)
+
+        if save:
+            result.save(output_path or self.default_output_path())
+        return result
+
+    async def agenerate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> GenerationResult:
+        """
+        Asyncio counterpart of generate().
+
+        Up to max_batch_size requests wait in the micro-batcher at once, so
+        concurrent coroutines share forward passes.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            timeout: Seconds allowed, queueing included (unbounded if None)
+
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+        """
+        return await generate_async(
+            self, text, reference_audio_path, output_path, save, use_cache, timeout)
+
+    def close(self) -> None:
+        """Stop the micro-batcher and the async executor."""
+        self.batcher.close()
+        self.async_runner.shutdown(wait=False)
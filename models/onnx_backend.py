@@ -0,0 +1,277 @@
+"""
+ONNX export and ONNX Runtime inference for the YourTTS (VITS) model.
+
+Coqui's `Vits.export_onnx` only exposes speaker ids, but YourTTS conditions
+on a speaker d-vector. The export here wraps `Vits.inference` so the graph
+takes the d-vector (and language id) as inputs and also returns `y_mask`,
+which is needed to cut padded batch outputs back to their lengths.
+
+Text tokenization and the speaker encoder stay in PyTorch/Python.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+
+from utils import ONNX_MODEL_DIR, ONNX_OPSET, make_cache_key
+
+INPUT_NAMES = ["input", "input_lengths", "scales", "d_vectors", "language_ids"]
+OUTPUT_NAMES = ["output", "y_mask"]
+
+
+class VitsOnnxWrapper(nn.Module):
+    """Export-time wrapper exposing VITS inference with d-vector input."""
+
+    def __init__(self, vits: nn.Module):
+        super().__init__()
+        self.vits = vits
+
+    def forward(self, input, input_lengths, scales, d_vectors, language_ids):
+        # Route the sampling scales through the graph instead of baking them in
+        self.vits.inference_noise_scale = scales[0]
+        self.vits.length_scale = scales[1]
+        self.vits.inference_noise_scale_dp = scales[2]
+        outputs = self.vits.inference(
+            input,
+            aux_input={
+                "x_lengths": input_lengths,
+                "d_vectors": d_vectors,
+                "speaker_ids": None,
+                "language_ids": language_ids,
+                "durations": None
+            }
+        )
+        return outputs["model_outputs"], outputs["y_mask"]
+
+
+def default_scales(vits: nn.Module) -> np.ndarray:
+    """The model's configured [noise, length, duration-noise] scales."""
+    return np.array([
+        float(vits.inference_noise_scale),
+        float(vits.length_scale),
+        float(vits.inference_noise_scale_dp)
+    ], dtype=np.float32)
+
+
+def onnx_model_path(model_version: str) -> Path:
+    """
+    Location of the exported ONNX model.
+
+    Keyed by model version, torch version and opset.
+    """
+    key = make_cache_key(model_version, torch.__version__, f"opset{ONNX_OPSET}", "vits-dvector")
+    return ONNX_MODEL_DIR / f"yourtts_vits_{key[:16]}.onnx"
+
+
+def export_vits_onnx(vits: nn.Module, output_path: Path, d_vector_dim: int) -> Path:
+    """
+    Export a VITS model to ONNX with dynamic batch and length axes.
+
+    Args:
+        vits: Coqui Vits model (left unchanged after export)
+        output_path: Destination .onnx file
+        d_vector_dim: Speaker embedding size
+
+    Returns:
+        Path to the exported model
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    saved_scales = (vits.inference_noise_scale, vits.length_scale, vits.inference_noise_scale_dp)
+    was_training = vits.training
+    vits.eval()
+
+    sequence_length = 100
+    dummy_input = (
+        torch.randint(low=0, high=2, size=(1, sequence_length), dtype=torch.long),
+        torch.LongTensor([sequence_length]),
+        torch.from_numpy(default_scales(vits)),
+        torch.randn(1, d_vector_dim),
+        torch.LongTensor([0])
+    )
+
+    tmp_path = output_path.with_suffix(".onnx.tmp")
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                model=VitsOnnxWrapper(vits),
+                args=dummy_input,
+                f=str(tmp_path),
+                opset_version=ONNX_OPSET,
+                input_names=INPUT_NAMES,
+                output_names=OUTPUT_NAMES,
+                dynamic_axes={
+                    "input": {0: "batch_size", 1: "phonemes"},
+                    "input_lengths": {0: "batch_size"},
+                    "d_vectors": {0: "batch_size"},
+                    "language_ids": {0: "batch_size"},
+                    "output": {0: "batch_size", 2: "samples"},
+                    "y_mask": {0: "batch_size", 2: "frames"}
+                }
+            )
+        tmp_path.replace(output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        (vits.inference_noise_scale, vits.length_scale, vits.inference_noise_scale_dp) = saved_scales
+        if was_training:
+            vits.train()
+
+    return output_path
+
+
+class OnnxVitsSession:
+    """ONNX Runtime session for an exported VITS model."""
+
+    def __init__(self, model_path: Path):
+        """
+        Create a CPU inference session.
+
+        Thread counts follow torch's current settings, so the host's thread
+        profile applies to ONNX Runtime as well.
+
+        Args:
+            model_path: Exported .onnx file
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = torch.get_num_threads()
+        options.inter_op_num_threads = torch.get_num_interop_threads()
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+    def run(
+        self,
+        token_ids: Sequence[Sequence[int]],
+        d_vectors: np.ndarray,
+        language_id: int,
+        scales: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Synthesize a padded batch.
+
+        Args:
+            token_ids: Token id sequences, one per item
+            d_vectors: Speaker embeddings with shape [B, D] (or [1, D],
+                repeated over the batch)
+            language_id: Language id shared by all items
+            scales: [noise, length, duration-noise] scales
+
+        Returns:
+            Tuple of (waveforms [B, T], decoded frame counts [B])
+        """
+        batch_size = len(token_ids)
+        x_lengths = np.array([len(ids) for ids in token_ids], dtype=np.int64)
+        x = np.zeros((batch_size, int(x_lengths.max())), dtype=np.int64)
+        for row, ids in enumerate(token_ids):
+            x[row, :len(ids)] = ids
+
+        d_vectors = np.asarray(d_vectors, dtype=np.float32)
+        if d_vectors.shape[0] != batch_size:
+            d_vectors = np.repeat(d_vectors[:1], batch_size, axis=0)
+
+        waveforms, y_mask = self.session.run(OUTPUT_NAMES, {
+            "input": x,
+            "input_lengths": x_lengths,
+            "scales": np.asarray(scales, dtype=np.float32),
+            "d_vectors": d_vectors,
+            "language_ids": np.full(batch_size, language_id, dtype=np.int64)
+        })
+        return waveforms[:, 0, :], y_mask.sum(axis=(1, 2)).astype(np.int64)
+
+
+def compare_with_torch(
+    vits: nn.Module,
+    session: OnnxVitsSession,
+    token_ids: Sequence[int],
+    d_vector: np.ndarray,
+    language_id: int,
+    hop_length: int
+) -> Dict[str, float]:
+    """
+    Compare ONNX Runtime output with the PyTorch model on one input.
+
+    Noise scales are set to zero on both sides so the outputs are
+    deterministic.
+
+    Args:
+        vits: PyTorch Vits model
+        session: ONNX Runtime session for the exported model
+        token_ids: Token ids of one sentence
+        d_vector: Speaker embedding with shape [1, D]
+        language_id: Language id
+        hop_length: Samples per decoded frame
+
+    Returns:
+        Dictionary with torch_samples, onnx_samples, max_abs_diff and snr_db
+        (computed over the common length)
+    """
+    scales = default_scales(vits)
+    scales[0] = 0.0
+    scales[2] = 0.0
+
+    saved_scales = (vits.inference_noise_scale, vits.inference_noise_scale_dp)
+    vits.inference_noise_scale, vits.inference_noise_scale_dp = 0.0, 0.0
+    try:
+        with torch.no_grad():
+            outputs = vits.inference(
+                torch.tensor([list(token_ids)], dtype=torch.long),
+                aux_input={
+                    "x_lengths": torch.tensor([len(token_ids)], dtype=torch.long),
+                    "d_vectors": torch.from_numpy(np.asarray(d_vector, dtype=np.float32)),
+                    "speaker_ids": None,
+                    "language_ids": torch.tensor([language_id], dtype=torch.long),
+                    "durations": None
+                }
+            )
+    finally:
+        vits.inference_noise_scale, vits.inference_noise_scale_dp = saved_scales
+
+    frames = int(outputs["y_mask"].sum())
+    torch_audio = outputs["model_outputs"][0, 0, :frames * hop_length].cpu().numpy()
+
+    waveforms, onnx_frames = session.run([token_ids], d_vector, language_id, scales)
+    onnx_audio = waveforms[0, :int(onnx_frames[0]) * hop_length]
+
+    length = min(len(torch_audio), len(onnx_audio))
+    error = torch_audio[:length] - onnx_audio[:length]
+    signal_power = float(np.mean(torch_audio[:length] ** 2))
+    noise_power = float(np.mean(error ** 2))
+    return {
+        "torch_samples": int(len(torch_audio)),
+        "onnx_samples": int(len(onnx_audio)),
+        "max_abs_diff": float(np.max(np.abs(error))) if length else 0.0,
+        "snr_db": float(10 * np.log10(signal_power / noise_power)) if noise_power > 0 else float("inf")
+    }
+
+
+def load_onnx_session(
+    vits: nn.Module,
+    model_version: str,
+    d_vector_dim: int,
+    model_path: Optional[Path] = None
+) -> Tuple[OnnxVitsSession, str]:
+    """
+    Open the exported model, exporting it first if it does not exist yet.
+
+    Args:
+        vits: PyTorch Vits model (used only for export)
+        model_version: Model version string used in the file key
+        d_vector_dim: Speaker embedding size
+        model_path: Optional explicit .onnx path
+
+    Returns:
+        Tuple of (session, "loaded" or "exported")
+    """
+    model_path = Path(model_path) if model_path else onnx_model_path(model_version)
+    status = "loaded"
+    if not model_path.exists():
+        export_vits_onnx(vits, model_path, d_vector_dim)
+        status = "exported"
+    return OnnxVitsSession(model_path), status
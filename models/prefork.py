@@ -0,0 +1,237 @@
+"""
+Pre-fork worker pool sharing one copy of the model weights.
+
+Loading a model per worker process (as ShardedSynthesizer does) multiplies
+the weights in RAM. PreforkPool loads the model once in the parent and then
+forks the workers, which inherit its memory copy-on-write: the weight
+tensors are only read during inference, so their pages stay physically
+shared and each worker adds just its own activations and buffers.
+
+Python's garbage collector writes to the header of every object it
+traverses, which would copy the pages holding the model's object graph into
+each worker. The parent's objects are therefore moved to the permanent
+generation (gc.freeze) before forking.
+
+The parent must not run inference itself: torch's intra-op thread pool does
+not survive fork, so forking after parallel work has started can deadlock
+the workers.
+"""
+
+import gc
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import memory_footprint
+
+from .registry import load_model
+from .result import GenerationResult
+
+
+# Model loaded by the parent before forking; workers inherit it
+_shared_model = None
+
+
+def _init_worker(num_threads: int, pid_queue) -> None:
+    """
+    Set the worker's torch thread budget and report its pid.
+
+    Args:
+        num_threads: Torch intra-op threads for this worker
+        pid_queue: Queue receiving the worker's pid once it is ready
+    """
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed in the parent; the inherited value is kept
+        pass
+    pid_queue.put(os.getpid())
+
+
+def _generate(args: Tuple[str, str, Optional[str], bool]) -> GenerationResult:
+    """
+    Run one request in a worker process.
+
+    Args:
+        args: Tuple of (text, reference_audio_path, output_path, use_cache);
+            the audio is saved by the worker if output_path is set
+
+    Returns:
+        GenerationResult (with output_path and file_write timing if saved)
+    """
+    text, reference_audio_path, output_path, use_cache = args
+    return _shared_model.generate(
+        text,
+        Path(reference_audio_path),
+        output_path=Path(output_path) if output_path else None,
+        save=output_path is not None,
+        use_cache=use_cache,
+        verbose=False
+    )
+
+
+class PreforkPool:
+    """
+    Worker processes forked from a parent holding the loaded model.
+
+    Requests are whole generate() calls; each runs in one worker, so
+    `num_workers` requests are synthesized at a time.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        num_workers: int = 2,
+        threads_per_worker: Optional[int] = None,
+        **model_kwargs
+    ):
+        """
+        Load the model and fork the workers.
+
+        Args:
+            model_name: Registered model name ("yourtts" or "xtts")
+            num_workers: Number of worker processes
+            threads_per_worker: Torch threads per worker (CPU count split
+                evenly across workers if None)
+            **model_kwargs: Passed to the model constructor (e.g. quantize)
+
+        Raises:
+            RuntimeError: If fork is unavailable or a pool already exists in
+                this process
+        """
+        global _shared_model
+        if "fork" not in mp.get_all_start_methods():
+            raise RuntimeError("PreforkPool requires the fork start method (Linux)")
+        if _shared_model is not None:
+            raise RuntimeError("Only one PreforkPool per process is supported")
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self.model_name = model_name
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+
+        # Workers size their own thread pools in _init_worker
+        model_kwargs.setdefault('apply_thread_profile', False)
+        start_time = time.perf_counter()
+        _shared_model = load_model(model_name, **model_kwargs)
+        self.load_time = time.perf_counter() - start_time
+        self.sample_rate = _shared_model.sample_rate
+
+        # Keep the GC from touching (and so copying) inherited objects
+        gc.collect()
+        gc.freeze()
+
+        ctx = mp.get_context("fork")
+        self._pid_queue = ctx.Queue()
+        self._worker_pids: List[int] = []
+        self._pool = ctx.Pool(
+            processes=num_workers,
+            initializer=_init_worker,
+            initargs=(threads_per_worker, self._pid_queue)
+        )
+
+    def wait_until_ready(self) -> None:
+        """Block until every worker has started."""
+        while len(self._worker_pids) < self.num_workers:
+            self._worker_pids.append(self._pid_queue.get())
+
+    def worker_pids(self) -> List[int]:
+        """
+        Get the pids of the live workers.
+
+        Returns:
+            Pids, including replacements for workers that exited
+        """
+        while not self._pid_queue.empty():
+            self._worker_pids.append(self._pid_queue.get())
+        self._worker_pids = [pid for pid in self._worker_pids if os.path.exists(f"/proc/{pid}")]
+        return list(self._worker_pids)
+
+    def generate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        use_cache: bool = True
+    ) -> GenerationResult:
+        """
+        Generate audio in a worker (safe to call from several threads).
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Output path, written by the worker (kept in memory
+                only if None)
+            use_cache: Whether to read and update the synthesis cache
+
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+        """
+        return self._pool.apply(
+            _generate,
+            ((text, str(reference_audio_path), output_path and str(output_path), use_cache),)
+        )
+
+    def generate_many(
+        self,
+        requests: Iterable[Tuple[str, Path, Optional[Path]]],
+        use_cache: bool = True
+    ) -> List[GenerationResult]:
+        """
+        Generate many requests across all workers.
+
+        Args:
+            requests: (text, reference_audio_path, output_path) tuples
+            use_cache: Whether to read and update the synthesis cache
+
+        Returns:
+            GenerationResults in request order
+        """
+        return self._pool.map(
+            _generate,
+            [
+                (text, str(reference), output_path and str(output_path), use_cache)
+                for text, reference, output_path in requests
+            ],
+            chunksize=1
+        )
+
+    def memory_report(self) -> List[Dict]:
+        """
+        Measure the parent's and every worker's memory.
+
+        Summing `pss` over all processes gives their combined physical
+        footprint; a worker's `unique` is what one more worker would cost.
+
+        Returns:
+            One dictionary per process with role, pid, rss, pss, shared and
+            unique (bytes)
+        """
+        processes = [('parent', os.getpid())] + [('worker', pid) for pid in self.worker_pids()]
+        report = []
+        for role, pid in processes:
+            try:
+                report.append({'role': role, 'pid': pid, **memory_footprint(pid)})
+            except OSError:
+                # Worker exited between listing and reading
+                continue
+        return report
+
+    def close(self) -> None:
+        """Shut down the workers and release the parent's model."""
+        global _shared_model
+        self._pool.close()
+        self._pool.join()
+        _shared_model = None
+        gc.unfreeze()
+
+    def __enter__(self) -> "PreforkPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,161 @@
+"""
+Int8 dynamic quantization for CPU inference.
+
+PyTorch dynamic quantization only has int8 kernels for Linear (and RNN)
+layers. To reach the layers that dominate each model, modules that are
+Linear layers in disguise are converted first:
+
+- GPT-2 projections in transformers' Conv1D (XTTS GPT) become nn.Linear.
+- Pointwise (kernel size 1) Conv1d layers (YourTTS/VITS attention and
+  WaveNet projections) become a Linear applied over the channel axis.
+
+Wider convolutions stay in fp32.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import torch
+from torch import nn
+from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+from torch.ao.quantization import quantize_dynamic
+
+from utils import QUANTIZED_WEIGHTS_DIR, make_cache_key
+
+
+class PointwiseLinear(nn.Module):
+    """Pointwise Conv1d expressed as a Linear over the channel axis."""
+
+    def __init__(self, linear: nn.Linear):
+        super().__init__()
+        self.linear = linear
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # [B, C, T] -> [B, T, C] -> Linear -> [B, C', T]
+        return self.linear(x.transpose(1, 2)).transpose(1, 2)
+
+
+def _is_pointwise_conv(module: nn.Module) -> bool:
+    """Whether a Conv1d is a plain per-timestep projection."""
+    return (
+        isinstance(module, nn.Conv1d)
+        and module.kernel_size == (1,)
+        and module.stride == (1,)
+        and module.dilation == (1,)
+        and module.groups == 1
+        and module.padding in ((0,), 'valid')
+    )
+
+
+def _linear_from_weights(weight: torch.Tensor, bias: Optional[torch.Tensor]) -> nn.Linear:
+    """Build an nn.Linear with weight [out, in] and optional bias."""
+    linear = nn.Linear(weight.shape[1], weight.shape[0], bias=bias is not None)
+    with torch.no_grad():
+        linear.weight.copy_(weight)
+        if bias is not None:
+            linear.bias.copy_(bias)
+    return linear
+
+
+def convert_to_linear(module: nn.Module, pointwise_conv: bool = False) -> int:
+    """
+    Replace Linear-equivalent layers with nn.Linear, in place.
+
+    Args:
+        module: Module to convert
+        pointwise_conv: Also convert kernel-size-1 Conv1d layers
+
+    Returns:
+        Number of layers converted
+    """
+    converted = 0
+    for name, child in list(module.named_children()):
+        if type(child).__name__ == "Conv1D" and hasattr(child, "nf"):
+            # transformers Conv1D stores its weight as [in, out]
+            setattr(module, name, _linear_from_weights(child.weight.t(), child.bias))
+            converted += 1
+        elif pointwise_conv and _is_pointwise_conv(child):
+            # Fold weight norm into the weight before copying it
+            try:
+                nn.utils.remove_weight_norm(child)
+            except ValueError:
+                pass
+            setattr(module, name, PointwiseLinear(
+                _linear_from_weights(child.weight.squeeze(-1), child.bias)))
+            converted += 1
+        else:
+            converted += convert_to_linear(child, pointwise_conv)
+    return converted
+
+
+def _prepare_quantized_structure(module: nn.Module) -> None:
+    """Swap nn.Linear for empty int8 dynamic Linear layers (weights loaded later)."""
+    for name, child in list(module.named_children()):
+        if isinstance(child, nn.Linear):
+            setattr(module, name, DynamicQuantizedLinear(
+                child.in_features,
+                child.out_features,
+                bias_=child.bias is not None,
+                dtype=torch.qint8
+            ))
+        else:
+            _prepare_quantized_structure(child)
+
+
+def quantized_weights_path(model_version: str, component: str) -> Path:
+    """
+    Location of saved quantized weights for a model component.
+
+    Keyed by model version and torch version, since packed int8 weights are
+    not portable across torch releases.
+    """
+    key = make_cache_key(model_version, torch.__version__, component, "int8-dynamic")
+    return QUANTIZED_WEIGHTS_DIR / f"{component}_{key[:16]}.pt"
+
+
+def quantize_module(
+    module: nn.Module,
+    weights_path: Optional[Path] = None,
+    pointwise_conv: bool = False
+) -> str:
+    """
+    Apply int8 dynamic quantization to a module's Linear layers, in place.
+
+    If `weights_path` exists, the quantized weights are loaded from it
+    instead of being re-quantized; otherwise they are quantized and saved
+    there.
+
+    Args:
+        module: Module to quantize (mutated in place, so other modules
+            holding a reference to it see the quantized layers)
+        weights_path: Optional file for saved quantized weights
+        pointwise_conv: Also quantize kernel-size-1 Conv1d layers
+
+    Returns:
+        "loaded" or "quantized"
+    """
+    convert_to_linear(module, pointwise_conv=pointwise_conv)
+
+    if weights_path is not None and Path(weights_path).exists():
+        _prepare_quantized_structure(module)
+        module.load_state_dict(torch.load(weights_path, map_location="cpu", weights_only=False))
+        return "loaded"
+
+    quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    if weights_path is not None:
+        weights_path = Path(weights_path)
+        weights_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=weights_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                torch.save(module.state_dict(), f)
+            os.replace(tmp_name, weights_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    return "quantized"
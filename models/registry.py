@@ -0,0 +1,75 @@
+"""
+Model registry resolving TTS backends by name.
+
+Backends are imported on first use, so scripts that only need one model (or
+none, when talking to the inference server) do not pay for importing the
+others.
+"""
+
+import importlib
+from typing import Dict, List, NamedTuple
+
+
+class ModelSpec(NamedTuple):
+    """Location and display name of a model wrapper."""
+    module: str
+    class_name: str
+    display_name: str
+
+
+MODEL_REGISTRY: Dict[str, ModelSpec] = {
+    'yourtts': ModelSpec('models.yourtts_model', 'YourTTS', 'YourTTS'),
+    'xtts': ModelSpec('models.xtts_model', 'XTTS', 'XTTS v2'),
+}
+
+
+def available_models() -> List[str]:
+    """Return the registered model names."""
+    return sorted(MODEL_REGISTRY)
+
+
+def _get_spec(name: str) -> ModelSpec:
+    """
+    Look up a model spec by name (case-insensitive).
+
+    Raises:
+        ValueError: If the model is not registered
+    """
+    spec = MODEL_REGISTRY.get(name.strip().lower())
+    if spec is None:
+        raise ValueError(
+            f"Unknown model '{name}'. Available models: {', '.join(available_models())}")
+    return spec
+
+
+def get_model_class(name: str) -> type:
+    """
+    Resolve a model wrapper class, importing its backend on first use.
+
+    Args:
+        name: Registered model name ("yourtts" or "xtts")
+
+    Returns:
+        Model wrapper class
+    """
+    spec = _get_spec(name)
+    return getattr(importlib.import_module(spec.module), spec.class_name)
+
+
+def get_display_name(name: str) -> str:
+    """Return the human-readable model name used in metrics."""
+    return _get_spec(name).display_name
+
+
+def load_model(name: str, **kwargs):
+    """
+    Instantiate a model wrapper by name.
+
+    Args:
+        name: Registered model name
+        **kwargs: Arguments passed to the wrapper constructor
+
+    Returns:
+        Loaded model wrapper
+    """
+    return get_model_class(name)(**kwargs)
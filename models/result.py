@@ -0,0 +1,68 @@
+"""
+In-memory result of a generate() call.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils import save_audio, get_audio_duration
+
+
+@dataclass
+class GenerationResult:
+    """
+    Generated speech kept in memory.
+
+    Attributes:
+        audio: Mono float32 waveform at the model's native sample rate
+        sample_rate: Sample rate of `audio`
+        timings: Seconds spent per step ("synthesis", and "file_write" once
+            saved)
+        output_path: Where the audio was saved, or None if only in memory
+        output_size: Size of the saved file in bytes, or None
+        cached: Whether the audio came from the synthesis cache
+    """
+
+    audio: np.ndarray
+    sample_rate: int
+    timings: Dict[str, float] = field(default_factory=dict)
+    output_path: Optional[Path] = None
+    output_size: Optional[int] = None
+    cached: bool = False
+
+    def __post_init__(self):
+        self.audio = np.asarray(self.audio, dtype=np.float32)
+
+    @property
+    def duration(self) -> float:
+        """Audio duration in seconds."""
+        return get_audio_duration(self.audio, self.sample_rate)
+
+    def save(
+        self,
+        output_path: Path,
+        target_sample_rate: Optional[int] = None,
+        bitrate_kbps: Optional[float] = None
+    ) -> Path:
+        """
+        Write the audio to disk, encoded by file extension (.wav/.flac/.opus).
+
+        Args:
+            output_path: Output path for the audio file
+            target_sample_rate: Optional output rate (native rate if None)
+            bitrate_kbps: Opus bitrate (config default if None)
+
+        Returns:
+            Path to the saved file
+        """
+        output_path = Path(output_path)
+        encoding = save_audio(
+            self.audio, output_path, self.sample_rate,
+            target_sample_rate=target_sample_rate, bitrate_kbps=bitrate_kbps)
+        self.timings['file_write'] = encoding['encode_time']
+        self.output_path = output_path
+        self.output_size = encoding['output_size']
+        return output_path
@@ -0,0 +1,207 @@
+"""
+Sentence-sharded parallel synthesis across a pool of model worker processes.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple, Type
+
+from utils import split_sentences
+
+from .result import GenerationResult
+
+
+# Model instance owned by each worker process
+_worker_model = None
+
+
+def _init_worker(model_cls: Type, num_threads: int, ready_counter, error_queue) -> None:
+    """
+    Load a model inside a worker process with a pinned thread budget.
+
+    A failed load is reported on `error_queue` instead of raised: an
+    initializer exception kills the worker and Pool would respawn it forever.
+
+    Args:
+        model_cls: Model wrapper class (YourTTS or XTTS)
+        num_threads: Torch intra-op threads for this worker
+        ready_counter: Shared counter incremented once the model is loaded
+        error_queue: Queue receiving the traceback of a failed load
+    """
+    global _worker_model
+
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        torch.set_num_interop_threads(1)
+
+        # Keep this worker's budget instead of the host-wide thread profile
+        _worker_model = model_cls(apply_thread_profile=False)
+    except BaseException:
+        error_queue.put(traceback.format_exc())
+        return
+
+    with ready_counter.get_lock():
+        ready_counter.value += 1
+
+
+def _synthesize_shard(args: Tuple[str, str]) -> Tuple[np.ndarray, int]:
+    """
+    Synthesize one sentence in a worker process.
+
+    Args:
+        args: Tuple of (sentence, reference_audio_path)
+
+    Returns:
+        Tuple of (audio_array, sample_rate)
+    """
+    sentence, reference_audio_path = args
+    if _worker_model is None:
+        raise RuntimeError("worker failed to load its model")
+    audio = _worker_model._synthesize(sentence, Path(reference_audio_path))
+    return np.asarray(audio, dtype=np.float32), _worker_model.sample_rate
+
+
+class ShardedSynthesizer:
+    """
+    Pipeline stage that splits text into sentences and synthesizes them in
+    parallel, one loaded model per worker process.
+
+    Each worker holds its own copy of the model, so memory grows linearly
+    with `num_workers`. Every shard ends with the model's sentence pause, so
+    the shards are joined as they are, giving the same layout as a single
+    generate() call.
+    """
+
+    def __init__(
+        self,
+        model_cls: Type,
+        num_workers: int = 2,
+        threads_per_worker: Optional[int] = None
+    ):
+        """
+        Start the worker pool.
+
+        Args:
+            model_cls: Model wrapper class (YourTTS or XTTS)
+            num_workers: Number of worker processes (degree of parallelism)
+            threads_per_worker: Torch threads per worker (CPU count split
+                evenly across workers if None)
+        """
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+
+        ctx = mp.get_context("spawn")
+        self._ready_counter = ctx.Value('i', 0)
+        self._error_queue = ctx.Queue()
+        self._pool = ctx.Pool(
+            processes=num_workers,
+            initializer=_init_worker,
+            initargs=(model_cls, threads_per_worker, self._ready_counter, self._error_queue)
+        )
+
+    def wait_until_ready(
+        self,
+        timeout: Optional[float] = 600.0,
+        poll_interval: float = 0.5
+    ) -> None:
+        """
+        Block until every worker has finished loading its model.
+
+        Args:
+            timeout: Seconds to wait (unbounded if None)
+            poll_interval: Seconds between checks
+
+        Raises:
+            RuntimeError: If a worker failed to load its model (the pool is
+                terminated)
+            TimeoutError: If the workers are not ready within `timeout` (the
+                pool is terminated)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._ready_counter.value < self.num_workers:
+            try:
+                error = self._error_queue.get(timeout=poll_interval)
+            except queue.Empty:
+                error = None
+            if error is not None:
+                self._pool.terminate()
+                raise RuntimeError(f"Worker failed to load its model:\n{error}")
+            if deadline is not None and time.monotonic() > deadline:
+                self._pool.terminate()
+                raise TimeoutError(
+                    f"{self._ready_counter.value} of {self.num_workers} workers "
+                    f"ready after {timeout:.0f}s")
+
+    def synthesize(self, text: str, reference_audio_path: Path) -> Tuple[np.ndarray, int]:
+        """
+        Synthesize text by fanning sentences out to the worker pool.
+
+        Args:
+            text: Text to synthesize
+            reference_audio_path: Path to reference audio for voice cloning
+
+        Returns:
+            Tuple of (audio_array, sample_rate)
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            raise ValueError("Text contains no sentences to synthesize")
+
+        # map() returns results in submission order
+        shards = self._pool.map(
+            _synthesize_shard,
+            [(sentence, str(reference_audio_path)) for sentence in sentences],
+            chunksize=1
+        )
+
+        sample_rate = shards[0][1]
+        audio = np.concatenate([shard for shard, _ in shards])
+        return audio, sample_rate
+
+    def generate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None
+    ) -> GenerationResult:
+        """
+        Synthesize text in parallel, optionally saving it to disk.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Output path for the generated audio (kept in memory
+                only if None)
+
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+        """
+        start_time = time.perf_counter()
+        audio, sample_rate = self.synthesize(text, reference_audio_path)
+        result = GenerationResult(
+            audio, sample_rate, {'synthesis': time.perf_counter() - start_time})
+
+        if output_path is not None:
+            result.save(output_path)
+            print(f"Audio saved to: {output_path}")
+        return result
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> "ShardedSynthesizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
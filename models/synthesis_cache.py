@@ -0,0 +1,133 @@
+"""
+Content-addressed cache of synthesized audio.
+
+Repeated (model, text, reference voice) requests such as fixed prompts and
+retries are served from disk instead of being synthesized again. Entries are
+keyed by model version, normalized text, the reference audio's content hash
+and the synthesis parameters, so changing any of them misses the cache. The
+least recently used entries are evicted once the cache grows past its disk
+budget.
+
+Models that sample (XTTS) return the first sampled output for every
+repeated request; pass use_cache=False to generate() for a fresh sample.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils import (
+    SYNTHESIS_CACHE_DIR,
+    SYNTHESIS_CACHE_SIZE,
+    SYNTHESIS_CACHE_MAX_BYTES,
+    ArrayCache,
+    hash_file,
+    make_cache_key,
+    normalize_text
+)
+
+from .result import GenerationResult
+
+
+class SynthesisCache:
+    """Disk-backed LRU of generated waveforms with hit-rate reporting."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_entries: int = SYNTHESIS_CACHE_SIZE,
+        max_disk_bytes: Optional[int] = SYNTHESIS_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Cache directory (uses config default if None)
+            max_entries: Maximum number of waveforms kept in memory
+            max_disk_bytes: Disk budget in bytes (unbounded if None)
+        """
+        self.store = ArrayCache(
+            Path(cache_dir or SYNTHESIS_CACHE_DIR),
+            max_entries=max_entries,
+            max_disk_bytes=max_disk_bytes,
+            compress=False
+        )
+        self.time_saved = 0.0
+
+    @staticmethod
+    def make_key(
+        model_version: str,
+        text: str,
+        reference_audio_path: Path,
+        params: Dict
+    ) -> str:
+        """
+        Cache key of one synthesis request.
+
+        Args:
+            model_version: Model name and version
+            text: Text to synthesize (normalized before hashing)
+            reference_audio_path: Reference audio (hashed by content)
+            params: Synthesis parameters that affect the output
+
+        Returns:
+            Cache key
+        """
+        return make_cache_key(
+            model_version,
+            normalize_text(text),
+            hash_file(reference_audio_path),
+            json.dumps(params, sort_keys=True, default=str)
+        )
+
+    def get(self, key: str) -> Optional[GenerationResult]:
+        """
+        Look up a synthesized waveform.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            GenerationResult (timings hold the lookup time), or None on a miss
+        """
+        start_time = time.perf_counter()
+        cached = self.store.get(key)
+        if cached is None:
+            return None
+
+        lookup_time = time.perf_counter() - start_time
+        self.time_saved += max(float(cached['synthesis_time']) - lookup_time, 0.0)
+        return GenerationResult(
+            cached['audio'], int(cached['sample_rate']),
+            {'synthesis': lookup_time}, cached=True)
+
+    def put(self, key: str, result: GenerationResult) -> None:
+        """
+        Store a synthesized waveform.
+
+        Args:
+            key: Cache key from make_key()
+            result: Freshly synthesized result
+        """
+        self.store.put(key, {
+            'audio': result.audio,
+            'sample_rate': np.int64(result.sample_rate),
+            'synthesis_time': np.float64(result.timings.get('synthesis', 0.0))
+        })
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, memory_entries
+            and time_saved (seconds of synthesis skipped)
+        """
+        stats = self.store.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['time_saved'] = self.time_saved
+        return stats
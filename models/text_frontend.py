@@ -0,0 +1,159 @@
+"""
+Memoized text frontend (cleaning + espeak-ng phonemization + token ids).
+
+Coqui's tokenizer cleans, phonemizes (one espeak-ng process per call) and
+encodes every sentence on every request. CachedTextFrontend wraps the
+tokenizer's text_to_ids so each normalized sentence is processed once:
+results are kept in memory and appended to a JSON-lines file shared by all
+processes. encode_many() phonemizes the missing sentences of a batch or
+manifest concurrently, since each espeak-ng call is a separate process.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils import PHONEME_CACHE_FILE, TEXT_FRONTEND_WORKERS, make_cache_key, normalize_text
+
+
+# Bump when the cached representation changes
+_FRONTEND_VERSION = "1"
+
+
+class CachedTextFrontend:
+    """Per-sentence memo of a tokenizer's text_to_ids, in memory and on disk."""
+
+    def __init__(
+        self,
+        text_to_ids: Callable[..., List[int]],
+        model_version: str,
+        cache_path: Optional[Path] = None,
+        workers: int = TEXT_FRONTEND_WORKERS
+    ):
+        """
+        Initialize frontend.
+
+        Args:
+            text_to_ids: The tokenizer's original text_to_ids(text, language)
+            model_version: Model name and version (token ids are model specific)
+            cache_path: JSON-lines cache file (uses config default if None)
+            workers: Concurrent phonemizer calls in encode_many()
+        """
+        self._text_to_ids = text_to_ids
+        self.model_version = model_version
+        self.cache_path = Path(cache_path or PHONEME_CACHE_FILE)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._entries = self._read()
+        self.hits = 0
+        self.misses = 0
+        self.frontend_time = 0.0
+
+    def _read(self) -> Dict[str, List[int]]:
+        """Load cached token ids (malformed lines from interrupted writes are skipped)."""
+        entries = {}
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry['ids']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    def _key(self, text: str, language: Optional[str]) -> str:
+        """Cache key of a sentence."""
+        return make_cache_key(
+            self.model_version, _FRONTEND_VERSION, language or "", normalize_text(text))
+
+    def _store(self, computed: Dict[str, List[int]]) -> None:
+        """Remember new entries and append them to the cache file."""
+        lines = "".join(
+            json.dumps({'key': key, 'ids': ids}) + "\n" for key, ids in computed.items())
+        with self._lock:
+            self._entries.update(computed)
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.cache_path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+            except OSError as e:
+                print(f"Warning: could not write phoneme cache: {e}")
+
+    def text_to_ids(self, text: str, language: Optional[str] = None) -> List[int]:
+        """
+        Token ids of a sentence (drop-in replacement for the tokenizer's method).
+
+        Args:
+            text: Sentence
+            language: Language name passed to the phonemizer
+
+        Returns:
+            Token ids
+        """
+        start_time = time.perf_counter()
+        key = self._key(text, language)
+        ids = self._entries.get(key)
+        if ids is None:
+            self.misses += 1
+            ids = list(self._text_to_ids(normalize_text(text), language=language))
+            self._store({key: ids})
+        else:
+            self.hits += 1
+        self.frontend_time += time.perf_counter() - start_time
+        return list(ids)
+
+    def encode_many(self, texts: Iterable[str], language: Optional[str] = None) -> List[List[int]]:
+        """
+        Token ids of many sentences, phonemizing the missing ones concurrently.
+
+        Args:
+            texts: Sentences
+            language: Language name passed to the phonemizer
+
+        Returns:
+            Token ids per sentence, in order
+        """
+        start_time = time.perf_counter()
+        texts = list(texts)
+        keys = [self._key(text, language) for text in texts]
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._entries and key not in missing:
+                missing[key] = normalize_text(text)
+
+        if missing:
+            workers = max(1, min(self.workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                computed = list(executor.map(
+                    lambda text: list(self._text_to_ids(text, language=language)),
+                    missing.values()))
+            self._store(dict(zip(missing, computed)))
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        self.frontend_time += time.perf_counter() - start_time
+        return [list(self._entries[key]) for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get frontend statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries and frontend_time
+            (seconds spent in the frontend, lookups included)
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'frontend_time': self.frontend_time,
+        }
@@ -2,19 +2,41 @@
 XTTS v2 model wrapper for zero-shot voice cloning (Coqui TTS).
 """
 
+import time
 import numpy as np
+import torch
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional, Tuple
+import TTS as coqui_tts
 from TTS.api import TTS
 
 from utils import (
-    load_audio,
-    save_audio,
-    SAMPLE_RATE,
+    open_audio_writer,
     GENERATED_XTTS_DIR,
-    XTTS_MODEL_NAME
+    XTTS_MODEL_NAME,
+    XTTS_LATENT_CACHE_DIR,
+    XTTS_LATENT_CACHE_SIZE,
+    SENTENCE_PAUSE_SAMPLES,
+    THREAD_PROFILE,
+    ASYNC_MAX_CONCURRENCY,
+    ArrayCache,
+    ReferenceAudioStore,
+    hash_file,
+    make_cache_key,
+    apply_thread_settings,
+    stage,
+    instrument_method,
+    instrument_module
 )
 
+from .aio import AsyncRunner, check_cancelled, generate_async
+from .quantization import quantize_module, quantized_weights_path
+from .result import GenerationResult
+from .synthesis_cache import SynthesisCache
+
+# Sample rate XTTS expects for conditioning audio
+CONDITIONING_SAMPLE_RATE = 22050
+
 
 class XTTS:
     """
@@ -29,7 +51,14 @@ class XTTS:
     - This implementation accepts the non-commercial license terms automatically
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        latent_cache: Optional[ArrayCache] = None,
+        reference_store: Optional[ReferenceAudioStore] = None,
+        quantize: bool = False,
+        synthesis_cache: Optional[SynthesisCache] = None,
+        apply_thread_profile: bool = True
+    ):
         """
         Initialize and load XTTS v2 model.
 
@@ -39,6 +68,18 @@ class XTTS:
         containers without TTY.
 
         If you need commercial use, purchase a license from licensing@coqui.ai
+
+        Args:
+            latent_cache: Optional cache for conditioning latents (a
+                persistent cache under XTTS_LATENT_CACHE_DIR is used if None)
+            reference_store: Optional decode-once reference audio store
+            quantize: Run the GPT with int8 dynamic quantization (quantized
+                weights are saved on first use and loaded afterwards)
+            synthesis_cache: Optional cache of synthesized audio (a
+                disk-backed cache under SYNTHESIS_CACHE_DIR is used if None)
+            apply_thread_profile: Size torch's thread pools from THREAD_PROFILE.
+                Pass False when the caller has already set a thread budget
+                (pinned or sharded workers), so it is kept.
         """
         import os
 
@@ -46,73 +87,352 @@ class XTTS:
         # Required to avoid "EOF when reading a line" error in Docker
         os.environ['COQUI_TOS_AGREED'] = '1'
 
+        # Tuned torch thread counts for this host, if any
+        self.thread_settings = None
+        if apply_thread_profile:
+            self.thread_settings = apply_thread_settings(THREAD_PROFILE.get('xtts'))
+        if self.thread_settings:
+            print(f"Thread profile: {self.thread_settings['intra_op_threads']} intra-op, "
+                  f"{self.thread_settings['inter_op_threads']} inter-op threads")
+
         print(f"Loading XTTS v2 model: {XTTS_MODEL_NAME}")
         print("Accepting Coqui CPML non-commercial license terms...")
 
         # Initialize with gpu=False for CPU-only inference
         self.model = TTS(XTTS_MODEL_NAME, progress_bar=False, gpu=False)
-        self.sample_rate = SAMPLE_RATE
+        # Native output rate (XTTS: 24 kHz, YourTTS: 16 kHz)
+        self.sample_rate = self.model.synthesizer.output_sample_rate
         print("XTTS v2 model loaded successfully")
 
-    def _synthesize(self, text: str, reference_audio_path: Path) -> np.ndarray:
+        # Conditioning latents are keyed by model version + reference content
+        self.model_version = f"{XTTS_MODEL_NAME}@{coqui_tts.__version__}"
+        self.latent_cache = latent_cache or ArrayCache(
+            XTTS_LATENT_CACHE_DIR, max_entries=XTTS_LATENT_CACHE_SIZE)
+        self.latent_cache_stats = {'hits': 0, 'misses': 0, 'time_saved': 0.0}
+        self.reference_store = reference_store or ReferenceAudioStore()
+        self.synthesis_cache = synthesis_cache or SynthesisCache()
+        self.async_runner = AsyncRunner('xtts', ASYNC_MAX_CONCURRENCY)
+
+        self.quantized = quantize
+        if quantize:
+            self._quantize()
+        self._instrument()
+
+    def _quantize(self) -> None:
+        """Apply int8 dynamic quantization to the GPT transformer."""
+        # Quantized in place: the GPT inference wrapper shares this module
+        start_time = time.perf_counter()
+        status = quantize_module(
+            self.model.synthesizer.tts_model.gpt.gpt,
+            quantized_weights_path(self.model_version, "xtts_gpt")
+        )
+        print(f"GPT int8 dynamic quantization: {status} in "
+              f"{time.perf_counter() - start_time:.2f}s")
+
+    def _instrument(self) -> None:
+        """Attach stage-timing hooks (no-ops unless a StageTimer is active)."""
+        tts_model = self.model.synthesizer.tts_model
+        instrument_method(
+            tts_model.tokenizer, 'encode', 'text_frontend',
+            counter=lambda ids: ('text_tokens', len(ids)))
+        instrument_method(
+            tts_model.gpt, 'generate', 'gpt_decode',
+            counter=lambda codes: ('gpt_tokens', int(codes.shape[-1])))
+        instrument_module(tts_model.gpt, 'gpt_latents')
+        instrument_module(tts_model.hifigan_decoder, 'vocoder')
+
+    def _get_conditioning_latents(
+        self,
+        reference_audio_path: Path,
+        verbose: bool = True
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Get GPT conditioning latents and speaker embedding for a reference.
+
+        Latents are looked up by a content hash of the reference audio and
+        only computed (then cached) on a miss.
+
+        Args:
+            reference_audio_path: Path to reference audio for voice cloning
+            verbose: Whether to print cache hits and misses
+
+        Returns:
+            Tuple of (gpt_cond_latent, speaker_embedding)
+        """
+        key = make_cache_key(self.model_version, hash_file(reference_audio_path))
+
+        start_time = time.perf_counter()
+        cached = self.latent_cache.get(key)
+        if cached is not None:
+            lookup_time = time.perf_counter() - start_time
+            time_saved = max(float(cached['compute_time']) - lookup_time, 0.0)
+            self.latent_cache_stats['hits'] += 1
+            self.latent_cache_stats['time_saved'] += time_saved
+            if verbose:
+                print(f"Conditioning latents: cache hit "
+                      f"({lookup_time * 1000:.1f} ms, saved {time_saved:.2f}s)")
+            return (
+                torch.from_numpy(cached['gpt_cond_latent']),
+                torch.from_numpy(cached['speaker_embedding'])
+            )
+
+        # Cache miss: compute latents from the decoded reference buffer
+        # (mirrors Xtts.get_conditioning_latents without re-decoding the file)
+        tts_model = self.model.synthesizer.tts_model
+        config = self.model.synthesizer.tts_config
+        pcm = self.reference_store.get(reference_audio_path, CONDITIONING_SAMPLE_RATE)
+        audio = torch.from_numpy(pcm)[None, :CONDITIONING_SAMPLE_RATE * config.max_ref_len]
+        if config.sound_norm_refs:
+            audio = (audio / torch.abs(audio).max()) * 0.75
+
+        speaker_embedding = tts_model.get_speaker_embedding(
+            audio, CONDITIONING_SAMPLE_RATE)
+        gpt_cond_latent = tts_model.get_gpt_cond_latents(
+            audio,
+            CONDITIONING_SAMPLE_RATE,
+            length=config.gpt_cond_len,
+            chunk_length=config.gpt_cond_chunk_len
+        )
+        compute_time = time.perf_counter() - start_time
+
+        self.latent_cache.put(key, {
+            'gpt_cond_latent': gpt_cond_latent.cpu().numpy(),
+            'speaker_embedding': speaker_embedding.cpu().numpy(),
+            'compute_time': np.float64(compute_time)
+        })
+        self.latent_cache_stats['misses'] += 1
+        if verbose:
+            print(f"Conditioning latents: cache miss (computed in {compute_time:.2f}s)")
+
+        return gpt_cond_latent, speaker_embedding
+
+    def _inference_settings(self) -> dict:
+        """Return the GPT sampling settings from the model config."""
+        config = self.model.synthesizer.tts_config
+        return {
+            'temperature': config.temperature,
+            'length_penalty': config.length_penalty,
+            'repetition_penalty': config.repetition_penalty,
+            'top_k': config.top_k,
+            'top_p': config.top_p
+        }
+
+    def _synthesize(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        verbose: bool = True
+    ) -> np.ndarray:
         """
         Generate speech using the TTS model with voice cloning.
 
         Args:
             text: Text to synthesize
             reference_audio_path: Path to reference audio for voice cloning
+            verbose: Whether to print conditioning cache hits and misses
 
         Returns:
             Generated audio as numpy array
         """
-        # Load reference audio using utils
-        reference_audio, _ = load_audio(reference_audio_path)
-
-        # Generate speech with voice cloning
-        wav = self.model.tts(
-            text=text,
-            speaker_wav=str(reference_audio_path),
-            language="en"
-        )
+        # Reuse cached conditioning latents for the reference voice
+        with stage('conditioning'):
+            gpt_cond_latent, speaker_embedding = self._get_conditioning_latents(
+                reference_audio_path, verbose)
+
+        # Generate speech sentence by sentence from the latents
+        synthesizer = self.model.synthesizer
+        settings = self._inference_settings()
+
+        with stage('sentence_split'):
+            sentences = synthesizer.split_into_sentences(text)
+
+        wavs = []
+        for sentence in sentences:
+            # Stop early if an async caller cancelled or timed out
+            check_cancelled()
+            outputs = synthesizer.tts_model.inference(
+                sentence,
+                "en",
+                gpt_cond_latent,
+                speaker_embedding,
+                **settings
+            )
+            wavs.append(np.asarray(outputs["wav"], dtype=np.float32))
+            wavs.append(np.zeros(SENTENCE_PAUSE_SAMPLES, dtype=np.float32))
+
+        return np.concatenate(wavs)
 
-        # Convert to numpy array if needed
-        if not isinstance(wav, np.ndarray):
-            wav = np.array(wav)
+    def synthesis_key(self, text: str, reference_audio_path: Path) -> str:
+        """
+        Synthesis cache key of a request.
 
-        return wav
+        Args:
+            text: Text to synthesize
+            reference_audio_path: Path to reference audio for voice cloning
+
+        Returns:
+            Cache key covering everything that affects the output
+        """
+        params = {
+            'quantized': self.quantized,
+            'language': 'en',
+            'sample_rate': self.sample_rate,
+            'sentence_pause_samples': SENTENCE_PAUSE_SAMPLES,
+            **self._inference_settings()
+        }
+        return self.synthesis_cache.make_key(
+            self.model_version, text, reference_audio_path, params)
+
+    def default_output_path(self) -> Path:
+        """Return a timestamped output path in GENERATED_XTTS_DIR (unique across concurrent requests)."""
+        import datetime
+        import uuid
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return GENERATED_XTTS_DIR / f"xtts_{timestamp}_{uuid.uuid4().hex[:8]}.wav"
+
+    def stream(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        on_chunk: Optional[Callable[[np.ndarray], None]] = None,
+        stream_chunk_size: int = 20
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate audio with voice cloning, yielding chunks as they are decoded.
+
+        Uses XTTS streaming inference: every `stream_chunk_size` GPT tokens are
+        vocoded and yielded immediately. Each chunk is appended to the output
+        WAV file as it arrives.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Optional output path (auto-generated if None)
+            on_chunk: Optional callback invoked with every audio chunk
+            stream_chunk_size: Number of GPT tokens per yielded chunk
+
+        Yields:
+            Audio chunks as float32 numpy arrays
+        """
+        if output_path is None:
+            output_path = self.default_output_path()
+
+        gpt_cond_latent, speaker_embedding = self._get_conditioning_latents(
+            reference_audio_path)
+
+        synthesizer = self.model.synthesizer
+        settings = self._inference_settings()
+        pause = np.zeros(SENTENCE_PAUSE_SAMPLES, dtype=np.float32)
+
+        print(f"Streaming speech with XTTS v2...")
+        with open_audio_writer(output_path, self.sample_rate) as writer:
+            for index, sentence in enumerate(synthesizer.split_into_sentences(text)):
+                chunks = synthesizer.tts_model.inference_stream(
+                    sentence,
+                    "en",
+                    gpt_cond_latent,
+                    speaker_embedding,
+                    stream_chunk_size=stream_chunk_size,
+                    **settings
+                )
+                for chunk_index, chunk in enumerate(chunks):
+                    chunk = chunk.cpu().numpy().astype(np.float32, copy=False)
+
+                    # Sentence pause travels with the next sentence's first chunk
+                    if index > 0 and chunk_index == 0:
+                        chunk = np.concatenate([pause, chunk])
+
+                    writer.write(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                    yield chunk
+
+        print(f"Audio saved to: {output_path}")
 
     def generate(
         self,
         text: str,
         reference_audio_path: Path,
-        output_path: Optional[Path] = None
-    ) -> Path:
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        verbose: bool = True
+    ) -> GenerationResult:
         """
         Generate audio with voice cloning (MAIN FUNCTION).
 
+        The waveform is returned in memory; writing it to disk is a separate
+        step that can be skipped with save=False (and done later with
+        GenerationResult.save). Repeated requests are served from the
+        synthesis cache (use_cache=False draws a fresh sample).
+
         Args:
             text: Text to convert to speech
             reference_audio_path: Path to reference audio for voice cloning
             output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            verbose: Whether to print progress
 
         Returns:
-            Path to generated audio file
+            GenerationResult with waveform, sample rate, duration and timings
         """
-        # Generate default output path if not provided
-        if output_path is None:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = GENERATED_XTTS_DIR / f"xtts_{timestamp}.wav"
+        key = self.synthesis_key(text, reference_audio_path) if use_cache else None
+        result = self.synthesis_cache.get(key) if key is not None else None
 
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if result is not None:
+            if verbose:
+                print(f"Synthesis cache hit ({result.timings['synthesis'] * 1000:.1f} ms)")
+        else:
+            # Synthesize speech
+            if verbose:
+                print(f"Generating speech with XTTS v2...")
+            start_time = time.perf_counter()
+            audio = self._synthesize(text, reference_audio_path, verbose)
+            result = GenerationResult(
+                audio, self.sample_rate, {'synthesis': time.perf_counter() - start_time})
+            if key is not None:
+                self.synthesis_cache.put(key, result)
 
-        # Synthesize speech
-        print(f"Generating speech with XTTS v2...")
-        audio = self._synthesize(text, reference_audio_path)
+        # Optionally persist the audio
+        if save:
+            result.save(output_path or self.default_output_path())
+            if verbose:
+                print(f"Audio saved to: {result.output_path}")
 
-        # Save audio using utils
-        save_audio(audio, output_path, self.sample_rate)
-        print(f"Audio saved to: {output_path}")
+        return result
+
+    async def agenerate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> GenerationResult:
+        """
+        Asyncio counterpart of generate().
+
+        Inference runs on the model's AsyncRunner (at most
+        ASYNC_MAX_CONCURRENCY requests at a time) and the file is written on
+        the I/O pool, so the event loop never blocks. Nothing is printed.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            timeout: Seconds allowed, queueing included (unbounded if None)
 
-        return output_path
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+
+        Raises:
+            asyncio.TimeoutError: If `timeout` expired (synthesis stops at
+                the next sentence)
+        """
+        return await generate_async(
+            self, text, reference_audio_path, output_path, save, use_cache, timeout)
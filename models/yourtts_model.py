@@ -2,30 +2,234 @@
 YourTTS model wrapper for zero-shot voice cloning (Coqui TTS).
 """
 
+import time
 import numpy as np
+import torch
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+import TTS as coqui_tts
 from TTS.api import TTS
+from TTS.tts.utils.synthesis import synthesis, trim_silence
 
 from utils import (
-    load_audio,
-    save_audio,
-    SAMPLE_RATE,
     GENERATED_YOURTTS_DIR,
-    YOURTTS_MODEL_NAME
+    YOURTTS_MODEL_NAME,
+    YOURTTS_EMBEDDING_CACHE_DIR,
+    YOURTTS_EMBEDDING_CACHE_SIZE,
+    YOURTTS_EMBEDDING_CACHE_MAX_BYTES,
+    REFERENCE_AUDIO_EXTENSIONS,
+    SENTENCE_PAUSE_SAMPLES,
+    THREAD_PROFILE,
+    ASYNC_MAX_CONCURRENCY,
+    ArrayCache,
+    ReferenceAudioStore,
+    hash_file,
+    make_cache_key,
+    apply_thread_settings,
+    stage,
+    count,
+    instrument_method,
+    instrument_module
 )
 
+from .aio import AsyncRunner, check_cancelled, generate_async
+from .onnx_backend import default_scales, load_onnx_session
+from .quantization import quantize_module, quantized_weights_path
+from .result import GenerationResult
+from .synthesis_cache import SynthesisCache
+from .text_frontend import CachedTextFrontend
+
+# Inference backends for the VITS model
+BACKENDS = ("torch", "onnx")
+
 
 class YourTTS:
     """Wrapper for YourTTS model with voice cloning capabilities."""
 
-    def __init__(self):
-        """Initialize and load YourTTS model."""
+    def __init__(
+        self,
+        embedding_store: Optional[ArrayCache] = None,
+        reference_store: Optional[ReferenceAudioStore] = None,
+        quantize: bool = False,
+        backend: str = "torch",
+        synthesis_cache: Optional[SynthesisCache] = None,
+        apply_thread_profile: bool = True
+    ):
+        """
+        Initialize and load YourTTS model.
+
+        Args:
+            embedding_store: Optional speaker-embedding store (a disk-backed
+                store under YOURTTS_EMBEDDING_CACHE_DIR is used if None)
+            reference_store: Optional decode-once reference audio store
+            quantize: Run linear and pointwise-conv layers with int8 dynamic
+                quantization (quantized weights are saved on first use and
+                loaded afterwards)
+            backend: "torch" (eager PyTorch) or "onnx" (ONNX Runtime; the
+                model is exported on first use). Tokenization and the
+                speaker encoder run in PyTorch either way.
+            synthesis_cache: Optional cache of synthesized audio (a
+                disk-backed cache under SYNTHESIS_CACHE_DIR is used if None)
+            apply_thread_profile: Size torch's thread pools from THREAD_PROFILE.
+                Pass False when the caller has already set a thread budget
+                (pinned or sharded workers), so it is kept.
+
+        Raises:
+            ValueError: If the backend is unknown or combined with quantize
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Available: {', '.join(BACKENDS)}")
+        if backend == "onnx" and quantize:
+            raise ValueError("quantize applies to the torch backend only")
+
+        # Tuned torch thread counts for this host, if any
+        self.thread_settings = None
+        if apply_thread_profile:
+            self.thread_settings = apply_thread_settings(THREAD_PROFILE.get('yourtts'))
+        if self.thread_settings:
+            print(f"Thread profile: {self.thread_settings['intra_op_threads']} intra-op, "
+                  f"{self.thread_settings['inter_op_threads']} inter-op threads")
+
         print(f"Loading YourTTS model: {YOURTTS_MODEL_NAME}")
         self.model = TTS(YOURTTS_MODEL_NAME)
-        self.sample_rate = SAMPLE_RATE
+        # Native output rate (XTTS: 24 kHz, YourTTS: 16 kHz)
+        self.sample_rate = self.model.synthesizer.output_sample_rate
         print("YourTTS model loaded successfully")
 
+        # Speaker d-vectors are keyed by model version + reference content.
+        # The store lives on disk so other processes reuse the same vectors.
+        self.model_version = f"{YOURTTS_MODEL_NAME}@{coqui_tts.__version__}"
+        self.embedding_store = embedding_store or ArrayCache(
+            YOURTTS_EMBEDDING_CACHE_DIR,
+            max_entries=YOURTTS_EMBEDDING_CACHE_SIZE,
+            max_disk_bytes=YOURTTS_EMBEDDING_CACHE_MAX_BYTES,
+            compress=False
+        )
+        self.reference_store = reference_store or ReferenceAudioStore()
+        self.synthesis_cache = synthesis_cache or SynthesisCache()
+        self.async_runner = AsyncRunner('yourtts', ASYNC_MAX_CONCURRENCY)
+
+        # Phonemize each sentence once. Installed before _instrument() so the
+        # text_frontend stage includes cache lookups.
+        tokenizer = self.model.synthesizer.tts_model.tokenizer
+        self.frontend = CachedTextFrontend(tokenizer.text_to_ids, self.model_version)
+        tokenizer.text_to_ids = self.frontend.text_to_ids
+
+        self.quantized = quantize
+        if quantize:
+            self._quantize()
+        self._instrument()
+
+        self.backend = backend
+        self.onnx_session = None
+        if backend == "onnx":
+            self._load_onnx()
+
+    def _quantize(self) -> None:
+        """Apply int8 dynamic quantization to the VITS model."""
+        start_time = time.perf_counter()
+        status = quantize_module(
+            self.model.synthesizer.tts_model,
+            quantized_weights_path(self.model_version, "yourtts_vits"),
+            pointwise_conv=True
+        )
+        print(f"VITS int8 dynamic quantization: {status} in "
+              f"{time.perf_counter() - start_time:.2f}s")
+
+    def _load_onnx(self) -> None:
+        """Open the ONNX Runtime session, exporting the model if needed."""
+        start_time = time.perf_counter()
+        tts_model = self.model.synthesizer.tts_model
+        self.onnx_session, status = load_onnx_session(
+            tts_model, self.model_version, tts_model.embedded_speaker_dim)
+        print(f"ONNX Runtime session: {status} in "
+              f"{time.perf_counter() - start_time:.2f}s")
+
+    def _instrument(self) -> None:
+        """Attach stage-timing hooks (no-ops unless a StageTimer is active)."""
+        tts_model = self.model.synthesizer.tts_model
+        instrument_method(
+            tts_model.tokenizer, 'text_to_ids', 'text_frontend',
+            counter=lambda ids: ('text_tokens', len(ids)))
+        instrument_module(tts_model.text_encoder, 'text_encoder')
+        instrument_module(tts_model.duration_predictor, 'duration_predictor')
+        instrument_module(tts_model.flow, 'flow')
+        instrument_module(tts_model.waveform_decoder, 'vocoder')
+
+    def _get_speaker_embedding(self, reference_audio_path: Path) -> np.ndarray:
+        """
+        Get the speaker d-vector for a reference clip.
+
+        The speaker encoder only runs when the reference has not been seen
+        before; known voices are served from the embedding store.
+
+        Args:
+            reference_audio_path: Path to reference audio for voice cloning
+
+        Returns:
+            Speaker embedding with shape [1, D]
+        """
+        key = make_cache_key(self.model_version, hash_file(reference_audio_path))
+
+        cached = self.embedding_store.get(key)
+        if cached is not None:
+            return cached['d_vector']
+
+        # Encode the decoded reference buffer (mirrors
+        # SpeakerManager.compute_embedding_from_clip without re-decoding)
+        speaker_manager = self.model.synthesizer.tts_model.speaker_manager
+        encoder_ap = speaker_manager.encoder_ap
+        waveform = self.reference_store.get(
+            reference_audio_path, encoder_ap.sample_rate)
+        if encoder_ap.do_trim_silence:
+            waveform = encoder_ap.trim_silence(waveform)
+        if encoder_ap.do_sound_norm:
+            waveform = encoder_ap.sound_norm(waveform)
+        if encoder_ap.do_rms_norm:
+            waveform = encoder_ap.rms_volume_norm(waveform, encoder_ap.db_level)
+
+        if not speaker_manager.encoder_config.model_params.get("use_torch_spec", False):
+            m_input = torch.from_numpy(encoder_ap.melspectrogram(waveform))
+        else:
+            m_input = torch.from_numpy(waveform)
+        if speaker_manager.use_cuda:
+            m_input = m_input.cuda()
+
+        with torch.no_grad():
+            embedding = speaker_manager.encoder.compute_embedding(m_input.unsqueeze(0))
+        d_vector = embedding.cpu().numpy().astype(np.float32)[:1]
+
+        self.embedding_store.put(key, {'d_vector': d_vector})
+        return d_vector
+
+    def register_speaker(self, reference_audio_path: Path) -> np.ndarray:
+        """
+        Pre-compute and store the speaker embedding for a reference clip.
+
+        Args:
+            reference_audio_path: Path to reference audio
+
+        Returns:
+            Speaker embedding with shape [1, D]
+        """
+        return self._get_speaker_embedding(Path(reference_audio_path))
+
+    def register_speakers(self, reference_dir: Path) -> Dict[str, np.ndarray]:
+        """
+        Pre-register every reference clip found in a directory.
+
+        Args:
+            reference_dir: Directory containing reference audio files
+
+        Returns:
+            Dictionary mapping file path to speaker embedding
+        """
+        embeddings = {}
+        for audio_path in sorted(Path(reference_dir).iterdir()):
+            if audio_path.suffix.lower() in REFERENCE_AUDIO_EXTENSIONS:
+                embeddings[str(audio_path)] = self.register_speaker(audio_path)
+        return embeddings
+
     def _synthesize(self, text: str, reference_audio_path: Path) -> np.ndarray:
         """
         Generate speech using the TTS model with voice cloning.
@@ -37,54 +241,312 @@ class YourTTS:
         Returns:
             Generated audio as numpy array
         """
-        # Load reference audio using utils
-        reference_audio, _ = load_audio(reference_audio_path)
+        # Look up the stored d-vector so the speaker encoder is skipped
+        with stage('speaker_embedding'):
+            d_vector = self._get_speaker_embedding(reference_audio_path)
 
-        # Generate speech with voice cloning
-        wav = self.model.tts(
-            text=text,
-            speaker_wav=str(reference_audio_path),
-            language="en"
-        )
+        # Generate speech sentence by sentence with the d-vector
+        synthesizer = self.model.synthesizer
+        tts_model = synthesizer.tts_model
+        config = synthesizer.tts_config
+        language_id = tts_model.language_manager.name_to_id["en"]
+
+        with stage('sentence_split'):
+            sentences = synthesizer.split_into_sentences(text)
+
+        wavs = []
+        for sentence in sentences:
+            # Stop early if an async caller cancelled or timed out
+            check_cancelled()
+            if self.backend == "onnx":
+                token_ids = tts_model.tokenizer.text_to_ids(sentence, language="en")
+                waveform = self._run_onnx([token_ids], d_vector, language_id)[0]
+            else:
+                outputs = synthesis(
+                    model=tts_model,
+                    text=sentence,
+                    CONFIG=config,
+                    use_cuda=synthesizer.use_cuda,
+                    use_griffin_lim=synthesizer.vocoder_model is None,
+                    d_vector=d_vector,
+                    language_id=language_id
+                )
+                waveform = np.asarray(outputs["wav"], dtype=np.float32).squeeze()
+
+            # Trim silence like Coqui's Synthesizer.tts does
+            if "do_trim_silence" in config.audio and config.audio["do_trim_silence"]:
+                with stage('postprocess'):
+                    waveform = trim_silence(waveform, tts_model.ap)
+
+            wavs.append(waveform)
+            wavs.append(np.zeros(SENTENCE_PAUSE_SAMPLES, dtype=np.float32))
+
+        return np.concatenate(wavs)
+
+    def synthesize_batch(
+        self,
+        texts: List[str],
+        reference_audio_path: Path
+    ) -> List[np.ndarray]:
+        """
+        Generate speech for several texts in one padded forward pass.
+
+        All sentences of all texts are tokenized, padded into a single batch
+        and run through VITS together with the same speaker d-vector. The
+        waveforms are then split back out by their decoded lengths.
+
+        Args:
+            texts: Texts to synthesize
+            reference_audio_path: Path to reference audio for voice cloning
+
+        Returns:
+            One generated audio array per input text
+        """
+        d_vector = self._get_speaker_embedding(reference_audio_path)
+
+        synthesizer = self.model.synthesizer
+        tts_model = synthesizer.tts_model
+        config = synthesizer.tts_config
+        language_id = tts_model.language_manager.name_to_id["en"]
+
+        # Flatten sentences, remembering which text each one belongs to
+        owners = []
+        sentences = []
+        for index, text in enumerate(texts):
+            for sentence in synthesizer.split_into_sentences(text):
+                owners.append(index)
+                sentences.append(sentence)
+        with stage('text_frontend'):
+            token_ids = self.frontend.encode_many(sentences, language="en")
+        count('text_tokens', sum(len(ids) for ids in token_ids))
+
+        if not token_ids:
+            return [np.zeros(0, dtype=np.float32) for _ in texts]
+
+        if self.backend == "onnx":
+            waveforms = self._run_onnx(token_ids, d_vector, language_id)
+        else:
+            waveforms = self._run_torch_batch(token_ids, d_vector, language_id)
+
+        pieces = [[] for _ in texts]
+        for waveform, owner in zip(waveforms, owners):
+            if "do_trim_silence" in config.audio and config.audio["do_trim_silence"]:
+                waveform = trim_silence(waveform, tts_model.ap)
+            pieces[owner].append(waveform)
+            pieces[owner].append(np.zeros(SENTENCE_PAUSE_SAMPLES, dtype=np.float32))
+
+        return [
+            np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+            for parts in pieces
+        ]
+
+    def _run_torch_batch(
+        self,
+        token_ids: List[List[int]],
+        d_vector: np.ndarray,
+        language_id: int
+    ) -> List[np.ndarray]:
+        """
+        Run the PyTorch VITS model on a padded batch.
+
+        Args:
+            token_ids: Token id sequences, one per sentence
+            d_vector: Speaker embedding with shape [1, D]
+            language_id: Language id
+
+        Returns:
+            One waveform per sentence, cut to its decoded length
+        """
+        tts_model = self.model.synthesizer.tts_model
+        config = self.model.synthesizer.tts_config
+        batch_size = len(token_ids)
+        device = next(tts_model.parameters()).device
+        x_lengths = torch.tensor([len(ids) for ids in token_ids], dtype=torch.long)
+        x = torch.zeros(batch_size, int(x_lengths.max()), dtype=torch.long)
+        for row, ids in enumerate(token_ids):
+            x[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+
+        with torch.no_grad():
+            outputs = tts_model.inference(
+                x.to(device),
+                aux_input={
+                    'x_lengths': x_lengths.to(device),
+                    'd_vectors': torch.from_numpy(d_vector).to(device).repeat(batch_size, 1),
+                    'speaker_ids': None,
+                    'language_ids': torch.full(
+                        (batch_size,), language_id, dtype=torch.long, device=device)
+                }
+            )
+
+        # Valid samples per item = decoded frames * hop length
+        waveforms = outputs['model_outputs'].squeeze(1).cpu().numpy()
+        frame_lengths = outputs['y_mask'].sum(dim=(1, 2)).long().cpu().numpy()
+        sample_lengths = frame_lengths * config.audio.hop_length
+
+        return [
+            waveforms[row, :sample_lengths[row]].astype(np.float32)
+            for row in range(batch_size)
+        ]
+
+    def _run_onnx(
+        self,
+        token_ids: List[List[int]],
+        d_vector: np.ndarray,
+        language_id: int
+    ) -> List[np.ndarray]:
+        """
+        Run the exported VITS model on a padded batch.
+
+        Args:
+            token_ids: Token id sequences, one per sentence
+            d_vector: Speaker embedding with shape [1, D]
+            language_id: Language id
+
+        Returns:
+            One waveform per sentence, cut to its decoded length
+        """
+        tts_model = self.model.synthesizer.tts_model
+        hop_length = self.model.synthesizer.tts_config.audio.hop_length
+        with stage('onnx_inference'):
+            waveforms, frame_lengths = self.onnx_session.run(
+                token_ids, d_vector, language_id, default_scales(tts_model))
+        return [
+            waveforms[row, :frame_lengths[row] * hop_length].astype(np.float32)
+            for row in range(len(token_ids))
+        ]
+
+    def prepare_texts(self, texts: List[str]) -> None:
+        """
+        Phonemize every sentence of upcoming requests in one concurrent pass.
 
-        # Convert to numpy array if needed
-        if not isinstance(wav, np.ndarray):
-            wav = np.array(wav)
+        Args:
+            texts: Texts that will be synthesized (e.g. a batch manifest)
+        """
+        synthesizer = self.model.synthesizer
+        sentences = [
+            sentence for text in texts for sentence in synthesizer.split_into_sentences(text)]
+        misses_before = self.frontend.misses
+        start_time = time.perf_counter()
+        self.frontend.encode_many(sentences, language="en")
+        print(f"Text frontend: {len(sentences)} sentences ready in "
+              f"{time.perf_counter() - start_time:.2f}s "
+              f"({self.frontend.misses - misses_before} phonemized)")
 
-        return wav
+    def synthesis_key(self, text: str, reference_audio_path: Path) -> str:
+        """
+        Synthesis cache key of a request.
+
+        Args:
+            text: Text to synthesize
+            reference_audio_path: Path to reference audio for voice cloning
+
+        Returns:
+            Cache key covering everything that affects the output
+        """
+        tts_model = self.model.synthesizer.tts_model
+        params = {
+            'backend': self.backend,
+            'quantized': self.quantized,
+            'language': 'en',
+            'sample_rate': self.sample_rate,
+            'sentence_pause_samples': SENTENCE_PAUSE_SAMPLES,
+            'noise_scale': tts_model.inference_noise_scale,
+            'length_scale': tts_model.length_scale,
+            'noise_scale_dp': tts_model.inference_noise_scale_dp
+        }
+        return self.synthesis_cache.make_key(
+            self.model_version, text, reference_audio_path, params)
+
+    def default_output_path(self) -> Path:
+        """Return a timestamped output path in GENERATED_YOURTTS_DIR (unique across concurrent requests)."""
+        import datetime
+        import uuid
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return GENERATED_YOURTTS_DIR / f"yourtts_{timestamp}_{uuid.uuid4().hex[:8]}.wav"
 
     def generate(
         self,
         text: str,
         reference_audio_path: Path,
-        output_path: Optional[Path] = None
-    ) -> Path:
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        verbose: bool = True
+    ) -> GenerationResult:
         """
         Generate audio with voice cloning (MAIN FUNCTION).
 
+        The waveform is returned in memory; writing it to disk is a separate
+        step that can be skipped with save=False (and done later with
+        GenerationResult.save). Repeated requests are served from the
+        synthesis cache.
+
         Args:
             text: Text to convert to speech
             reference_audio_path: Path to reference audio for voice cloning
             output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            verbose: Whether to print progress
 
         Returns:
-            Path to generated audio file
+            GenerationResult with waveform, sample rate, duration and timings
         """
-        # Generate default output path if not provided
-        if output_path is None:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = GENERATED_YOURTTS_DIR / f"yourtts_{timestamp}.wav"
+        key = self.synthesis_key(text, reference_audio_path) if use_cache else None
+        result = self.synthesis_cache.get(key) if key is not None else None
 
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if result is not None:
+            if verbose:
+                print(f"Synthesis cache hit ({result.timings['synthesis'] * 1000:.1f} ms)")
+        else:
+            # Synthesize speech
+            if verbose:
+                print(f"Generating speech with YourTTS...")
+            start_time = time.perf_counter()
+            audio = self._synthesize(text, reference_audio_path)
+            result = GenerationResult(
+                audio, self.sample_rate, {'synthesis': time.perf_counter() - start_time})
+            if key is not None:
+                self.synthesis_cache.put(key, result)
 
-        # Synthesize speech
-        print(f"Generating speech with YourTTS...")
-        audio = self._synthesize(text, reference_audio_path)
+        # Optionally persist the audio
+        if save:
+            result.save(output_path or self.default_output_path())
+            if verbose:
+                print(f"Audio saved to: {result.output_path}")
 
-        # Save audio using utils
-        save_audio(audio, output_path, self.sample_rate)
-        print(f"Audio saved to: {output_path}")
+        return result
 
-        return output_path
+    async def agenerate(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        save: bool = True,
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> GenerationResult:
+        """
+        Asyncio counterpart of generate().
+
+        Inference runs on the model's AsyncRunner (at most
+        ASYNC_MAX_CONCURRENCY requests at a time) and the file is written on
+        the I/O pool, so the event loop never blocks. Nothing is printed.
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio for voice cloning
+            output_path: Optional output path (auto-generated if None)
+            save: Whether to write the audio to disk
+            use_cache: Whether to read and update the synthesis cache
+            timeout: Seconds allowed, queueing included (unbounded if None)
+
+        Returns:
+            GenerationResult with waveform, sample rate, duration and timings
+
+        Raises:
+            asyncio.TimeoutError: If `timeout` expired (synthesis stops at
+                the next sentence)
+        """
+        return await generate_async(
+            self, text, reference_audio_path, output_path, save, use_cache, timeout)
@@ -0,0 +1,271 @@
+"""
+Generate audio for every job in a JSONL/CSV manifest, loading each model once.
+
+Manifest rows have the fields: id, text, reference, model, output.
+`reference` and `output` are optional. `model` is "yourtts" or "xtts".
+
+Progress is checkpointed to a JSONL results file (one record per job in the
+run_all.py metrics format), so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Set
+
+from models import MODEL_REGISTRY, get_model_class, get_display_name
+from utils import (
+    ensure_directories,
+    REFERENCE_DIR
+)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate speech for every job in a JSONL/CSV manifest"
+    )
+
+    parser.add_argument(
+        'manifest',
+        type=str,
+        help='Path to the manifest (.jsonl or .csv)'
+    )
+    parser.add_argument(
+        '--results',
+        type=str,
+        default=None,
+        help='Checkpoint/results JSONL file (default: results/batch_<manifest>.jsonl)'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def calculate_rtf(generation_time, audio_duration):
+    """Calculate Real-Time Factor."""
+    if audio_duration == 0:
+        return float('inf')
+    return generation_time / audio_duration
+
+
+def read_manifest(manifest_path: Path) -> Iterator[Dict]:
+    """
+    Stream jobs from a JSONL or CSV manifest.
+
+    Args:
+        manifest_path: Path to manifest file
+
+    Yields:
+        Job dictionaries
+
+    Raises:
+        ValueError: If the manifest format is not supported
+    """
+    suffix = manifest_path.suffix.lower()
+
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        if suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == '.csv':
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"Unsupported manifest format: {manifest_path}")
+
+
+def load_completed_jobs(results_path: Path) -> Set[str]:
+    """
+    Read job ids that already finished successfully.
+
+    Args:
+        results_path: Checkpoint/results JSONL file
+
+    Returns:
+        Set of completed job ids
+    """
+    completed = set()
+    if not results_path.exists():
+        return completed
+
+    with open(results_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Partial line from an interrupted write
+                continue
+            if all(m.get('success', False) for m in record.get('models', [])):
+                completed.add(record['job_id'])
+
+    return completed
+
+
+def append_record(results_path: Path, record: Dict) -> None:
+    """Append one record to the results file and flush it to disk."""
+    with open(results_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_job(model, display_name: str, job: Dict, reference_path: Path) -> Dict:
+    """
+    Run one generation job.
+
+    Args:
+        model: Loaded model wrapper
+        display_name: Model name used in metrics
+        job: Manifest job
+        reference_path: Path to reference audio
+
+    Returns:
+        Per-model result dictionary in the run_all.py format
+    """
+    try:
+        output = job.get('output') or None
+
+        start_time = time.time()
+        result = model.generate(
+            text=job['text'],
+            reference_audio_path=reference_path,
+            output_path=Path(output) if output else None
+        )
+        generation_time = time.time() - start_time
+        audio_duration = result.duration
+
+        return {
+            'model': display_name,
+            'output_path': str(result.output_path),
+            'audio_duration': audio_duration,
+            'generation_time': generation_time,
+            'rtf': calculate_rtf(generation_time, audio_duration),
+            'success': True
+        }
+
+    except Exception as e:
+        return {
+            'model': display_name,
+            'success': False,
+            'error': str(e)
+        }
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    manifest_path = Path(args.manifest)
+    if args.results:
+        results_path = Path(args.results)
+    else:
+        results_path = Path(__file__).parent.parent / "results" / f"batch_{manifest_path.stem}.jsonl"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 60)
+    print("Batch Generation - Zero-Shot Voice Cloning")
+    print("=" * 60)
+
+    ensure_directories()
+
+    completed = load_completed_jobs(results_path)
+    print(f"\nManifest: {manifest_path}")
+    print(f"Results: {results_path}")
+    if completed:
+        print(f"Resuming: {len(completed)} jobs already completed")
+
+    loaded_models = {}
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+    batch_start = time.time()
+
+    jobs = list(read_manifest(manifest_path))
+    for job in jobs:
+        job_id = str(job['id'])
+        if job_id in completed:
+            counts['skipped'] += 1
+            continue
+
+        model_key = job.get('model', '').strip().lower()
+        if model_key not in MODEL_REGISTRY:
+            raise ValueError(f"Job {job_id}: unknown model '{job.get('model')}'")
+        display_name = get_display_name(model_key)
+
+        # Load (and import) each model once, on first use
+        if model_key not in loaded_models:
+            print(f"\nLoading {display_name}...")
+            loaded_models[model_key] = get_model_class(model_key)()
+
+            # Phonemize this model's pending texts in one pass (YourTTS)
+            if hasattr(loaded_models[model_key], 'prepare_texts'):
+                loaded_models[model_key].prepare_texts([
+                    pending['text'] for pending in jobs
+                    if str(pending['id']) not in completed
+                    and pending.get('model', '').strip().lower() == model_key
+                ])
+
+        print(f"\n[{job_id}] {display_name}: '{job['text'][:60]}'")
+        try:
+            reference_path = find_reference_audio(job.get('reference') or None)
+            result = run_job(loaded_models[model_key], display_name, job, reference_path)
+        except FileNotFoundError as e:
+            reference_path = job.get('reference') or ''
+            result = {'model': display_name, 'success': False, 'error': str(e)}
+
+        append_record(results_path, {
+            'job_id': job_id,
+            'timestamp': datetime.datetime.now().isoformat(),
+            'text': job['text'],
+            'reference_audio': str(reference_path),
+            'models': [result]
+        })
+
+        if result['success']:
+            counts['done'] += 1
+            print(f"✓ {job_id} completed in {result['generation_time']:.2f}s "
+                  f"(RTF: {result['rtf']:.2f}x)")
+        else:
+            counts['failed'] += 1
+            print(f"✗ {job_id} failed: {result['error']}")
+
+    print("\n" + "=" * 60)
+    print(f"Completed: {counts['done']}, skipped: {counts['skipped']}, "
+          f"failed: {counts['failed']}")
+    print(f"Total time: {time.time() - batch_start:.2f} seconds")
+    for model_key, model in loaded_models.items():
+        stats = model.synthesis_cache.stats()
+        print(f"{get_display_name(model_key)} synthesis cache: {stats['hits']} hits, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+              f"{stats['time_saved']:.2f}s saved")
+        if hasattr(model, 'frontend'):
+            stats = model.frontend.stats()
+            print(f"{get_display_name(model_key)} text frontend: {stats['frontend_time']:.2f}s "
+                  f"({stats['hits']} cached, {stats['misses']} phonemized)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
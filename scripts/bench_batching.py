@@ -0,0 +1,154 @@
+"""
+Measure YourTTS throughput and queueing latency across micro-batch sizes.
+"""
+
+import argparse
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from models import BatchedYourTTS, load_model
+from utils import REFERENCE_DIR, get_audio_duration
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark YourTTS dynamic micro-batching"
+    )
+
+    default_text = os.environ.get('TEXT', 'Hello, this is a test of voice cloning.')
+
+    parser.add_argument(
+        '--text',
+        type=str,
+        default=default_text,
+        help='Text sent by every simulated request'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8],
+        help='Maximum micro-batch sizes to compare'
+    )
+    parser.add_argument(
+        '--wait-ms',
+        type=float,
+        default=20.0,
+        help='Batching window in milliseconds'
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=16,
+        help='Concurrent requests per configuration'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def run_configuration(model, batch_size, wait_ms, num_requests, text, reference_path):
+    """
+    Fire concurrent requests through a micro-batcher and collect metrics.
+
+    Returns:
+        Dictionary with throughput, latency percentiles and batching stats
+    """
+    batched = BatchedYourTTS(model, max_batch_size=batch_size, max_wait_ms=wait_ms)
+
+    def request():
+        start_time = time.perf_counter()
+        audio = batched._synthesize(text, reference_path)
+        return time.perf_counter() - start_time, get_audio_duration(audio, model.sample_rate)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_requests) as executor:
+        results = list(executor.map(lambda _: request(), range(num_requests)))
+    wall_time = time.perf_counter() - wall_start
+
+    stats = batched.batcher.stats()
+    batched.close()
+
+    latencies = np.array([latency for latency, _ in results])
+    audio_seconds = sum(duration for _, duration in results)
+
+    return {
+        'batch_size': batch_size,
+        'requests_per_sec': num_requests / wall_time,
+        'audio_sec_per_sec': audio_seconds / wall_time,
+        'latency_p50': float(np.percentile(latencies, 50)),
+        'latency_p95': float(np.percentile(latencies, 95)),
+        'mean_batch_size': stats['mean_batch_size'],
+        'queue_wait_p50': stats['queue_wait_p50'],
+        'queue_wait_p95': stats['queue_wait_p95']
+    }
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("YourTTS - Micro-Batching Benchmark")
+    print("=" * 60)
+
+    reference_audio_path = find_reference_audio(args.reference)
+    print(f"\nReference audio: {reference_audio_path}")
+    print(f"Requests per configuration: {args.requests}, window: {args.wait_ms:.0f} ms")
+
+    print("\nInitializing YourTTS model...")
+    model = load_model('yourtts')
+
+    # Warm up embedding store and kernels outside the measured runs
+    model.synthesize_batch([args.text], reference_audio_path)
+
+    rows = []
+    for batch_size in args.batch_sizes:
+        print(f"\nRunning batch size {batch_size}...")
+        rows.append(run_configuration(
+            model, batch_size, args.wait_ms, args.requests, args.text, reference_audio_path))
+
+    print("\n" + "=" * 60)
+    print(f"{'Batch':<7} {'Req/s':<8} {'Audio s/s':<10} {'Lat p50':<9} "
+          f"{'Lat p95':<9} {'Mean B':<8} {'Queue p95':<10}")
+    print("-" * 60)
+    for row in rows:
+        print(f"{row['batch_size']:<7} {row['requests_per_sec']:<8.2f} "
+              f"{row['audio_sec_per_sec']:<10.2f} {row['latency_p50']:<9.2f} "
+              f"{row['latency_p95']:<9.2f} {row['mean_batch_size']:<8.2f} "
+              f"{row['queue_wait_p95'] * 1000:<8.0f}ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Export the YourTTS VITS model to ONNX and check it against PyTorch.
+
+The exported graph takes the speaker d-vector as an input. The check runs
+the same sentences through PyTorch and ONNX Runtime with the noise scales
+set to zero and compares the waveforms.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from models import load_model
+from models.onnx_backend import (
+    OnnxVitsSession,
+    compare_with_torch,
+    export_vits_onnx,
+    onnx_model_path
+)
+from utils import REFERENCE_DIR, ONNX_CHECK_MAX_ABS_DIFF
+
+
+DEFAULT_TEXTS = [
+    "Hello, this is a test of voice cloning.",
+    "The model has never seen this speaker during training.",
+]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Export YourTTS to ONNX and verify it against PyTorch"
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Output .onnx path (default: versioned file under cache/onnx)'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--text',
+        type=str,
+        action='append',
+        default=None,
+        help='Sentence used for the numeric check (repeatable)'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=ONNX_CHECK_MAX_ABS_DIFF,
+        help='Maximum absolute sample difference allowed'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    texts = args.text or DEFAULT_TEXTS
+
+    print("=" * 60)
+    print("YourTTS ONNX Export")
+    print("=" * 60)
+
+    reference_audio_path = find_reference_audio(args.reference)
+    print(f"Reference audio: {reference_audio_path}")
+
+    model = load_model('yourtts')
+    tts_model = model.model.synthesizer.tts_model
+    output_path = Path(args.output) if args.output else onnx_model_path(model.model_version)
+
+    print(f"\nExporting to {output_path}...")
+    start_time = time.perf_counter()
+    export_vits_onnx(tts_model, output_path, tts_model.embedded_speaker_dim)
+    print(f"✓ Exported in {time.perf_counter() - start_time:.2f}s "
+          f"({output_path.stat().st_size / 1e6:.1f} MB)")
+
+    session = OnnxVitsSession(output_path)
+
+    print("\nChecking ONNX Runtime output against PyTorch (noise scales = 0)...")
+    d_vector = model.register_speaker(reference_audio_path)
+    language_id = tts_model.language_manager.name_to_id["en"]
+    hop_length = model.model.synthesizer.tts_config.audio.hop_length
+
+    passed = True
+    for text in texts:
+        token_ids = tts_model.tokenizer.text_to_ids(text, language="en")
+        check = compare_with_torch(tts_model, session, token_ids, d_vector, language_id, hop_length)
+        ok = (check['torch_samples'] == check['onnx_samples']
+              and check['max_abs_diff'] <= args.tolerance)
+        passed = passed and ok
+        print(f"{'✓' if ok else '✗'} {text[:40]!r}: samples {check['torch_samples']}/"
+              f"{check['onnx_samples']}, max |diff| {check['max_abs_diff']:.2e}, "
+              f"SNR {check['snr_db']:.1f} dB")
+
+    print("-" * 60)
+    print("Numeric check PASSED" if passed else
+          f"Numeric check FAILED (tolerance {args.tolerance:.0e})")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Generate audio with sentence-sharded parallel synthesis and compare it
+against the single-call path on the same text.
+"""
+
+import argparse
+import gc
+import time
+import os
+from pathlib import Path
+
+from models import ShardedSynthesizer, available_models, get_model_class
+from utils import (
+    ensure_directories,
+    REFERENCE_DIR,
+    GENERATED_YOURTTS_DIR,
+    GENERATED_XTTS_DIR,
+    get_audio_duration,
+    save_audio,
+    split_sentences
+)
+
+
+OUTPUT_DIRS = {
+    'yourtts': GENERATED_YOURTTS_DIR,
+    'xtts': GENERATED_XTTS_DIR,
+}
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate speech with sentence-sharded parallel synthesis"
+    )
+
+    # Get text from environment variable or argument
+    default_text = os.environ.get('TEXT', 'Hello, this is a test of voice cloning.')
+
+    parser.add_argument(
+        '--model',
+        type=str,
+        choices=available_models(),
+        default='xtts',
+        help='Model to run'
+    )
+    parser.add_argument(
+        '--text',
+        type=str,
+        default=default_text,
+        help='Text to convert to speech'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Output path for generated audio (optional, auto-generated if not provided)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='Number of worker processes (degree of parallelism)'
+    )
+    parser.add_argument(
+        '--threads-per-worker',
+        type=int,
+        default=None,
+        help='Torch threads per worker (CPU count split across workers if not provided)'
+    )
+    parser.add_argument(
+        '--no-compare',
+        action='store_true',
+        help='Skip the single-call baseline run'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def calculate_rtf(generation_time, audio_duration):
+    """Calculate Real-Time Factor."""
+    if audio_duration == 0:
+        return float('inf')
+    return generation_time / audio_duration
+
+
+def run_single_call(model_cls, text, reference_audio_path):
+    """
+    Time the single-call path on the same text in this process.
+
+    Returns:
+        Tuple of (generation_time, audio_duration)
+    """
+    model = model_cls()
+    start_time = time.time()
+    audio = model._synthesize(text, reference_audio_path)
+    generation_time = time.time() - start_time
+    audio_duration = get_audio_duration(audio, model.sample_rate)
+
+    # Free the baseline model before the pool loads its copies
+    del model
+    gc.collect()
+
+    return generation_time, audio_duration
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    model_cls = get_model_class(args.model)
+    output_dir = OUTPUT_DIRS[args.model]
+
+    print("=" * 60)
+    print(f"{model_cls.__name__} - Sentence-Sharded Parallel Synthesis")
+    print("=" * 60)
+
+    ensure_directories()
+
+    print(f"\nText to generate: '{args.text}'")
+    print(f"Sentences: {len(split_sentences(args.text))}")
+    reference_audio_path = find_reference_audio(args.reference)
+    print(f"Reference audio: {reference_audio_path}")
+
+    baseline = None
+    if not args.no_compare:
+        print("\nRunning single-call baseline...")
+        baseline = run_single_call(model_cls, args.text, reference_audio_path)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = output_dir / f"{args.model}_sharded_{timestamp}.wav"
+
+    print(f"\nStarting {args.workers} workers...")
+    with ShardedSynthesizer(
+        model_cls,
+        num_workers=args.workers,
+        threads_per_worker=args.threads_per_worker
+    ) as synthesizer:
+        synthesizer.wait_until_ready()
+
+        print("\nGenerating speech...")
+        start_time = time.time()
+        audio, sample_rate = synthesizer.synthesize(args.text, reference_audio_path)
+        generation_time = time.time() - start_time
+
+    save_audio(audio, output_path, sample_rate)
+
+    audio_duration = get_audio_duration(audio, sample_rate)
+    rtf = calculate_rtf(generation_time, audio_duration)
+
+    print("\n" + "=" * 60)
+    print("Generation completed successfully!")
+    print("=" * 60)
+    print(f"Output: {output_path}")
+    print(f"Workers: {synthesizer.num_workers} x {synthesizer.threads_per_worker} threads")
+    print(f"Audio duration: {audio_duration:.2f} seconds")
+    print(f"Generation time: {generation_time:.2f} seconds")
+    print(f"Real-Time Factor (RTF): {rtf:.2f}x")
+
+    if baseline is not None:
+        baseline_time, baseline_duration = baseline
+        baseline_rtf = calculate_rtf(baseline_time, baseline_duration)
+        print(f"Single-call time: {baseline_time:.2f} seconds (RTF: {baseline_rtf:.2f}x)")
+        print(f"Speedup: {baseline_time / generation_time:.2f}x")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,15 @@ import time
 import os
 from pathlib import Path
 
-from models import XTTS
+from models import get_model_class
+from server import synthesize
 from utils import (
+    ImportProfiler,
     ensure_directories,
     REFERENCE_DIR,
-    get_audio_duration,
-    load_audio
+    AUDIO_FORMAT,
+    OUTPUT_FORMATS,
+    OPUS_BITRATE_KBPS
 )
 
 
@@ -43,6 +46,53 @@ def parse_args():
         default=None,
         help='Output path for generated audio (optional, auto-generated if not provided)'
     )
+    parser.add_argument(
+        '--server',
+        type=str,
+        default=None,
+        help='URL of a running inference server (e.g. http://127.0.0.1:8765); '
+             'skips loading the model locally'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Use streaming synthesis and report time-to-first-chunk and per-chunk latency'
+    )
+
+    parser.add_argument(
+        '--format',
+        type=str,
+        choices=OUTPUT_FORMATS,
+        default=AUDIO_FORMAT,
+        help='Output encoding (used for auto-generated output paths)'
+    )
+    parser.add_argument(
+        '--sample-rate',
+        type=int,
+        default=None,
+        help="Resample output to this rate (default: the model's native rate)"
+    )
+    parser.add_argument(
+        '--bitrate',
+        type=float,
+        default=OPUS_BITRATE_KBPS,
+        help='Opus bitrate in kbps'
+    )
+    parser.add_argument(
+        '--quantize',
+        action='store_true',
+        help='Use int8 dynamic quantization for CPU inference'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Synthesize even if the same request is in the synthesis cache'
+    )
+    parser.add_argument(
+        '--import-profile',
+        action='store_true',
+        help='Print an import-time breakdown of the run'
+    )
 
     return parser.parse_args()
 
@@ -77,6 +127,12 @@ def calculate_rtf(generation_time, audio_duration):
 def main():
     """Main execution function."""
     args = parse_args()
+    if args.server and args.stream:
+        raise SystemExit("--stream is not supported together with --server")
+    if args.stream and (args.format != 'wav' or args.sample_rate):
+        raise SystemExit("--stream writes WAV at the native rate; "
+                         "--format and --sample-rate are not supported")
+    profiler = ImportProfiler().start() if args.import_profile else None
 
     print("=" * 60)
     print("XTTS v2 - Zero-Shot Voice Cloning")
@@ -88,22 +144,68 @@ def main():
     reference_audio_path = find_reference_audio(args.reference)
     print(f"Reference audio: {reference_audio_path}")
 
-    print("\nInitializing XTTS v2 model...")
-    model = XTTS()
+    if args.server:
+        print(f"\nUsing inference server: {args.server}")
+        model = None
+    else:
+        print("\nInitializing XTTS v2 model...")
+        model = get_model_class('xtts')(quantize=args.quantize)
 
     print("\nGenerating speech...")
+    chunk_times = []
     start_time = time.time()
 
-    output_path = model.generate(
-        text=args.text,
-        reference_audio_path=reference_audio_path,
-        output_path=Path(args.output) if args.output else None
-    )
+    if args.server:
+        response = synthesize(
+            args.server,
+            'xtts',
+            args.text,
+            reference_audio_path.resolve(),
+            Path(args.output).resolve() if args.output else None,
+            audio_format=args.format,
+            sample_rate=args.sample_rate,
+            bitrate_kbps=args.bitrate
+        )
+        output_path = response['output_path']
+        generation_time = response['generation_time']
+        audio_duration = response['audio_duration']
+        encode_time = response['encode_time']
+        output_size = response['output_size']
+    elif args.stream:
+        output_path = Path(args.output) if args.output else model.default_output_path()
+        num_samples = 0
+        for chunk in model.stream(
+            text=args.text,
+            reference_audio_path=reference_audio_path,
+            output_path=output_path
+        ):
+            chunk_times.append(time.time())
+            num_samples += len(chunk)
 
-    generation_time = time.time() - start_time
+        generation_time = time.time() - start_time
+        audio_duration = num_samples / model.sample_rate
+        encode_time = None
+    else:
+        result = model.generate(
+            text=args.text,
+            reference_audio_path=reference_audio_path,
+            save=False,
+            use_cache=not args.no_cache
+        )
+
+        generation_time = time.time() - start_time
+        audio_duration = result.duration
+
+        # Encode at the native rate unless a target rate was requested
+        if args.output:
+            output_path = Path(args.output)
+        else:
+            output_path = model.default_output_path().with_suffix(f".{args.format}")
+        result.save(output_path, target_sample_rate=args.sample_rate, bitrate_kbps=args.bitrate)
+        print(f"Audio saved to: {output_path}")
+        encode_time = result.timings['file_write']
+        output_size = result.output_size
 
-    generated_audio, sr = load_audio(output_path)
-    audio_duration = get_audio_duration(generated_audio, sr)
     rtf = calculate_rtf(generation_time, audio_duration)
 
     print("\n" + "=" * 60)
@@ -121,8 +223,34 @@ def main():
     else:
         print("  → Exactly real-time")
 
+    if encode_time is not None:
+        print(f"Encode time: {encode_time:.3f} seconds")
+        print(f"Output size: {output_size / 1024:.1f} KiB")
+
+    if chunk_times:
+        chunk_latencies = [
+            later - earlier
+            for earlier, later in zip([start_time] + chunk_times, chunk_times)
+        ]
+        print(f"Time to first chunk: {chunk_latencies[0]:.2f} seconds")
+        print(f"Chunks: {len(chunk_latencies)} "
+              f"(latency mean {sum(chunk_latencies) / len(chunk_latencies):.2f}s, "
+              f"max {max(chunk_latencies):.2f}s)")
+
+    if model is not None:
+        cache_stats = model.latent_cache_stats
+        print(f"Latent cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['time_saved']:.2f}s saved")
+        synthesis_stats = model.synthesis_cache.stats()
+        print(f"Synthesis cache: {synthesis_stats['hits']} hits, {synthesis_stats['misses']} misses "
+              f"({synthesis_stats['hit_rate']:.0%} hit rate), "
+              f"{synthesis_stats['time_saved']:.2f}s saved")
+
     print("=" * 60)
 
+    if profiler is not None:
+        profiler.report()
+
 
 if __name__ == "__main__":
     main()
@@ -7,12 +7,15 @@ import time
 import os
 from pathlib import Path
 
-from models import YourTTS
+from models import get_model_class
+from server import synthesize
 from utils import (
+    ImportProfiler,
     ensure_directories,
     REFERENCE_DIR,
-    get_audio_duration,
-    load_audio
+    AUDIO_FORMAT,
+    OUTPUT_FORMATS,
+    OPUS_BITRATE_KBPS
 )
 
 
@@ -43,6 +46,55 @@ def parse_args():
         default=None,
         help='Output path for generated audio (optional, auto-generated if not provided)'
     )
+    parser.add_argument(
+        '--server',
+        type=str,
+        default=None,
+        help='URL of a running inference server (e.g. http://127.0.0.1:8765); '
+             'skips loading the model locally'
+    )
+
+    parser.add_argument(
+        '--format',
+        type=str,
+        choices=OUTPUT_FORMATS,
+        default=AUDIO_FORMAT,
+        help='Output encoding (used for auto-generated output paths)'
+    )
+    parser.add_argument(
+        '--sample-rate',
+        type=int,
+        default=None,
+        help="Resample output to this rate (default: the model's native rate)"
+    )
+    parser.add_argument(
+        '--bitrate',
+        type=float,
+        default=OPUS_BITRATE_KBPS,
+        help='Opus bitrate in kbps'
+    )
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=['torch', 'onnx'],
+        default='torch',
+        help='Inference backend (onnx exports the model on first use)'
+    )
+    parser.add_argument(
+        '--quantize',
+        action='store_true',
+        help='Use int8 dynamic quantization for CPU inference'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Synthesize even if the same request is in the synthesis cache'
+    )
+    parser.add_argument(
+        '--import-profile',
+        action='store_true',
+        help='Print an import-time breakdown of the run'
+    )
 
     return parser.parse_args()
 
@@ -77,6 +129,7 @@ def calculate_rtf(generation_time, audio_duration):
 def main():
     """Main execution function."""
     args = parse_args()
+    profiler = ImportProfiler().start() if args.import_profile else None
 
     print("=" * 60)
     print("YourTTS - Zero-Shot Voice Cloning")
@@ -88,22 +141,51 @@ def main():
     reference_audio_path = find_reference_audio(args.reference)
     print(f"Reference audio: {reference_audio_path}")
 
-    print("\nInitializing YourTTS model...")
-    model = YourTTS()
+    if args.server:
+        print(f"\nUsing inference server: {args.server}")
+        print("\nGenerating speech...")
+        response = synthesize(
+            args.server,
+            'yourtts',
+            args.text,
+            reference_audio_path.resolve(),
+            Path(args.output).resolve() if args.output else None,
+            audio_format=args.format,
+            sample_rate=args.sample_rate,
+            bitrate_kbps=args.bitrate
+        )
+        output_path = response['output_path']
+        generation_time = response['generation_time']
+        audio_duration = response['audio_duration']
+        encode_time = response['encode_time']
+        output_size = response['output_size']
+    else:
+        print("\nInitializing YourTTS model...")
+        model = get_model_class('yourtts')(quantize=args.quantize, backend=args.backend)
 
-    print("\nGenerating speech...")
-    start_time = time.time()
+        print("\nGenerating speech...")
+        start_time = time.time()
 
-    output_path = model.generate(
-        text=args.text,
-        reference_audio_path=reference_audio_path,
-        output_path=Path(args.output) if args.output else None
-    )
+        result = model.generate(
+            text=args.text,
+            reference_audio_path=reference_audio_path,
+            save=False,
+            use_cache=not args.no_cache
+        )
+
+        generation_time = time.time() - start_time
+        audio_duration = result.duration
 
-    generation_time = time.time() - start_time
+        # Encode at the native rate unless a target rate was requested
+        if args.output:
+            output_path = Path(args.output)
+        else:
+            output_path = model.default_output_path().with_suffix(f".{args.format}")
+        result.save(output_path, target_sample_rate=args.sample_rate, bitrate_kbps=args.bitrate)
+        print(f"Audio saved to: {output_path}")
+        encode_time = result.timings['file_write']
+        output_size = result.output_size
 
-    generated_audio, sr = load_audio(output_path)
-    audio_duration = get_audio_duration(generated_audio, sr)
     rtf = calculate_rtf(generation_time, audio_duration)
 
     print("\n" + "=" * 60)
@@ -121,8 +203,20 @@ def main():
     else:
         print("  → Exactly real-time")
 
+    if encode_time is not None:
+        print(f"Encode time: {encode_time:.3f} seconds")
+        print(f"Output size: {output_size / 1024:.1f} KiB")
+
+    if not args.server:
+        frontend_stats = model.frontend.stats()
+        print(f"Text frontend: {frontend_stats['frontend_time'] * 1000:.1f} ms "
+              f"({frontend_stats['hits']} cached, {frontend_stats['misses']} phonemized)")
+
     print("=" * 60)
 
+    if profiler is not None:
+        profiler.report()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+"""
+Import legacy results/metrics_*.json files into the results store.
+
+Each file becomes one run; files imported before are skipped, so the script
+can be re-run safely. The JSON files are left in place.
+"""
+
+import argparse
+from pathlib import Path
+
+from utils import RESULTS_DIR, RESULTS_DB_FILE, ResultsStore
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Import metrics_*.json result files into the results store"
+    )
+
+    parser.add_argument(
+        '--results-dir',
+        type=str,
+        default=str(RESULTS_DIR),
+        help='Directory containing metrics_*.json files'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=str(RESULTS_DB_FILE),
+        help='Results store database'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    json_files = sorted(Path(args.results_dir).glob('metrics_*.json'))
+    print(f"Found {len(json_files)} result files")
+
+    imported = skipped = 0
+    with ResultsStore(Path(args.db)) as store:
+        for json_file in json_files:
+            try:
+                run_id = store.import_json(json_file)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"✗ {json_file.name}: {e}")
+                continue
+            if run_id is None:
+                skipped += 1
+            else:
+                imported += 1
+                print(f"✓ {json_file.name} -> run {run_id}")
+
+        print(f"\nImported {imported} runs ({skipped} already imported) into {store.path}")
+
+
+if __name__ == "__main__":
+    main()
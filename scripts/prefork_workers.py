@@ -0,0 +1,169 @@
+"""
+Serve requests from a pre-fork worker pool and report how much memory the
+workers share.
+
+The model is loaded once and the workers are forked from it, so the weights
+are mapped copy-on-write by every worker. After the requests the per-process
+unique and shared RSS is printed, together with how many workers would fit
+in the host's available memory.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from models import PreforkPool, available_models
+from utils import ensure_directories, available_memory, REFERENCE_DIR
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run a pre-fork worker pool and report shared vs unique memory"
+    )
+
+    # Get text from environment variable or argument
+    default_text = os.environ.get('TEXT', 'Hello, this is a test of voice cloning.')
+
+    parser.add_argument(
+        '--model',
+        type=str,
+        choices=available_models(),
+        default='yourtts',
+        help='Model to load'
+    )
+    parser.add_argument(
+        '--text',
+        type=str,
+        default=default_text,
+        help='Text to convert to speech'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='Number of worker processes'
+    )
+    parser.add_argument(
+        '--threads-per-worker',
+        type=int,
+        default=None,
+        help='Torch threads per worker (CPU count split across workers if not provided)'
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=None,
+        help='Requests to run before measuring (default: two per worker, so every '
+             'worker has allocated its inference buffers)'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def format_mb(num_bytes: int) -> str:
+    """Format a byte count in MiB."""
+    return f"{num_bytes / (1024 * 1024):.0f} MB"
+
+
+def print_memory_report(report) -> None:
+    """Print per-process memory and the workers that fit on this host."""
+    print(f"\n{'Process':<16} {'RSS':>10} {'Shared':>10} {'Unique':>10} {'PSS':>10}")
+    print("-" * 60)
+    for entry in report:
+        label = f"{entry['role']} {entry['pid']}"
+        print(f"{label:<16} {format_mb(entry['rss']):>10} {format_mb(entry['shared']):>10} "
+              f"{format_mb(entry['unique']):>10} {format_mb(entry['pss']):>10}")
+
+    workers = [entry for entry in report if entry['role'] == 'worker']
+    if not workers:
+        return
+
+    total_pss = sum(entry['pss'] for entry in report)
+    total_rss = sum(entry['rss'] for entry in report)
+    worker_unique = sum(entry['unique'] for entry in workers) / len(workers)
+    worker_rss = sum(entry['rss'] for entry in workers) / len(workers)
+    print("-" * 60)
+    print(f"Physical footprint (sum of PSS): {format_mb(total_pss)} "
+          f"(sum of RSS: {format_mb(total_rss)})")
+    print(f"Cost per additional worker: {format_mb(worker_unique)} unique "
+          f"(a separately loaded worker: ~{format_mb(worker_rss)})")
+
+    try:
+        free = available_memory()
+    except OSError:
+        return
+    print(f"Available memory: {format_mb(free)} -> room for about "
+          f"{int(free // max(worker_unique, 1))} more pre-forked workers "
+          f"(vs {int(free // max(worker_rss, 1))} separately loaded)")
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    num_requests = args.requests or 2 * args.workers
+
+    print("=" * 60)
+    print("Pre-Fork Worker Pool - Shared Model Weights")
+    print("=" * 60)
+
+    ensure_directories()
+
+    print(f"\nText to generate: '{args.text}'")
+    reference_audio_path = find_reference_audio(args.reference)
+    print(f"Reference audio: {reference_audio_path}")
+
+    print(f"\nLoading {args.model} and forking {args.workers} workers...")
+    with PreforkPool(
+        args.model,
+        num_workers=args.workers,
+        threads_per_worker=args.threads_per_worker
+    ) as pool:
+        pool.wait_until_ready()
+        print(f"✓ Model loaded in {pool.load_time:.2f}s, "
+              f"{pool.num_workers} workers x {pool.threads_per_worker} threads")
+        print_memory_report(pool.memory_report())
+
+        print(f"\nRunning {num_requests} requests...")
+        start_time = time.time()
+        results = pool.generate_many(
+            [(args.text, reference_audio_path, None)] * num_requests, use_cache=False)
+        wall_clock = time.time() - start_time
+
+        audio_seconds = sum(result.duration for result in results)
+        print(f"✓ {num_requests} requests in {wall_clock:.2f}s "
+              f"({audio_seconds / wall_clock:.2f}s of audio per second)")
+
+        print("\nAfter inference:")
+        print_memory_report(pool.memory_report())
+
+
+if __name__ == "__main__":
+    main()
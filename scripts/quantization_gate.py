@@ -0,0 +1,272 @@
+"""
+Quality gate for int8 dynamic quantization.
+
+Generates the same texts with the fp32 and the int8 model, then compares
+the int8 outputs against the fp32 outputs with the evaluation metrics: PESQ
+and STOI of int8 vs fp32, and the drop in speaker similarity to the
+reference. Exits with status 1 if any threshold is violated.
+
+PESQ and STOI compare the two outputs sample by sample, so both variants
+use deterministic decoding. YourTTS runs with the VITS noise scales at zero.
+XTTS decodes its GPT tokens greedily (top_k=1). Otherwise the random
+streams diverge as soon as quantization shifts a logit or a duration, and
+the gate would score two different utterances.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from evaluation import (
+    calculate_speaker_similarity,
+    calculate_pesq_score,
+    calculate_stoi_score
+)
+from models import available_models, get_display_name, load_model
+from utils import (
+    ensure_directories,
+    REFERENCE_DIR,
+    RESULTS_DIR,
+    GENERATED_YOURTTS_DIR,
+    GENERATED_XTTS_DIR,
+    QUANTIZATION_MAX_SIMILARITY_DROP,
+    QUANTIZATION_MIN_PESQ,
+    QUANTIZATION_MIN_STOI
+)
+
+
+OUTPUT_DIRS = {
+    'yourtts': GENERATED_YOURTTS_DIR,
+    'xtts': GENERATED_XTTS_DIR
+}
+
+DEFAULT_TEXTS = [
+    "Hello, this is a test of voice cloning.",
+    "Zero-shot voice cloning reproduces a speaker's voice from a few seconds "
+    "of reference audio. The model has never seen this speaker during training.",
+]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare int8 quantized output against fp32 output"
+    )
+
+    parser.add_argument(
+        '--model',
+        type=str,
+        choices=available_models(),
+        required=True,
+        help='Model to check'
+    )
+    parser.add_argument(
+        '--text',
+        type=str,
+        action='append',
+        default=None,
+        help='Text to synthesize (repeatable; defaults to two sample texts)'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed used before every generation'
+    )
+    parser.add_argument(
+        '--max-similarity-drop',
+        type=float,
+        default=QUANTIZATION_MAX_SIMILARITY_DROP,
+        help='Largest allowed drop in speaker similarity to the reference'
+    )
+    parser.add_argument(
+        '--min-pesq',
+        type=float,
+        default=QUANTIZATION_MIN_PESQ,
+        help='Minimum PESQ of int8 output against fp32 output'
+    )
+    parser.add_argument(
+        '--min-stoi',
+        type=float,
+        default=QUANTIZATION_MIN_STOI,
+        help='Minimum STOI of int8 output against fp32 output'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def use_deterministic_decoding(model_name, model):
+    """Turn off the model's sampling so fp32 and int8 decode the same way."""
+    synthesizer = model.model.synthesizer
+    if model_name == 'yourtts':
+        # Same as onnx_backend.check_onnx_model
+        synthesizer.tts_model.inference_noise_scale = 0.0
+        synthesizer.tts_model.inference_noise_scale_dp = 0.0
+    else:
+        # Greedy GPT decoding: only the most likely token survives top-k
+        synthesizer.tts_config.top_k = 1
+
+
+def generate_all(model_name, quantize, texts, reference_audio_path, output_dir, seed):
+    """
+    Load a model variant and synthesize every text.
+
+    Returns:
+        Tuple of (output paths, total generation time, total audio duration)
+    """
+    import torch
+
+    variant = "int8" if quantize else "fp32"
+    print(f"\nLoading {get_display_name(model_name)} ({variant})...")
+    model = load_model(model_name, quantize=quantize)
+    use_deterministic_decoding(model_name, model)
+
+    paths = []
+    generation_time = 0.0
+    audio_duration = 0.0
+    for index, text in enumerate(texts):
+        torch.manual_seed(seed)
+        start_time = time.time()
+        result = model.generate(text, reference_audio_path, save=False, use_cache=False)
+        generation_time += time.time() - start_time
+        audio_duration += result.duration
+        paths.append(result.save(output_dir / f"{variant}_{index}.wav"))
+
+    del model
+    gc.collect()
+    return paths, generation_time, audio_duration
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    texts = args.text or DEFAULT_TEXTS
+
+    print("=" * 60)
+    print(f"Int8 Quantization Quality Gate - {get_display_name(args.model)}")
+    print("=" * 60)
+
+    ensure_directories()
+    reference_audio_path = find_reference_audio(args.reference)
+    print(f"Reference audio: {reference_audio_path}")
+
+    output_dir = OUTPUT_DIRS[args.model] / "quantization_gate"
+    fp32_paths, fp32_time, fp32_duration = generate_all(
+        args.model, False, texts, reference_audio_path, output_dir, args.seed)
+    int8_paths, int8_time, int8_duration = generate_all(
+        args.model, True, texts, reference_audio_path, output_dir, args.seed)
+
+    print("\nComputing metrics...")
+    rows = []
+    for index, (fp32_path, int8_path) in enumerate(zip(fp32_paths, int8_paths)):
+        fp32_similarity = calculate_speaker_similarity(reference_audio_path, fp32_path)
+        int8_similarity = calculate_speaker_similarity(reference_audio_path, int8_path)
+        rows.append({
+            'text': texts[index],
+            'fp32_path': str(fp32_path),
+            'int8_path': str(int8_path),
+            'fp32_similarity': fp32_similarity,
+            'int8_similarity': int8_similarity,
+            'pesq': calculate_pesq_score(fp32_path, int8_path),
+            'stoi': calculate_stoi_score(fp32_path, int8_path)
+        })
+
+    def mean(key):
+        values = [row[key] for row in rows if row[key] is not None]
+        return float(np.mean(values)) if values else None
+
+    summary = {
+        'fp32_rtf': fp32_time / fp32_duration if fp32_duration else None,
+        'int8_rtf': int8_time / int8_duration if int8_duration else None,
+        'fp32_similarity': mean('fp32_similarity'),
+        'int8_similarity': mean('int8_similarity'),
+        'pesq': mean('pesq'),
+        'stoi': mean('stoi')
+    }
+    similarity_drop = None
+    if summary['fp32_similarity'] is not None and summary['int8_similarity'] is not None:
+        similarity_drop = summary['fp32_similarity'] - summary['int8_similarity']
+    summary['similarity_drop'] = similarity_drop
+
+    checks = {
+        'similarity_drop': similarity_drop is not None and similarity_drop <= args.max_similarity_drop,
+        'pesq': summary['pesq'] is not None and summary['pesq'] >= args.min_pesq,
+        'stoi': summary['stoi'] is not None and summary['stoi'] >= args.min_stoi
+    }
+    passed = all(checks.values())
+
+    def fmt(value, spec):
+        return "n/a" if value is None else format(value, spec)
+
+    print("\n" + "=" * 60)
+    print(f"RTF: fp32 {fmt(summary['fp32_rtf'], '.2f')}x, int8 {fmt(summary['int8_rtf'], '.2f')}x")
+    print(f"Speaker similarity: fp32 {fmt(summary['fp32_similarity'], '.3f')}, "
+          f"int8 {fmt(summary['int8_similarity'], '.3f')} "
+          f"(drop {fmt(similarity_drop, '.3f')}, max {args.max_similarity_drop}) "
+          f"{'✓' if checks['similarity_drop'] else '✗'}")
+    print(f"PESQ int8 vs fp32: {fmt(summary['pesq'], '.2f')} (min {args.min_pesq}) "
+          f"{'✓' if checks['pesq'] else '✗'}")
+    print(f"STOI int8 vs fp32: {fmt(summary['stoi'], '.3f')} (min {args.min_stoi}) "
+          f"{'✓' if checks['stoi'] else '✗'}")
+    print("-" * 60)
+    print("Quality gate PASSED" if passed else "Quality gate FAILED")
+    print("=" * 60)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = RESULTS_DIR / f"quantization_gate_{args.model}_{timestamp}.json"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.datetime.now().isoformat(),
+            'model': get_display_name(args.model),
+            'reference_audio': str(reference_audio_path),
+            'seed': args.seed,
+            'thresholds': {
+                'max_similarity_drop': args.max_similarity_drop,
+                'min_pesq': args.min_pesq,
+                'min_stoi': args.min_stoi
+            },
+            'summary': summary,
+            'checks': checks,
+            'passed': passed,
+            'samples': rows
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Results saved to: {output_file}")
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Pre-register reference voices in the YourTTS speaker-embedding store.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from models import load_model
+from utils import REFERENCE_DIR
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compute and store YourTTS speaker embeddings for a directory of references"
+    )
+
+    parser.add_argument(
+        '--reference-dir',
+        type=str,
+        default=str(REFERENCE_DIR),
+        help='Directory containing reference audio files'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("YourTTS - Speaker Embedding Registration")
+    print("=" * 60)
+
+    reference_dir = Path(args.reference_dir)
+    if not reference_dir.is_dir():
+        raise FileNotFoundError(f"Reference directory not found: {reference_dir}")
+
+    print("\nInitializing YourTTS model...")
+    model = load_model('yourtts')
+
+    print(f"\nRegistering voices from: {reference_dir}")
+    start_time = time.time()
+    embeddings = model.register_speakers(reference_dir)
+    elapsed = time.time() - start_time
+
+    for audio_path in embeddings:
+        print(f"  ✓ {audio_path}")
+
+    stats = model.embedding_store.stats()
+    print("\n" + "=" * 60)
+    print(f"Registered {len(embeddings)} voices in {elapsed:.2f} seconds")
+    print(f"Already known: {stats['hits']}, newly encoded: {stats['misses']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
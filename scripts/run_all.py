@@ -3,18 +3,25 @@ Run all TTS models sequentially and compare results.
 """
 
 from utils import (
+    ImportProfiler,
+    ResultsStore,
+    StageTimer,
+    partition_cores,
+    pin_to_cores,
     ensure_directories,
-    REFERENCE_DIR,
-    get_audio_duration,
-    load_audio
+    REFERENCE_DIR
 )
-from models import YourTTS, XTTS
+from models import get_model_class, get_display_name
+from server import synthesize
 import argparse
+import asyncio
+import multiprocessing as mp
 import time
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 def parse_args():
@@ -39,6 +46,45 @@ def parse_args():
         default=None,
         help='Path to reference audio file (optional, auto-detected if not provided)'
     )
+    parser.add_argument(
+        '--server',
+        type=str,
+        default=None,
+        help='URL of a running inference server (e.g. http://127.0.0.1:8765); '
+             'skips loading the models locally'
+    )
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='Run the models concurrently in separate processes, each pinned '
+             'to its own share of CPU cores'
+    )
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Drive all models from one asyncio event loop (agenerate); '
+             'models load and generate concurrently in this process'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Per-model generation timeout in seconds for --async'
+    )
+    parser.add_argument(
+        '--cores',
+        type=str,
+        default=None,
+        help='Cores per model for --parallel, e.g. "xtts=6,yourtts=2" '
+             '(default: split evenly)'
+    )
+
+    parser.add_argument(
+        '--import-profile',
+        action='store_true',
+        help='Print an import-time breakdown of the run'
+    )
 
     return parser.parse_args()
 
@@ -92,13 +138,49 @@ def calculate_rtf(generation_time, audio_duration):
     return generation_time / audio_duration
 
 
-def run_yourtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
+def stage_breakdown(timer: StageTimer) -> Dict:
+    """
+    Build the per-stage timing entry stored with each model's results.
+
+    Args:
+        timer: StageTimer that was active during generation
+
+    Returns:
+        Dictionary with stage seconds, counters and (for XTTS) GPT tokens/sec
+    """
+    breakdown = timer.to_dict()
+    tokens_per_sec = timer.rate('gpt_tokens', 'gpt_decode')
+    if tokens_per_sec is not None:
+        breakdown['gpt_tokens_per_sec'] = tokens_per_sec
+    return breakdown
+
+
+def print_stage_breakdown(breakdown: Dict, generation_time: float) -> None:
+    """Print stage timings as seconds and share of generation time."""
+    for name, seconds in sorted(
+            breakdown['stages'].items(), key=lambda item: item[1], reverse=True):
+        share = 100 * seconds / generation_time if generation_time else 0.0
+        print(f"  {name:<20} {seconds:>8.3f}s  {share:>5.1f}%")
+    if 'gpt_tokens_per_sec' in breakdown:
+        print(f"  GPT tokens: {breakdown['counters']['gpt_tokens']} "
+              f"({breakdown['gpt_tokens_per_sec']:.1f} tokens/sec)")
+
+
+def run_yourtts_generation(
+    text: str,
+    reference_path: Path,
+    server_url: Optional[str] = None,
+    apply_thread_profile: bool = True
+) -> Optional[Dict]:
     """
     Run YourTTS generation.
 
     Args:
         text: Text to synthesize
         reference_path: Path to reference audio
+        server_url: Optional inference server URL (model is loaded locally if None)
+        apply_thread_profile: Size torch's thread pools from the host profile
+            (False keeps a budget the caller already set)
 
     Returns:
         Dictionary with results or None if failed
@@ -108,20 +190,41 @@ def run_yourtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
         print("Running YourTTS")
         print("=" * 60)
 
-        # Initialize model
-        print("Initializing YourTTS model...")
-        model = YourTTS()
-
-        # Generate audio with timing
-        print("Generating speech...")
-        start_time = time.time()
-        output_path = model.generate(
-            text=text, reference_audio_path=reference_path)
-        generation_time = time.time() - start_time
+        if server_url:
+            # Delegate to the resident model on the server
+            print("Generating speech on server...")
+            response = synthesize(
+                server_url, 'yourtts', text, reference_path.resolve())
+            output_path = response['output_path']
+            generation_time = response['generation_time']
+            audio_duration = response['audio_duration']
+            encode_time = response['encode_time']
+            output_size = response['output_size']
+            load_time = 0.0
+            stages = None
+        else:
+            # Initialize model
+            print("Initializing YourTTS model...")
+            load_start = time.time()
+            model = get_model_class('yourtts')(apply_thread_profile=apply_thread_profile)
+            load_time = time.time() - load_start
+
+            # Generate audio with timing (per-stage spans recorded by the timer)
+            print("Generating speech...")
+            start_time = time.time()
+            with StageTimer() as timer:
+                result = model.generate(
+                    text=text, reference_audio_path=reference_path, use_cache=False)
+            generation_time = time.time() - start_time
+            stages = stage_breakdown(timer)
+            print_stage_breakdown(stages, generation_time)
+
+            # Metrics come from the in-memory waveform
+            output_path = result.output_path
+            audio_duration = result.duration
+            encode_time = result.timings['file_write']
+            output_size = result.output_size
 
-        # Calculate metrics
-        generated_audio, sr = load_audio(output_path)
-        audio_duration = get_audio_duration(generated_audio, sr)
         rtf = calculate_rtf(generation_time, audio_duration)
 
         results = {
@@ -129,9 +232,14 @@ def run_yourtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
             'output_path': str(output_path),
             'audio_duration': audio_duration,
             'generation_time': generation_time,
+            'load_time': load_time,
+            'encode_time': encode_time,
+            'output_size': output_size,
             'rtf': rtf,
             'success': True
         }
+        if stages is not None:
+            results['stage_timings'] = stages
 
         print(
             f"✓ YourTTS completed in {generation_time:.2f}s (RTF: {rtf:.2f}x)")
@@ -146,13 +254,21 @@ def run_yourtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
         }
 
 
-def run_xtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
+def run_xtts_generation(
+    text: str,
+    reference_path: Path,
+    server_url: Optional[str] = None,
+    apply_thread_profile: bool = True
+) -> Optional[Dict]:
     """
     Run XTTS v2 generation.
 
     Args:
         text: Text to synthesize
         reference_path: Path to reference audio
+        server_url: Optional inference server URL (model is loaded locally if None)
+        apply_thread_profile: Size torch's thread pools from the host profile
+            (False keeps a budget the caller already set)
 
     Returns:
         Dictionary with results or None if failed
@@ -162,20 +278,41 @@ def run_xtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
         print("Running XTTS v2")
         print("=" * 60)
 
-        # Initialize model
-        print("Initializing XTTS v2 model...")
-        model = XTTS()
+        if server_url:
+            # Delegate to the resident model on the server
+            print("Generating speech on server...")
+            response = synthesize(
+                server_url, 'xtts', text, reference_path.resolve())
+            output_path = response['output_path']
+            generation_time = response['generation_time']
+            audio_duration = response['audio_duration']
+            encode_time = response['encode_time']
+            output_size = response['output_size']
+            load_time = 0.0
+            stages = None
+        else:
+            # Initialize model
+            print("Initializing XTTS v2 model...")
+            load_start = time.time()
+            model = get_model_class('xtts')(apply_thread_profile=apply_thread_profile)
+            load_time = time.time() - load_start
+
+            # Generate audio with timing (per-stage spans recorded by the timer)
+            print("Generating speech...")
+            start_time = time.time()
+            with StageTimer() as timer:
+                result = model.generate(
+                    text=text, reference_audio_path=reference_path, use_cache=False)
+            generation_time = time.time() - start_time
+            stages = stage_breakdown(timer)
+            print_stage_breakdown(stages, generation_time)
+
+            # Metrics come from the in-memory waveform
+            output_path = result.output_path
+            audio_duration = result.duration
+            encode_time = result.timings['file_write']
+            output_size = result.output_size
 
-        # Generate audio with timing
-        print("Generating speech...")
-        start_time = time.time()
-        output_path = model.generate(
-            text=text, reference_audio_path=reference_path)
-        generation_time = time.time() - start_time
-
-        # Calculate metrics
-        generated_audio, sr = load_audio(output_path)
-        audio_duration = get_audio_duration(generated_audio, sr)
         rtf = calculate_rtf(generation_time, audio_duration)
 
         results = {
@@ -183,9 +320,14 @@ def run_xtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
             'output_path': str(output_path),
             'audio_duration': audio_duration,
             'generation_time': generation_time,
+            'load_time': load_time,
+            'encode_time': encode_time,
+            'output_size': output_size,
             'rtf': rtf,
             'success': True
         }
+        if stages is not None:
+            results['stage_timings'] = stages
 
         print(
             f"✓ XTTS v2 completed in {generation_time:.2f}s (RTF: {rtf:.2f}x)")
@@ -200,12 +342,195 @@ def run_xtts_generation(text: str, reference_path: Path) -> Optional[Dict]:
         }
 
 
-def display_comparison(results: list):
+# Model key -> generation function, in the order models are run
+GENERATION_FUNCTIONS = {
+    'yourtts': run_yourtts_generation,
+    'xtts': run_xtts_generation,
+}
+
+
+def parse_core_shares(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a --cores specification.
+
+    Args:
+        spec: Comma-separated "model=count" pairs (or None)
+
+    Returns:
+        Dictionary mapping model key to number of cores
+    """
+    shares = {}
+    if not spec:
+        return shares
+
+    for item in spec.split(','):
+        name, _, count = item.partition('=')
+        name = name.strip().lower()
+        if name not in GENERATION_FUNCTIONS or not count.strip().isdigit():
+            raise SystemExit(f"Invalid --cores entry: '{item}'")
+        shares[name] = int(count)
+    return shares
+
+
+def run_pinned_generation(
+    model_key: str,
+    cores: List[int],
+    text: str,
+    reference_path: Path
+) -> Optional[Dict]:
+    """
+    Pin the current (worker) process to `cores` and run one model.
+
+    Args:
+        model_key: Key in GENERATION_FUNCTIONS
+        cores: Core ids reserved for this model
+        text: Text to synthesize
+        reference_path: Path to reference audio
+
+    Returns:
+        Result dictionary from the generation function
+    """
+    pin_to_cores(cores)
+    # Keep the pinned budget instead of the host-wide thread profile
+    result = GENERATION_FUNCTIONS[model_key](
+        text, reference_path, apply_thread_profile=False)
+    result['cpu_cores'] = cores
+    return result
+
+
+def run_parallel(
+    text: str,
+    reference_path: Path,
+    partitions: Dict[str, List[int]]
+) -> List[Dict]:
+    """
+    Run every model concurrently, one spawned process per model.
+
+    Args:
+        text: Text to synthesize
+        reference_path: Path to reference audio
+        partitions: Model key -> core ids reserved for it
+
+    Returns:
+        Result dictionaries in GENERATION_FUNCTIONS order
+    """
+    for model_key, cores in partitions.items():
+        print(f"{model_key}: cores {cores} ({len(cores)} threads)")
+
+    # Spawn so each child initializes torch after pinning itself
+    with ProcessPoolExecutor(
+        max_workers=len(partitions),
+        mp_context=mp.get_context("spawn")
+    ) as executor:
+        futures = {
+            model_key: executor.submit(
+                run_pinned_generation, model_key, cores, text, reference_path)
+            for model_key, cores in partitions.items()
+        }
+
+        results = []
+        for model_key, future in futures.items():
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({
+                    'model': get_display_name(model_key),
+                    'success': False,
+                    'error': str(e)
+                })
+    return results
+
+
+async def run_async_generation(
+    model_key: str,
+    text: str,
+    reference_path: Path,
+    timeout: Optional[float] = None
+) -> Dict:
+    """
+    Load one model off the event loop and generate with agenerate().
+
+    Args:
+        model_key: Key in GENERATION_FUNCTIONS
+        text: Text to synthesize
+        reference_path: Path to reference audio
+        timeout: Optional generation timeout in seconds
+
+    Returns:
+        Result dictionary in the same format as the generation functions
+    """
+    model_name = get_display_name(model_key)
+    loop = asyncio.get_running_loop()
+    try:
+        load_start = time.time()
+        model = await loop.run_in_executor(None, get_model_class(model_key))
+        load_time = time.time() - load_start
+
+        start_time = time.time()
+        result = await model.agenerate(
+            text, reference_path, use_cache=False, timeout=timeout)
+        generation_time = time.time() - start_time
+        rtf = calculate_rtf(generation_time, result.duration)
+
+        print(f"✓ {model_name} completed in {generation_time:.2f}s (RTF: {rtf:.2f}x)")
+        return {
+            'model': model_name,
+            'output_path': str(result.output_path),
+            'audio_duration': result.duration,
+            'generation_time': generation_time,
+            'load_time': load_time,
+            'encode_time': result.timings['file_write'],
+            'output_size': result.output_size,
+            'rtf': rtf,
+            'success': True
+        }
+
+    except asyncio.TimeoutError:
+        print(f"✗ {model_name} timed out after {timeout:.1f}s")
+        return {
+            'model': model_name,
+            'success': False,
+            'error': f"timed out after {timeout:.1f}s"
+        }
+    except Exception as e:
+        print(f"✗ {model_name} failed: {str(e)}")
+        return {
+            'model': model_name,
+            'success': False,
+            'error': str(e)
+        }
+
+
+async def run_async(
+    text: str,
+    reference_path: Path,
+    timeout: Optional[float] = None
+) -> List[Dict]:
+    """
+    Run every model concurrently from one event loop.
+
+    Args:
+        text: Text to synthesize
+        reference_path: Path to reference audio
+        timeout: Optional per-model generation timeout in seconds
+
+    Returns:
+        Result dictionaries in GENERATION_FUNCTIONS order
+    """
+    return list(await asyncio.gather(*(
+        run_async_generation(model_key, text, reference_path, timeout)
+        for model_key in GENERATION_FUNCTIONS
+    )))
+
+
+def display_comparison(results: list, wall_clock_time: Optional[float] = None):
     """
     Display comparison table of results.
 
     Args:
         results: List of result dictionaries from each model
+        wall_clock_time: Total elapsed time of the run (seconds), shown next
+            to the summed per-model time if given
     """
     print("\n" + "=" * 60)
     print("COMPARISON RESULTS")
@@ -235,6 +560,13 @@ def display_comparison(results: list):
             print(
                 f"Fastest model: {fastest['model']} (RTF: {fastest['rtf']:.2f}x)")
 
+    if wall_clock_time is not None:
+        model_time = sum(
+            r.get('load_time', 0.0) + r.get('generation_time', 0.0) for r in successful)
+        print("-" * 60)
+        print(f"Total wall clock: {wall_clock_time:.2f}s "
+              f"(sum of per-model load + generation: {model_time:.2f}s)")
+
     if failed:
         print("\nFailed generations:")
         print("-" * 60)
@@ -262,6 +594,11 @@ def main():
     """
     # Parse arguments
     args = parse_args()
+    if args.parallel and args.server:
+        raise SystemExit("--parallel is not supported together with --server")
+    if args.use_async and (args.parallel or args.server):
+        raise SystemExit("--async is not supported together with --parallel or --server")
+    profiler = ImportProfiler().start() if args.import_profile else None
 
     print("=" * 60)
     print("TTS Model Comparison - Zero-Shot Voice Cloning")
@@ -277,57 +614,71 @@ def main():
 
     # Run all models
     results = []
-
-    # Run YourTTS
-    yourtts_result = run_yourtts_generation(args.text, reference_audio_path)
-    if yourtts_result:
-        results.append(yourtts_result)
-
-    # Run XTTS v2
-    xtts_result = run_xtts_generation(args.text, reference_audio_path)
-    if xtts_result:
-        results.append(xtts_result)
+    if args.parallel:
+        mode = 'parallel'
+    elif args.use_async:
+        mode = 'async'
+    else:
+        mode = 'sequential'
+    run_info = {'mode': mode}
+    run_start = time.time()
+
+    if args.parallel:
+        try:
+            partitions = partition_cores(
+                list(GENERATION_FUNCTIONS), parse_core_shares(args.cores))
+        except ValueError as e:
+            raise SystemExit(str(e))
+
+        print("\nRunning models in parallel")
+        results = run_parallel(args.text, reference_audio_path, partitions)
+        run_info['cpu_partitions'] = partitions
+    elif args.use_async:
+        print("\nRunning models concurrently from one event loop")
+        results = asyncio.run(run_async(args.text, reference_audio_path, args.timeout))
+    else:
+        # Run YourTTS
+        yourtts_result = run_yourtts_generation(
+            args.text, reference_audio_path, args.server)
+        if yourtts_result:
+            results.append(yourtts_result)
+
+        # Run XTTS v2
+        xtts_result = run_xtts_generation(
+            args.text, reference_audio_path, args.server)
+        if xtts_result:
+            results.append(xtts_result)
+
+    run_info['wall_clock_time'] = time.time() - run_start
 
     # Display comparison
-    display_comparison(results)
+    display_comparison(results, run_info['wall_clock_time'])
+
+    # Append results to the results store
+    save_results(results, args.text, reference_audio_path, run_info)
 
-    # Save results to JSON file
-    save_results_to_json(results, args.text, reference_audio_path)
+    if profiler is not None:
+        profiler.report()
 
 
-def save_results_to_json(results: list, text: str, reference_audio_path: Path):
+def save_results(
+    results: list,
+    text: str,
+    reference_audio_path: Path,
+    run_info: Optional[Dict] = None
+):
     """
-    Save results to JSON file for later analysis.
+    Append results to the results store for later analysis.
 
     Args:
         results: List of result dictionaries from each model
         text: Text that was synthesized
         reference_audio_path: Path to reference audio used
+        run_info: Optional run-level fields (mode, wall clock, CPU partitions)
     """
-    import json
-    import datetime
-
-    # Create results directory if it doesn't exist
-    results_dir = Path(__file__).parent.parent / "results"
-    results_dir.mkdir(parents=True, exist_ok=True)
-
-    # Prepare output data
-    output_data = {
-        "timestamp": datetime.datetime.now().isoformat(),
-        "text": text,
-        "reference_audio": str(reference_audio_path),
-        "models": results
-    }
-
-    # Generate filename with timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = results_dir / f"metrics_{timestamp}.json"
-
-    # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
-
-    print(f"\n✓ Results saved to: {output_file}")
+    with ResultsStore() as store:
+        run_id = store.add_run(text, reference_audio_path, results, run_info)
+        print(f"\n✓ Results saved to: {store.path} (run {run_id})")
 
 
 if __name__ == "__main__":
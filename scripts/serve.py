@@ -0,0 +1,101 @@
+"""
+Run the local inference server with resident YourTTS and XTTS models.
+"""
+
+import argparse
+from functools import partial
+
+from models import BatchedYourTTS, available_models, load_model
+from server import InferenceServer
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve TTS models from a long-lived local process"
+    )
+
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Address to bind'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to bind'
+    )
+    parser.add_argument(
+        '--models',
+        type=str,
+        nargs='+',
+        choices=available_models(),
+        default=available_models(),
+        help='Models to keep resident'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=1,
+        help='Concurrent syntheses per model'
+    )
+    parser.add_argument(
+        '--max-queue',
+        type=int,
+        default=8,
+        help='Queued plus running requests per model before rejecting with 503'
+    )
+    parser.add_argument(
+        '--micro-batch',
+        type=int,
+        default=0,
+        help='Micro-batch concurrent YourTTS requests up to this many items (0 disables)'
+    )
+    parser.add_argument(
+        '--batch-wait-ms',
+        type=float,
+        default=20.0,
+        help='Micro-batching window in milliseconds'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("TTS Inference Server")
+    print("=" * 60)
+
+    factories = {name: partial(load_model, name) for name in available_models()}
+    concurrency_overrides = {}
+    if args.micro_batch > 0:
+        factories['yourtts'] = lambda: BatchedYourTTS(
+            load_model('yourtts'), max_batch_size=args.micro_batch, max_wait_ms=args.batch_wait_ms)
+        concurrency_overrides['yourtts'] = args.micro_batch
+
+    server = InferenceServer(
+        (args.host, args.port),
+        factories,
+        args.models,
+        max_concurrency=args.max_concurrency,
+        max_queue=max(args.max_queue, args.micro_batch),
+        concurrency_overrides=concurrency_overrides
+    )
+
+    print(f"\nServing {', '.join(args.models)} on http://{args.host}:{args.port}")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Tune torch thread counts and batch size per model for this host.
+
+Benchmarks each model over a grid of intra-op threads, inter-op threads and
+batch sizes, then stores the fastest setting in the thread profile
+(THREAD_PROFILE_FILE). Models apply the profile when they are constructed.
+"""
+
+import argparse
+import datetime
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from models import available_models, get_display_name
+from utils import (
+    REFERENCE_DIR,
+    THREAD_PROFILE_FILE,
+    available_cores,
+    host_key,
+    save_thread_profile
+)
+
+
+def default_thread_counts(num_cores):
+    """Powers of two up to the core count, plus the core count itself."""
+    counts = []
+    threads = 1
+    while threads < num_cores:
+        counts.append(threads)
+        threads *= 2
+    counts.append(num_cores)
+    return counts
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Tune torch thread counts and batch size per model"
+    )
+
+    default_text = os.environ.get(
+        'TEXT',
+        "Zero-shot voice cloning reproduces a speaker's voice from a few seconds of reference audio."
+    )
+
+    parser.add_argument(
+        '--models',
+        type=str,
+        nargs='+',
+        choices=available_models(),
+        default=available_models(),
+        help='Models to tune'
+    )
+    parser.add_argument(
+        '--text',
+        type=str,
+        default=default_text,
+        help='Text synthesized at every grid point'
+    )
+    parser.add_argument(
+        '--reference',
+        type=str,
+        default=None,
+        help='Path to reference audio file (optional, auto-detected if not provided)'
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        nargs='+',
+        default=None,
+        help='Intra-op thread counts to try (default: powers of two up to the core budget)'
+    )
+    parser.add_argument(
+        '--interop',
+        type=int,
+        nargs='+',
+        default=[1, 2],
+        help='Inter-op thread counts to try'
+    )
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8],
+        help='Batch sizes to try (models without batched synthesis use 1)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of jobs expected to share this host; caps threads at cores / jobs'
+    )
+    parser.add_argument(
+        '--repeats',
+        type=int,
+        default=3,
+        help='Timed runs per grid point (median is used)'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.05,
+        help='Prefer fewer threads and smaller batches within this fraction of the best RTF'
+    )
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=str(THREAD_PROFILE_FILE),
+        help='Thread profile file to update'
+    )
+    parser.add_argument(
+        '--no-save',
+        action='store_true',
+        help='Print the results without updating the profile'
+    )
+
+    return parser.parse_args()
+
+
+def find_reference_audio(reference_path=None):
+    """Find reference audio file."""
+    if reference_path:
+        ref_path = Path(reference_path)
+        if not ref_path.exists():
+            raise FileNotFoundError(f"Reference audio not found: {reference_path}")
+        return ref_path
+
+    # Search for audio files in REFERENCE_DIR
+    audio_files = list(REFERENCE_DIR.glob("*.wav")) + list(REFERENCE_DIR.glob("*.mp3"))
+
+    if not audio_files:
+        raise FileNotFoundError(
+            f"No audio files found in {REFERENCE_DIR}. "
+            "Please provide a .wav or .mp3 file."
+        )
+
+    return audio_files[0]
+
+
+def benchmark_grid(model_name, inter_op_threads, thread_counts, batch_sizes,
+                   text, reference_audio_path, repeats):
+    """
+    Benchmark one model over thread counts and batch sizes.
+
+    Runs in a fresh process because the inter-op pool can only be sized
+    once, before the model does any parallel work.
+
+    Returns:
+        Tuple of (torch version, list of result rows)
+    """
+    import torch
+    from models import load_model
+
+    torch.set_num_interop_threads(inter_op_threads)
+    model = load_model(model_name, apply_thread_profile=False)
+    if not hasattr(model, 'synthesize_batch'):
+        batch_sizes = [1]
+
+    def run(batch_size):
+        if batch_size == 1:
+            return [model.generate(
+                text, reference_audio_path, save=False, use_cache=False).audio]
+        return model.synthesize_batch([text] * batch_size, reference_audio_path)
+
+    # Warm-up (speaker embedding / conditioning caches, allocator)
+    run(1)
+
+    rows = []
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        for batch_size in batch_sizes:
+            times = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                audios = run(batch_size)
+                times.append(time.perf_counter() - start_time)
+            audio_duration = sum(len(audio) for audio in audios) / model.sample_rate
+            elapsed = float(np.median(times))
+            rows.append({
+                'intra_op_threads': threads,
+                'inter_op_threads': inter_op_threads,
+                'batch_size': batch_size,
+                'time': elapsed,
+                'rtf': elapsed / audio_duration if audio_duration > 0 else float('inf')
+            })
+            print(f"  {model_name}: {threads:>3} intra / {inter_op_threads} inter, "
+                  f"batch {batch_size}: RTF {rows[-1]['rtf']:.3f}x")
+
+    return torch.__version__, rows
+
+
+def select_best(rows, tolerance):
+    """
+    Pick the cheapest setting whose RTF is within tolerance of the best.
+
+    Fewer threads leave cores for other jobs and smaller batches keep
+    latency down, so they win ties.
+    """
+    best_rtf = min(row['rtf'] for row in rows)
+    candidates = [row for row in rows if row['rtf'] <= best_rtf * (1 + tolerance)]
+    return min(candidates, key=lambda row: (
+        row['intra_op_threads'], row['inter_op_threads'], row['batch_size']))
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("Thread Auto-Tuner")
+    print("=" * 60)
+
+    num_cores = len(available_cores())
+    core_budget = max(1, num_cores // max(1, args.jobs))
+    thread_counts = sorted({
+        min(threads, core_budget)
+        for threads in (args.threads or default_thread_counts(core_budget))
+    })
+    reference_audio_path = find_reference_audio(args.reference)
+
+    print(f"Host: {host_key()}")
+    print(f"Core budget: {core_budget} of {num_cores} ({args.jobs} job(s))")
+    print(f"Intra-op threads: {thread_counts}")
+    print(f"Inter-op threads: {args.interop}")
+    print(f"Reference audio: {reference_audio_path}")
+
+    for model_name in args.models:
+        print(f"\nTuning {get_display_name(model_name)}...")
+        rows = []
+        torch_version = None
+        for inter_op_threads in args.interop:
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+                torch_version, grid_rows = executor.submit(
+                    benchmark_grid, model_name, inter_op_threads, thread_counts,
+                    args.batch_sizes, args.text, reference_audio_path, args.repeats
+                ).result()
+            rows.extend(grid_rows)
+
+        best = select_best(rows, args.tolerance)
+        fastest = min(row['rtf'] for row in rows)
+        print(f"\n✓ {get_display_name(model_name)}: {best['intra_op_threads']} intra-op, "
+              f"{best['inter_op_threads']} inter-op threads, batch {best['batch_size']} "
+              f"(RTF {best['rtf']:.3f}x, fastest {fastest:.3f}x)")
+
+        if not args.no_save:
+            save_thread_profile(Path(args.profile), model_name, {
+                'intra_op_threads': best['intra_op_threads'],
+                'inter_op_threads': best['inter_op_threads'],
+                'batch_size': best['batch_size'],
+                'rtf': best['rtf'],
+                'jobs': args.jobs,
+                'torch_version': torch_version,
+                'tuned_at': datetime.datetime.now().isoformat()
+            })
+
+    if not args.no_save:
+        print(f"\n✓ Thread profile saved to: {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
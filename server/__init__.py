@@ -0,0 +1,12 @@
+"""
+Local inference server keeping TTS models resident between requests.
+"""
+
+from .client import synthesize, health
+from .app import InferenceServer
+
+__all__ = [
+    "InferenceServer",
+    "synthesize",
+    "health",
+]
@@ -0,0 +1,291 @@
+"""
+HTTP inference server that keeps YourTTS and XTTS resident in memory.
+
+Requests are queued per model with bounded concurrency. Once a model's queue
+is full, new requests are rejected with 503 so clients can back off.
+"""
+
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from utils import AUDIO_FORMAT, OUTPUT_FORMATS, GENERATED_DIR
+
+
+# Response Content-Type per output format
+CONTENT_TYPES = {
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'opus': 'audio/ogg',
+}
+
+
+def resolve_output_path(output: str) -> Path:
+    """
+    Resolve a client-supplied output path inside GENERATED_DIR.
+
+    Args:
+        output: Absolute path, or path relative to GENERATED_DIR
+
+    Returns:
+        Resolved output path
+
+    Raises:
+        ValueError: If the path points outside GENERATED_DIR
+    """
+    root = GENERATED_DIR.resolve()
+    output_path = (root / output).resolve()
+    if output_path == root or root not in output_path.parents:
+        raise ValueError(f"output must be a file under {GENERATED_DIR}")
+    return output_path
+
+
+class ModelSlot:
+    """A resident model with a bounded request queue."""
+
+    def __init__(self, model, max_concurrency: int, max_queue: int):
+        """
+        Initialize slot.
+
+        Args:
+            model: Loaded model wrapper
+            max_concurrency: Requests allowed to run at the same time
+            max_queue: Requests allowed to wait or run before rejecting
+        """
+        self.model = model
+        self.max_queue = max_queue
+        self._semaphore = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def try_enter(self) -> bool:
+        """Reserve a queue position; return False if the queue is full."""
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.pending += 1
+            return True
+
+    def run(
+        self,
+        text: str,
+        reference_audio_path: Path,
+        output_path: Optional[Path] = None,
+        audio_format: str = AUDIO_FORMAT,
+        sample_rate: Optional[int] = None,
+        bitrate_kbps: Optional[float] = None
+    ) -> Dict:
+        """
+        Wait for a free execution slot, run the synthesis and encode the
+        result (encoding happens after the slot is released).
+
+        Must be preceded by a successful try_enter().
+
+        Args:
+            text: Text to convert to speech
+            reference_audio_path: Path to reference audio
+            output_path: Optional output path (auto-generated if None)
+            audio_format: "wav", "flac" or "opus" (used for auto paths)
+            sample_rate: Optional output rate (model's native rate if None)
+            bitrate_kbps: Opus bitrate
+
+        Returns:
+            Dictionary with output_path, audio_duration, generation_time, rtf,
+            encode_time and output_size
+        """
+        try:
+            with self._semaphore:
+                start_time = time.time()
+                result = self.model.generate(
+                    text=text,
+                    reference_audio_path=reference_audio_path,
+                    save=False
+                )
+                generation_time = time.time() - start_time
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+        if output_path is None:
+            output_path = self.model.default_output_path().with_suffix(f".{audio_format}")
+        result.save(output_path, target_sample_rate=sample_rate, bitrate_kbps=bitrate_kbps)
+
+        audio_duration = result.duration
+        rtf = generation_time / audio_duration if audio_duration else float('inf')
+
+        return {
+            'output_path': str(result.output_path),
+            'audio_duration': audio_duration,
+            'generation_time': generation_time,
+            'rtf': rtf,
+            'encode_time': result.timings['file_write'],
+            'output_size': result.output_size
+        }
+
+    def status(self) -> Dict:
+        """Return queue, synthesis cache and text frontend statistics."""
+        status = {
+            'pending': self.pending,
+            'max_queue': self.max_queue,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+        batcher = getattr(self.model, 'batcher', None)
+        if batcher is not None:
+            status['batching'] = batcher.stats()
+        synthesis_cache = getattr(self.model, 'synthesis_cache', None)
+        if synthesis_cache is not None:
+            status['synthesis_cache'] = synthesis_cache.stats()
+        frontend = getattr(self.model, 'frontend', None)
+        if frontend is not None:
+            status['text_frontend'] = frontend.stats()
+        return status
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server with resident models.
+
+    Endpoints:
+        GET  /health      Loaded models and queue statistics
+        POST /synthesize  JSON body {model, text, reference, output, response,
+                          format, sample_rate, bitrate}
+                          response="path" returns JSON, "audio" returns the
+                          encoded audio bytes
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        model_factories: Dict[str, Callable],
+        model_names: Iterable[str],
+        max_concurrency: int = 1,
+        max_queue: int = 8,
+        concurrency_overrides: Optional[Dict[str, int]] = None
+    ):
+        """
+        Load models and bind the server socket.
+
+        Args:
+            address: (host, port) to bind
+            model_factories: Mapping of model name to wrapper class or factory
+            model_names: Names of models to keep resident
+            max_concurrency: Concurrent syntheses per model
+            max_queue: Queued plus running requests per model before 503
+            concurrency_overrides: Per-model concurrency (e.g. a micro-batched
+                model needs as many concurrent requests as its batch size)
+        """
+        concurrency_overrides = concurrency_overrides or {}
+        self.slots = {}
+        for name in model_names:
+            print(f"Loading resident model: {name}")
+            self.slots[name] = ModelSlot(
+                model_factories[name](),
+                concurrency_overrides.get(name, max_concurrency),
+                max_queue
+            )
+
+        super().__init__(address, _RequestHandler)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Request handler for InferenceServer."""
+
+    server: InferenceServer
+
+    def _send_json(self, status: int, payload: Dict, headers: Dict = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            return
+
+        self._send_json(HTTPStatus.OK, {
+            'models': {name: slot.status() for name, slot in self.server.slots.items()}
+        })
+
+    def do_POST(self):
+        if self.path != '/synthesize':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            model_name = request['model']
+            text = request['text']
+            reference_audio_path = Path(request['reference'])
+            audio_format = request.get('format') or AUDIO_FORMAT
+            if audio_format not in OUTPUT_FORMATS:
+                raise ValueError(f"unsupported format '{audio_format}'")
+            sample_rate = int(request['sample_rate']) if request.get('sample_rate') else None
+            bitrate_kbps = float(request['bitrate']) if request.get('bitrate') else None
+            # Clients may only write below GENERATED_DIR
+            output_path = resolve_output_path(request['output']) if request.get('output') else None
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': f"Invalid request: {e}"})
+            return
+
+        slot = self.server.slots.get(model_name)
+        if slot is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Model not loaded: {model_name}"})
+            return
+
+        if not reference_audio_path.exists():
+            self._send_json(HTTPStatus.BAD_REQUEST,
+                            {'error': f"Reference audio not found: {reference_audio_path}"})
+            return
+
+        # Backpressure: reject instead of queueing without bound
+        if not slot.try_enter():
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE,
+                            {'error': f"Queue full for {model_name}"},
+                            headers={'Retry-After': '1'})
+            return
+
+        try:
+            result = slot.run(
+                text,
+                reference_audio_path,
+                output_path,
+                audio_format=audio_format,
+                sample_rate=sample_rate,
+                bitrate_kbps=bitrate_kbps
+            )
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+            return
+
+        if request.get('response') == 'audio':
+            output_path = Path(result['output_path'])
+            body = output_path.read_bytes()
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type',
+                             CONTENT_TYPES.get(output_path.suffix.lstrip('.'), 'application/octet-stream'))
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('X-Audio-Duration', str(result['audio_duration']))
+            self.send_header('X-Generation-Time', str(result['generation_time']))
+            self.send_header('X-RTF', str(result['rtf']))
+            self.send_header('X-Encode-Time', str(result['encode_time']))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(HTTPStatus.OK, result)
@@ -0,0 +1,114 @@
+"""
+Minimal HTTP client for the local inference server (stdlib only).
+"""
+
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+
+
+def _request(url: str, payload: Optional[Dict] = None, timeout: float = 3600.0):
+    """
+    Send a request to the server.
+
+    Args:
+        url: Full endpoint URL
+        payload: JSON body (GET request if None)
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Tuple of (headers, body_bytes)
+
+    Raises:
+        RuntimeError: If the server returns an error status
+    """
+    data = None
+    headers = {}
+    if payload is not None:
+        data = json.dumps(payload).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+
+    request = urllib.request.Request(url, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get('error', e.reason)
+        except ValueError:
+            message = e.reason
+        raise RuntimeError(f"Server error {e.code}: {message}") from e
+
+
+def health(server_url: str = DEFAULT_SERVER_URL) -> Dict:
+    """
+    Query server status (loaded models and queue depths).
+
+    Args:
+        server_url: Base URL of the server
+
+    Returns:
+        Status dictionary
+    """
+    _, body = _request(server_url.rstrip('/') + '/health')
+    return json.loads(body)
+
+
+def synthesize(
+    server_url: str,
+    model: str,
+    text: str,
+    reference_audio_path: Path,
+    output_path: Optional[Path] = None,
+    return_audio: bool = False,
+    audio_format: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    bitrate_kbps: Optional[float] = None
+) -> Dict:
+    """
+    Request a synthesis from the server.
+
+    Args:
+        server_url: Base URL of the server
+        model: Model name ("yourtts" or "xtts")
+        text: Text to convert to speech
+        reference_audio_path: Path to reference audio (on the server host)
+        output_path: Optional output path on the server host (absolute or
+            relative to GENERATED_DIR; paths outside it are rejected)
+        return_audio: Return the encoded audio bytes instead of a file path
+        audio_format: Output format ("wav", "flac" or "opus"; server default if None)
+        sample_rate: Output sample rate (model's native rate if None)
+        bitrate_kbps: Opus bitrate
+
+    Returns:
+        Dictionary with output_path (or audio bytes), audio_duration,
+        generation_time, rtf, encode_time and output_size
+    """
+    payload = {
+        'model': model,
+        'text': text,
+        'reference': str(reference_audio_path),
+        'output': str(output_path) if output_path else None,
+        'response': 'audio' if return_audio else 'path',
+        'format': audio_format,
+        'sample_rate': sample_rate,
+        'bitrate': bitrate_kbps
+    }
+    headers, body = _request(server_url.rstrip('/') + '/synthesize', payload)
+
+    if return_audio:
+        return {
+            'audio': body,
+            'audio_duration': float(headers['X-Audio-Duration']),
+            'generation_time': float(headers['X-Generation-Time']),
+            'rtf': float(headers['X-RTF']),
+            'encode_time': float(headers['X-Encode-Time']),
+            'output_size': len(body)
+        }
+
+    return json.loads(body)
@@ -5,38 +5,171 @@ Utility modules for TTS Zero-Shot Voice Cloning project.
 from .config import (
     PROJECT_ROOT,
     REFERENCE_DIR,
+    GENERATED_DIR,
     GENERATED_YOURTTS_DIR,
     GENERATED_XTTS_DIR,
+    RESULTS_DIR,
     AUDIO_SAMPLES_DIR,
+    BENCHMARK_HISTORY_FILE,
+    RESULTS_DB_FILE,
     SAMPLE_RATE,
+    AUDIO_FORMAT,
+    OUTPUT_FORMATS,
+    OPUS_BITRATE_KBPS,
+    REFERENCE_AUDIO_EXTENSIONS,
+    SENTENCE_PAUSE_SAMPLES,
     YOURTTS_MODEL_NAME,
     XTTS_MODEL_NAME,
+    XTTS_LATENT_CACHE_DIR,
+    XTTS_LATENT_CACHE_SIZE,
+    YOURTTS_EMBEDDING_CACHE_DIR,
+    YOURTTS_EMBEDDING_CACHE_SIZE,
+    YOURTTS_EMBEDDING_CACHE_MAX_BYTES,
+    SYNTHESIS_CACHE_DIR,
+    SYNTHESIS_CACHE_SIZE,
+    SYNTHESIS_CACHE_MAX_BYTES,
+    PHONEME_CACHE_FILE,
+    TEXT_FRONTEND_WORKERS,
+    ASYNC_MAX_CONCURRENCY,
+    REFERENCE_PCM_CACHE_DIR,
+    QUANTIZED_WEIGHTS_DIR,
+    METRIC_CACHE_FILE,
+    EMBEDDING_INDEX_DIR,
+    QUANTIZATION_MAX_SIMILARITY_DROP,
+    QUANTIZATION_MIN_PESQ,
+    QUANTIZATION_MIN_STOI,
+    THREAD_PROFILE_FILE,
+    THREAD_PROFILE,
+    ONNX_MODEL_DIR,
+    ONNX_OPSET,
+    ONNX_CHECK_MAX_ABS_DIFF,
     ensure_directories
 )
 
 from .audio_processing import (
     load_audio,
     save_audio,
+    resample_audio,
+    open_audio_writer,
     preprocess_audio,
     get_audio_duration,
-    trim_silence
+    trim_silence,
+    ReferenceAudioStore
 )
 
+from .text import split_sentences, normalize_text
+
+from .cache import (
+    ArrayCache,
+    hash_file,
+    make_cache_key
+)
+
+from .import_profile import ImportProfiler
+
+from .results_store import ResultsStore, text_hash
+
+from .profiling import (
+    StageTimer,
+    active_timer,
+    stage,
+    count,
+    instrument_method,
+    instrument_module
+)
+
+from .cpu import (
+    available_cores,
+    partition_cores,
+    pin_to_cores,
+    host_key,
+    load_thread_profile,
+    save_thread_profile,
+    apply_thread_settings
+)
+
+from .memory import read_smaps_rollup, memory_footprint, available_memory
+
 __all__ = [
     # Config
     "PROJECT_ROOT",
     "REFERENCE_DIR",
+    "GENERATED_DIR",
     "GENERATED_YOURTTS_DIR",
     "GENERATED_XTTS_DIR",
+    "RESULTS_DIR",
     "AUDIO_SAMPLES_DIR",
+    "BENCHMARK_HISTORY_FILE",
+    "RESULTS_DB_FILE",
     "SAMPLE_RATE",
+    "AUDIO_FORMAT",
+    "OUTPUT_FORMATS",
+    "OPUS_BITRATE_KBPS",
+    "REFERENCE_AUDIO_EXTENSIONS",
+    "SENTENCE_PAUSE_SAMPLES",
     "YOURTTS_MODEL_NAME",
     "XTTS_MODEL_NAME",
+    "XTTS_LATENT_CACHE_DIR",
+    "XTTS_LATENT_CACHE_SIZE",
+    "YOURTTS_EMBEDDING_CACHE_DIR",
+    "YOURTTS_EMBEDDING_CACHE_SIZE",
+    "YOURTTS_EMBEDDING_CACHE_MAX_BYTES",
+    "SYNTHESIS_CACHE_DIR",
+    "SYNTHESIS_CACHE_SIZE",
+    "SYNTHESIS_CACHE_MAX_BYTES",
+    "PHONEME_CACHE_FILE",
+    "TEXT_FRONTEND_WORKERS",
+    "ASYNC_MAX_CONCURRENCY",
+    "REFERENCE_PCM_CACHE_DIR",
+    "QUANTIZED_WEIGHTS_DIR",
+    "METRIC_CACHE_FILE",
+    "EMBEDDING_INDEX_DIR",
+    "QUANTIZATION_MAX_SIMILARITY_DROP",
+    "QUANTIZATION_MIN_PESQ",
+    "QUANTIZATION_MIN_STOI",
+    "THREAD_PROFILE_FILE",
+    "THREAD_PROFILE",
+    "ONNX_MODEL_DIR",
+    "ONNX_OPSET",
+    "ONNX_CHECK_MAX_ABS_DIFF",
     "ensure_directories",
     # Audio processing
     "load_audio",
     "save_audio",
+    "resample_audio",
+    "open_audio_writer",
     "preprocess_audio",
     "get_audio_duration",
     "trim_silence",
+    "ReferenceAudioStore",
+    # Caching
+    "ArrayCache",
+    "hash_file",
+    "make_cache_key",
+    # Text
+    "split_sentences",
+    "normalize_text",
+    # Results store
+    "ResultsStore",
+    "text_hash",
+    # Profiling
+    "ImportProfiler",
+    "StageTimer",
+    "active_timer",
+    "stage",
+    "count",
+    "instrument_method",
+    "instrument_module",
+    # CPU partitioning and thread profiles
+    "available_cores",
+    "partition_cores",
+    "pin_to_cores",
+    "host_key",
+    "load_thread_profile",
+    "save_thread_profile",
+    "apply_thread_settings",
+    # Memory accounting
+    "read_smaps_rollup",
+    "memory_footprint",
+    "available_memory",
 ]
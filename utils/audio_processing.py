@@ -1,14 +1,26 @@
 """
 Audio processing utilities for loading, saving, and preprocessing audio files.
+
+librosa and soundfile are imported inside the functions that use them, so
+importing `utils` for configuration does not pull in numba.
 """
 
+import math
+import os
+import tempfile
+import time
 import numpy as np
-import librosa
-import soundfile as sf
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
-from .config import SAMPLE_RATE
+from .cache import hash_file
+from .config import (
+    SAMPLE_RATE,
+    REFERENCE_PCM_CACHE_DIR,
+    OPUS_BITRATE_KBPS,
+    OPUS_SAMPLE_RATES
+)
+from .profiling import stage
 
 
 def _validate_audio_path(audio_path: Path) -> None:
@@ -65,6 +77,8 @@ def load_audio(
     if sample_rate is None:
         sample_rate = SAMPLE_RATE
 
+    import librosa
+
     # Load audio with librosa
     audio, sr = librosa.load(audio_path, sr=sample_rate, mono=True)
 
@@ -75,18 +89,127 @@ def load_audio(
     return audio, sr
 
 
+def resample_audio(
+    audio: np.ndarray,
+    orig_sr: int,
+    target_sr: int
+) -> np.ndarray:
+    """
+    Resample audio with a polyphase filter.
+
+    Much cheaper than FFT or sinc resampling for the fixed integer ratios
+    between common speech rates (e.g. 24000 -> 22050 is 147/160).
+
+    Args:
+        audio: Audio array
+        orig_sr: Sample rate of `audio`
+        target_sr: Desired sample rate
+
+    Returns:
+        Resampled float32 audio array
+    """
+    if orig_sr == target_sr:
+        return np.asarray(audio, dtype=np.float32)
+
+    from scipy.signal import resample_poly
+
+    divisor = math.gcd(orig_sr, target_sr)
+    resampled = resample_poly(audio, target_sr // divisor, orig_sr // divisor)
+    return resampled.astype(np.float32, copy=False)
+
+
+def _opus_compression_level(bitrate_kbps: float) -> float:
+    """
+    Convert an Opus bitrate to a libsndfile compression level.
+
+    libsndfile maps compression level 0.0-1.0 linearly onto 256-6 kbps per
+    channel for Opus.
+    """
+    level = (256.0 - bitrate_kbps) / (256.0 - 6.0)
+    return min(max(level, 0.0), 1.0)
+
+
 def save_audio(
     audio: np.ndarray,
     output_path: Path,
-    sample_rate: Optional[int] = None
-) -> None:
+    sample_rate: Optional[int] = None,
+    target_sample_rate: Optional[int] = None,
+    bitrate_kbps: Optional[float] = None
+) -> Dict:
     """
-    Save audio array to disk.
+    Save audio array to disk, encoding by file extension.
+
+    Audio is written at its own sample rate unless `target_sample_rate` is
+    given. Supported extensions are .wav (16-bit PCM), .flac and .opus
+    (Ogg Opus; resampled to the nearest Opus rate if needed).
 
     Args:
         audio: Audio array to save
+        output_path: Path where to save audio
+        sample_rate: Sample rate of `audio` (uses config default if None)
+        target_sample_rate: Optional rate to resample to before encoding
+        bitrate_kbps: Opus bitrate (uses config default if None)
+
+    Returns:
+        Dictionary with format, sample_rate, encode_time (seconds, including
+        resampling) and output_size (bytes)
+
+    Raises:
+        ValueError: If the file extension is not supported
+    """
+    if sample_rate is None:
+        sample_rate = SAMPLE_RATE
+
+    output_path = Path(output_path)
+    audio_format = output_path.suffix.lower().lstrip('.')
+    if audio_format not in ('wav', 'flac', 'opus'):
+        raise ValueError(f"Unsupported output format: {output_path.suffix}")
+
+    # Ensure parent directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    import soundfile as sf
+
+    with stage('file_write'):
+        start_time = time.perf_counter()
+
+        output_sr = target_sample_rate or sample_rate
+        if audio_format == 'opus' and output_sr not in OPUS_SAMPLE_RATES:
+            output_sr = min((sr for sr in OPUS_SAMPLE_RATES if sr >= output_sr),
+                            default=OPUS_SAMPLE_RATES[-1])
+        audio = resample_audio(audio, sample_rate, output_sr)
+
+        # Save audio file
+        if audio_format == 'opus':
+            sf.write(output_path, audio, output_sr, format='OGG', subtype='OPUS',
+                     compression_level=_opus_compression_level(
+                         bitrate_kbps or OPUS_BITRATE_KBPS))
+        else:
+            sf.write(output_path, audio, output_sr)
+
+        encode_time = time.perf_counter() - start_time
+
+    return {
+        'format': audio_format,
+        'sample_rate': output_sr,
+        'encode_time': encode_time,
+        'output_size': output_path.stat().st_size
+    }
+
+
+def open_audio_writer(
+    output_path: Path,
+    sample_rate: Optional[int] = None
+) -> "soundfile.SoundFile":
+    """
+    Open a mono audio file for incremental writing.
+
+    Args:
         output_path: Path where to save audio
         sample_rate: Sample rate (uses config default if None)
+
+    Returns:
+        Writable SoundFile (use as a context manager and call write() per chunk)
     """
     if sample_rate is None:
         sample_rate = SAMPLE_RATE
@@ -94,8 +217,9 @@ def save_audio(
     # Ensure parent directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save audio file
-    sf.write(output_path, audio, sample_rate)
+    import soundfile as sf
+
+    return sf.SoundFile(output_path, mode='w', samplerate=sample_rate, channels=1)
 
 
 def preprocess_audio(
@@ -152,5 +276,102 @@ def trim_silence(
     Returns:
         Trimmed audio array
     """
+    import librosa
+
     trimmed, _ = librosa.effects.trim(audio, top_db=top_db)
     return trimmed
+
+
+class ReferenceAudioStore:
+    """
+    Decode-once store of reference audio as memory-mapped float32 PCM.
+
+    Each reference is decoded a single time at its native rate and saved as
+    a .npy file named after its content hash. Every requested sample rate is
+    resampled from that decode and saved alongside it, so later lookups (in
+    this or any other process) only memory-map a file. Editing a reference
+    changes its hash, which invalidates the cached buffers automatically.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize store.
+
+        Args:
+            cache_dir: Directory for cached PCM files (uses config default if None)
+        """
+        self.cache_dir = Path(cache_dir or REFERENCE_PCM_CACHE_DIR)
+        self._buffers: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def _write_npy(self, audio: np.ndarray, output_path: Path) -> None:
+        """Atomically write a float32 array as .npy."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, audio.astype(np.float32, copy=False))
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    def _load_native(self, audio_path: Path, content_hash: str) -> Tuple[np.ndarray, int]:
+        """
+        Return the native-rate decode, decoding the file only if needed.
+
+        Args:
+            audio_path: Path to reference audio
+            content_hash: Content hash of the reference
+
+        Returns:
+            Tuple of (audio_array, native_sample_rate)
+        """
+        for native_path in self.cache_dir.glob(f"{content_hash}_native_*.npy"):
+            native_sr = int(native_path.stem.rsplit("_", 1)[1])
+            return np.load(native_path, mmap_mode='c'), native_sr
+
+        import librosa
+
+        audio, native_sr = librosa.load(audio_path, sr=None, mono=True)
+        np.clip(audio, -1.0, 1.0, out=audio)
+        self._write_npy(audio, self.cache_dir / f"{content_hash}_native_{native_sr}.npy")
+        return audio, native_sr
+
+    def get(self, audio_path: Path, sample_rate: int) -> np.ndarray:
+        """
+        Get reference audio at the given sample rate.
+
+        The returned array is a copy-on-write memory map of the cached file,
+        so it can be wrapped (e.g. with torch.from_numpy) without copying.
+
+        Args:
+            audio_path: Path to reference audio
+            sample_rate: Sample rate required by the consumer
+
+        Returns:
+            Mono float32 audio array clipped to [-1, 1]
+
+        Raises:
+            FileNotFoundError: If audio file doesn't exist
+        """
+        audio_path = Path(audio_path)
+        _validate_audio_path(audio_path)
+
+        content_hash = hash_file(audio_path)
+        buffer = self._buffers.get((content_hash, sample_rate))
+        if buffer is not None:
+            return buffer
+
+        pcm_path = self.cache_dir / f"{content_hash}_{sample_rate}.npy"
+        if not pcm_path.exists():
+            audio, native_sr = self._load_native(audio_path, content_hash)
+            if native_sr != sample_rate:
+                import librosa
+                audio = librosa.resample(
+                    np.asarray(audio), orig_sr=native_sr, target_sr=sample_rate)
+            self._write_npy(audio, pcm_path)
+
+        buffer = np.load(pcm_path, mmap_mode='c')
+        self._buffers[(content_hash, sample_rate)] = buffer
+        return buffer
@@ -0,0 +1,212 @@
+"""
+Content-addressed caching utilities for reference-derived model inputs.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Read files in 1 MiB blocks when hashing
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Memoized file hashes keyed by (path, size, mtime)
+_file_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def hash_file(path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Results are memoized on (path, size, mtime) so repeated lookups of an
+    unchanged file do not re-read it from disk.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    digest = _file_hash_memo.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _file_hash_memo[memo_key] = digest
+
+    return digest
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Combine several key components into a single filesystem-safe key.
+
+    Args:
+        *parts: Key components (model name, content hashes, parameters, ...)
+
+    Returns:
+        Hex digest identifying the combination
+    """
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ArrayCache:
+    """
+    Two-level cache of named numpy arrays.
+
+    Entries are kept in an in-memory LRU and persisted as .npz files in
+    ``cache_dir``. Disk writes are atomic, so several processes can share
+    the same directory. When ``max_disk_bytes`` is set, the least recently
+    used files are evicted once the directory grows past the budget.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int = 32,
+        max_disk_bytes: Optional[int] = None,
+        compress: bool = True
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding the .npz files
+            max_entries: Maximum number of entries kept in memory
+            max_disk_bytes: Disk budget in bytes (unbounded if None)
+            compress: Whether to write compressed .npz files
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.compress = compress
+        self._memory: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the on-disk location for a cache key."""
+        return self.cache_dir / f"{key}.npz"
+
+    def _touch(self, key: str) -> None:
+        """Refresh the entry's mtime so disk eviction follows recency of use."""
+        try:
+            os.utime(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Insert entry into the in-memory LRU, evicting the oldest if full."""
+        self._memory[key] = arrays
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Look up an entry in memory, then on disk.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Dictionary of arrays, or None on a miss
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._touch(key)
+            self.hits += 1
+            return self._memory[key]
+
+        entry_path = self._entry_path(key)
+        try:
+            with np.load(entry_path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (FileNotFoundError, OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self._touch(key)
+        self._remember(key, arrays)
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Store an entry in memory and on disk.
+
+        Args:
+            key: Cache key
+            arrays: Dictionary of named arrays
+        """
+        self._remember(key, arrays)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if self.compress:
+                    np.savez_compressed(f, **arrays)
+                else:
+                    np.savez(f, **arrays)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+        if self.max_disk_bytes is not None:
+            self._enforce_disk_budget()
+
+    def _enforce_disk_budget(self) -> None:
+        """Delete least recently used files until the disk budget is met."""
+        entries = []
+        total = 0
+        for entry_path in self.cache_dir.glob("*.npz"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._memory.pop(entry_path.stem, None)
+            total -= size
+            self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or self._entry_path(key).exists()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, evictions and in-memory entries
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'memory_entries': len(self._memory),
+        }
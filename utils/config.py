@@ -4,6 +4,8 @@ Configuration management for TTS Zero-Shot Voice Cloning project.
 
 from pathlib import Path
 
+from .cpu import load_thread_profile
+
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -19,15 +21,67 @@ GENERATED_XTTS_DIR = GENERATED_DIR / "xtts"
 RESULTS_DIR = PROJECT_ROOT / "results"
 AUDIO_SAMPLES_DIR = RESULTS_DIR / "audio_samples"
 METRICS_FILE = RESULTS_DIR / "metrics_results.json"
+RESULTS_DB_FILE = RESULTS_DIR / "results.db"
+BENCHMARK_HISTORY_FILE = RESULTS_DIR / "benchmark_history.json"
+
+# Cache directories
+CACHE_DIR = PROJECT_ROOT / "cache"
+XTTS_LATENT_CACHE_DIR = CACHE_DIR / "xtts_latents"
+YOURTTS_EMBEDDING_CACHE_DIR = CACHE_DIR / "yourtts_embeddings"
+REFERENCE_PCM_CACHE_DIR = CACHE_DIR / "reference_pcm"
+QUANTIZED_WEIGHTS_DIR = CACHE_DIR / "quantized"
+THREAD_PROFILE_FILE = CACHE_DIR / "thread_profile.json"
+ONNX_MODEL_DIR = CACHE_DIR / "onnx"
+METRIC_CACHE_FILE = CACHE_DIR / "metrics.json"
+EMBEDDING_INDEX_DIR = CACHE_DIR / "embedding_index"
+SYNTHESIS_CACHE_DIR = CACHE_DIR / "synthesis"
+PHONEME_CACHE_FILE = CACHE_DIR / "yourtts_phonemes.jsonl"
 
 # Audio configuration
 SAMPLE_RATE = 22050
 AUDIO_FORMAT = "wav"
+OUTPUT_FORMATS = ("wav", "flac", "opus")
+OPUS_BITRATE_KBPS = 32  # Default Opus bitrate for speech
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)  # Rates Opus can encode
+REFERENCE_AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac")
+
+# Silence inserted between sentences (matches Coqui's Synthesizer.tts)
+SENTENCE_PAUSE_SAMPLES = 10000
 
 # Model configurations
 YOURTTS_MODEL_NAME = "tts_models/multilingual/multi-dataset/your_tts"
 XTTS_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
 
+# Conditioning-latent cache configuration
+XTTS_LATENT_CACHE_SIZE = 16  # Entries kept in memory
+
+# Speaker-embedding store configuration
+YOURTTS_EMBEDDING_CACHE_SIZE = 64  # Entries kept in memory
+YOURTTS_EMBEDDING_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Disk budget
+
+# Synthesized-audio cache configuration (repeated model/text/voice requests)
+SYNTHESIS_CACHE_SIZE = 32  # Entries kept in memory
+SYNTHESIS_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # Disk budget
+
+# YourTTS text frontend (memoized espeak-ng phonemization)
+TEXT_FRONTEND_WORKERS = 8  # Concurrent espeak-ng processes when prefilling a batch
+
+# Async generate API (agenerate)
+ASYNC_MAX_CONCURRENCY = 1  # Requests synthesized at once per model; others wait in the event loop
+
+# Quality gate for int8 quantized models (int8 output vs fp32 output)
+QUANTIZATION_MAX_SIMILARITY_DROP = 0.05  # Speaker similarity to the reference
+QUANTIZATION_MIN_PESQ = 3.0
+QUANTIZATION_MIN_STOI = 0.85
+
+# ONNX export of the YourTTS VITS model
+ONNX_OPSET = 15
+ONNX_CHECK_MAX_ABS_DIFF = 1e-3  # ONNX Runtime vs PyTorch, noise scales zeroed
+
+# Tuned torch thread counts and batch size per model for this host
+# (written by scripts/tune_threads.py; empty until tuned)
+THREAD_PROFILE = load_thread_profile(THREAD_PROFILE_FILE)
+
 
 def ensure_directories():
     """Create all necessary directories if they don't exist."""
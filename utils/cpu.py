@@ -0,0 +1,190 @@
+"""
+CPU partitioning helpers and per-host torch thread profiles.
+"""
+
+import json
+import os
+import platform
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def available_cores() -> List[int]:
+    """
+    Get the CPU cores this process may run on.
+
+    Returns:
+        Sorted list of core ids
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cores(
+    names: List[str],
+    shares: Optional[Dict[str, int]] = None
+) -> Dict[str, List[int]]:
+    """
+    Split the available cores into disjoint sets, one per name.
+
+    Args:
+        names: Partition names (e.g. model keys), in assignment order
+        shares: Optional number of cores per name; names without an entry
+            split the remaining cores evenly
+
+    Returns:
+        Dictionary mapping each name to its list of core ids
+
+    Raises:
+        ValueError: If the requested shares exceed the available cores
+    """
+    cores = available_cores()
+    shares = dict(shares or {})
+
+    requested = sum(shares.get(name, 0) for name in names)
+    unassigned = [name for name in names if name not in shares]
+    remaining = len(cores) - requested
+    if requested > len(cores) or (unassigned and remaining < len(unassigned)):
+        raise ValueError(
+            f"Cannot give {len(names)} partitions at least one core each from "
+            f"{len(cores)} available cores (requested {shares})")
+
+    for i, name in enumerate(unassigned):
+        # Spread the remainder over the first partitions
+        shares[name] = remaining // len(unassigned) + (1 if i < remaining % len(unassigned) else 0)
+
+    partitions = {}
+    start = 0
+    for name in names:
+        partitions[name] = cores[start:start + shares[name]]
+        start += shares[name]
+    return partitions
+
+
+def pin_to_cores(cores: List[int]) -> None:
+    """
+    Restrict the current process to the given cores and size torch's
+    intra-op thread pool to match.
+
+    Call this before torch runs any parallel work; the OpenMP pool is sized
+    on first use.
+
+    Args:
+        cores: Core ids to run on
+    """
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    os.environ["OMP_NUM_THREADS"] = str(len(cores))
+
+    import torch
+    torch.set_num_threads(len(cores))
+    torch.set_num_interop_threads(1)
+
+
+def host_key() -> str:
+    """
+    Identify the host for thread-profile lookup.
+
+    Uses the CPU model and the number of usable cores rather than the
+    hostname, which changes with every container run.
+
+    Returns:
+        Host identifier such as "Intel(R) Xeon(R) ... x16"
+    """
+    cpu_model = None
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu_model = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    cpu_model = cpu_model or platform.processor() or platform.machine()
+    return f"{cpu_model} x{len(available_cores())}"
+
+
+def _read_profile_file(path: Path) -> Dict:
+    """Read a thread-profile file, returning an empty profile if missing or invalid."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {"hosts": {}}
+    if not isinstance(data.get("hosts"), dict):
+        return {"hosts": {}}
+    return data
+
+
+def load_thread_profile(path: Path) -> Dict[str, Dict]:
+    """
+    Load this host's tuned thread settings.
+
+    Args:
+        path: Profile file written by scripts/tune_threads.py
+
+    Returns:
+        Dictionary mapping model name to its settings (empty if untuned)
+    """
+    return _read_profile_file(path)["hosts"].get(host_key(), {})
+
+
+def save_thread_profile(path: Path, model_name: str, settings: Dict) -> None:
+    """
+    Store tuned settings for a model on this host, keeping other entries.
+
+    Args:
+        path: Profile file
+        model_name: Registered model name
+        settings: Settings with intra_op_threads, inter_op_threads and
+            batch_size
+    """
+    path = Path(path)
+    data = _read_profile_file(path)
+    data["hosts"].setdefault(host_key(), {})[model_name] = settings
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def apply_thread_settings(settings: Optional[Dict]) -> Optional[Dict[str, int]]:
+    """
+    Size torch's intra-op and inter-op thread pools from tuned settings.
+
+    The intra-op count is capped at the cores this process may use, so a
+    profile tuned on the whole host does not oversubscribe a pinned worker.
+    The inter-op pool can only be sized once per process; if it is already
+    fixed (e.g. by pin_to_cores) it is left as is.
+
+    Args:
+        settings: Profile entry for a model, or None
+
+    Returns:
+        Thread counts in effect, or None if there was nothing to apply
+    """
+    if not settings:
+        return None
+
+    import torch
+
+    torch.set_num_threads(max(1, min(settings["intra_op_threads"], len(available_cores()))))
+    inter_op_threads = settings.get("inter_op_threads")
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            pass
+    return {
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads()
+    }
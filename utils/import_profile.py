@@ -0,0 +1,92 @@
+"""
+Import-time profiling for entry scripts.
+"""
+
+import builtins
+import sys
+import time
+from typing import Dict, List, Tuple
+
+
+class ImportProfiler:
+    """
+    Record wall time spent importing each top-level package.
+
+    Wraps `builtins.__import__` while active. For every package imported
+    for the first time, the profiler records its cumulative time (including
+    the packages it imports) and its self time (excluding them), so the
+    breakdown shows which dependencies dominate startup.
+    """
+
+    def __init__(self):
+        """Initialize profiler (call start() to begin recording)."""
+        self.cumulative: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self._original_import = None
+        self._active = set()
+        self._child_time: List[float] = []
+
+    def _profiled_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        top = name.partition('.')[0]
+        if level != 0 or top in sys.modules or top in self._active:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._active.add(top)
+        self._child_time.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            children = self._child_time.pop()
+            self._active.discard(top)
+            self.cumulative[top] = self.cumulative.get(top, 0.0) + elapsed
+            self.self_time[top] = self.self_time.get(top, 0.0) + elapsed - children
+            if self._child_time:
+                self._child_time[-1] += elapsed
+
+    def start(self) -> "ImportProfiler":
+        """Start recording imports."""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._profiled_import
+        return self
+
+    def stop(self) -> None:
+        """Stop recording and restore the original import function."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def total_time(self) -> float:
+        """Total time spent in top-level imports, in seconds."""
+        return sum(self.self_time.values())
+
+    def top(self, limit: int = 15) -> List[Tuple[str, float, float]]:
+        """
+        Get the slowest packages.
+
+        Args:
+            limit: Number of packages to return
+
+        Returns:
+            List of (package, self_time, cumulative_time) sorted by self time
+        """
+        rows = [(name, self.self_time[name], self.cumulative[name]) for name in self.self_time]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:limit]
+
+    def report(self, limit: int = 15) -> None:
+        """Print the import-time breakdown."""
+        self.stop()
+
+        print("\n" + "=" * 60)
+        print("Import-time profile")
+        print("=" * 60)
+        print(f"{'Package':<28}{'Self (s)':>12}{'Cumulative (s)':>18}")
+        for name, self_time, cumulative in self.top(limit):
+            print(f"{name:<28}{self_time:>12.3f}{cumulative:>18.3f}")
+        print("-" * 60)
+        print(f"Total import time: {self.total_time():.2f} seconds "
+              f"({len(self.self_time)} packages)")
+        print("=" * 60)
@@ -0,0 +1,78 @@
+"""
+Per-process memory accounting from /proc/<pid>/smaps_rollup (Linux).
+"""
+
+from typing import Dict, Union
+
+# smaps_rollup fields reported by memory_footprint()
+_SHARED_FIELDS = ("Shared_Clean", "Shared_Dirty")
+_PRIVATE_FIELDS = ("Private_Clean", "Private_Dirty")
+
+
+def read_smaps_rollup(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Read the memory totals of a process.
+
+    Args:
+        pid: Process id ("self" for the current process)
+
+    Returns:
+        Dictionary mapping smaps_rollup field (e.g. "Rss", "Pss",
+        "Shared_Clean") to bytes
+
+    Raises:
+        OSError: If the process does not exist or the kernel has no
+            smaps_rollup (not Linux, or older than 4.14)
+    """
+    totals = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            # "Rss:    123456 kB"; the header line has no kB unit
+            if len(parts) == 3 and parts[2] == "kB":
+                totals[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return totals
+
+
+def memory_footprint(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Split a process's resident memory into shared and unique pages.
+
+    Unique (private) pages are what the process costs on its own; shared
+    pages are also mapped by other processes, e.g. copy-on-write weights
+    inherited from a parent that loaded the model before forking.
+
+    Args:
+        pid: Process id ("self" for the current process)
+
+    Returns:
+        Dictionary with rss, pss (shared pages divided among their users),
+        shared and unique, in bytes
+
+    Raises:
+        OSError: If smaps_rollup cannot be read
+    """
+    totals = read_smaps_rollup(pid)
+    return {
+        'rss': totals.get("Rss", 0),
+        'pss': totals.get("Pss", 0),
+        'shared': sum(totals.get(name, 0) for name in _SHARED_FIELDS),
+        'unique': sum(totals.get(name, 0) for name in _PRIVATE_FIELDS),
+    }
+
+
+def available_memory() -> int:
+    """
+    Memory available for new processes without swapping.
+
+    Returns:
+        MemAvailable from /proc/meminfo in bytes
+
+    Raises:
+        OSError: If /proc/meminfo cannot be read
+    """
+    with open("/proc/meminfo", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    raise OSError("MemAvailable missing from /proc/meminfo")
@@ -0,0 +1,171 @@
+"""
+Per-stage timing hooks for the synthesis path.
+
+Code marks stages with `stage(name)` and counts work with `count(name, n)`.
+Both do nothing unless a StageTimer is active on the current thread, so the
+hooks can stay in the hot path permanently:
+
+    with StageTimer() as timer:
+        model.generate(text, reference)
+    print(timer.to_dict())
+"""
+
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional
+
+
+_local = threading.local()
+
+# Shared no-op context returned while no timer is active
+_DISABLED = nullcontext()
+
+
+class StageTimer:
+    """Accumulate perf_counter spans and counters per named stage."""
+
+    def __init__(self):
+        """Initialize empty timer (activate it with a `with` block)."""
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self._previous = None
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add a span to a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int) -> None:
+        """Add to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def rate(self, counter: str, stage_name: str) -> Optional[float]:
+        """
+        Counter value per second of a stage (e.g. tokens/sec).
+
+        Returns:
+            Rate, or None if either value is missing
+        """
+        seconds = self.stages.get(stage_name)
+        if not seconds or counter not in self.counters:
+            return None
+        return self.counters[counter] / seconds
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Return stages (seconds) and counters as plain dictionaries."""
+        return {'stages': dict(self.stages), 'counters': dict(self.counters)}
+
+    def __enter__(self) -> "StageTimer":
+        self._previous = getattr(_local, 'timer', None)
+        _local.timer = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _local.timer = self._previous
+        self._previous = None
+
+
+class _Span:
+    """Context manager adding its elapsed time to a timer stage."""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.start)
+
+
+def active_timer() -> Optional[StageTimer]:
+    """Return the StageTimer active on this thread, if any."""
+    return getattr(_local, 'timer', None)
+
+
+def stage(name: str):
+    """
+    Time a block as the named stage.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Context manager (a shared no-op when no timer is active)
+    """
+    timer = getattr(_local, 'timer', None)
+    if timer is None:
+        return _DISABLED
+    return _Span(timer, name)
+
+
+def count(name: str, value: int) -> None:
+    """Add to a counter of the active timer, if any."""
+    timer = getattr(_local, 'timer', None)
+    if timer is not None:
+        timer.count(name, value)
+
+
+def instrument_method(
+    obj,
+    method_name: str,
+    stage_name: str,
+    counter: Optional[Callable] = None
+) -> None:
+    """
+    Wrap a bound method of `obj` so every call is timed as a stage.
+
+    Args:
+        obj: Object whose method is wrapped (the instance is patched, not
+            its class)
+        method_name: Name of the method
+        stage_name: Stage the calls are added to
+        counter: Optional function mapping the return value to a
+            (counter_name, value) pair
+    """
+    method = getattr(obj, method_name)
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        timer = getattr(_local, 'timer', None)
+        if timer is None:
+            return method(*args, **kwargs)
+
+        start_time = time.perf_counter()
+        result = method(*args, **kwargs)
+        timer.add(stage_name, time.perf_counter() - start_time)
+        if counter is not None:
+            timer.count(*counter(result))
+        return result
+
+    setattr(obj, method_name, wrapper)
+
+
+def instrument_module(module, stage_name: str) -> None:
+    """
+    Time every forward pass of a torch module as a stage using hooks.
+
+    Args:
+        module: torch.nn.Module to instrument
+        stage_name: Stage the forward passes are added to
+    """
+    starts = threading.local()
+
+    def pre_hook(_module, _inputs):
+        if getattr(_local, 'timer', None) is not None:
+            starts.value = time.perf_counter()
+
+    def post_hook(_module, _inputs, _outputs):
+        timer = getattr(_local, 'timer', None)
+        start_time = getattr(starts, 'value', None)
+        if timer is not None and start_time is not None:
+            timer.add(stage_name, time.perf_counter() - start_time)
+            starts.value = None
+
+    module.register_forward_pre_hook(pre_hook)
+    module.register_forward_hook(post_hook)
@@ -0,0 +1,325 @@
+"""
+SQLite store of comparison runs, generations, stage timings and quality metrics.
+
+Every run_all invocation appends one run with one generation per model.
+Readers (the evaluation CLI and notebook) query it through ResultsStore
+instead of globbing and parsing results/metrics_*.json, and the evaluation
+records its quality metrics back into it. import_json() loads the legacy
+JSON files; re-importing a file is a no-op.
+"""
+
+import datetime
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .cache import make_cache_key
+from .config import RESULTS_DB_FILE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    text TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    reference_audio TEXT,
+    mode TEXT,
+    wall_clock_time REAL,
+    extra TEXT,
+    source TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    model TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    output_path TEXT,
+    audio_duration REAL,
+    generation_time REAL,
+    load_time REAL,
+    encode_time REAL,
+    output_size INTEGER,
+    rtf REAL,
+    error TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS stages (
+    generation_id INTEGER NOT NULL REFERENCES generations(id),
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (generation_id, stage)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    generation_id INTEGER NOT NULL REFERENCES generations(id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (generation_id, name)
+);
+CREATE TABLE IF NOT EXISTS quality_metrics (
+    generation_id INTEGER NOT NULL REFERENCES generations(id),
+    metric TEXT NOT NULL,
+    value REAL,
+    reference_hash TEXT,
+    generated_hash TEXT,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (generation_id, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_text_hash ON runs(text_hash);
+CREATE INDEX IF NOT EXISTS idx_generations_model ON generations(model);
+CREATE INDEX IF NOT EXISTS idx_generations_run ON generations(run_id);
+"""
+
+# Generation fields stored in their own columns (anything else goes to extra)
+_GENERATION_COLUMNS = (
+    'output_path', 'audio_duration', 'generation_time', 'load_time',
+    'encode_time', 'output_size', 'rtf', 'error'
+)
+
+
+def text_hash(text: str) -> str:
+    """Hash identifying a synthesized text across runs."""
+    return make_cache_key(text.strip())
+
+
+class ResultsStore:
+    """Append-only SQLite database of comparison results."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: Database file (uses config default if None)
+        """
+        self.path = Path(path or RESULTS_DB_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_run(
+        self,
+        text: str,
+        reference_audio: Path,
+        results: List[Dict],
+        run_info: Optional[Dict] = None,
+        timestamp: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Record one comparison run and its per-model results.
+
+        Args:
+            text: Text that was synthesized
+            reference_audio: Reference audio used
+            results: Result dictionaries from each model (as built by run_all)
+            run_info: Optional run-level fields (mode, wall clock, CPU partitions)
+            timestamp: ISO timestamp (now if None)
+            source: Optional unique origin (e.g. imported file name); a run
+                with an already recorded source is not added again
+
+        Returns:
+            Run id, or None if `source` was already recorded
+        """
+        run_info = dict(run_info or {})
+        timestamp = timestamp or datetime.datetime.now().isoformat()
+
+        with self._conn:
+            if source is not None and self._conn.execute(
+                    "SELECT 1 FROM runs WHERE source = ?", (source,)).fetchone():
+                return None
+
+            run_id = self._conn.execute(
+                "INSERT INTO runs (timestamp, text, text_hash, reference_audio, mode,"
+                " wall_clock_time, extra, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (timestamp, text, text_hash(text), str(reference_audio),
+                 run_info.pop('mode', None), run_info.pop('wall_clock_time', None),
+                 json.dumps(run_info) if run_info else None, source)
+            ).lastrowid
+
+            for result in results:
+                result = dict(result)
+                stage_timings = result.pop('stage_timings', None) or {}
+                model = result.pop('model')
+                success = bool(result.pop('success', False))
+                values = [result.pop(column, None) for column in _GENERATION_COLUMNS]
+                generation_id = self._conn.execute(
+                    "INSERT INTO generations (run_id, model, success, "
+                    + ", ".join(_GENERATION_COLUMNS) + ", extra) VALUES ("
+                    + ", ".join("?" * (len(_GENERATION_COLUMNS) + 4)) + ")",
+                    (run_id, model, int(success), *values,
+                     json.dumps(result) if result else None)
+                ).lastrowid
+
+                self._conn.executemany(
+                    "INSERT INTO stages (generation_id, stage, seconds) VALUES (?, ?, ?)",
+                    [(generation_id, name, seconds)
+                     for name, seconds in stage_timings.get('stages', {}).items()])
+                counters = dict(stage_timings.get('counters', {}))
+                if 'gpt_tokens_per_sec' in stage_timings:
+                    counters['gpt_tokens_per_sec'] = stage_timings['gpt_tokens_per_sec']
+                self._conn.executemany(
+                    "INSERT INTO counters (generation_id, name, value) VALUES (?, ?, ?)",
+                    [(generation_id, name, value) for name, value in counters.items()])
+
+        return run_id
+
+    def import_json(self, json_path: Path) -> Optional[int]:
+        """
+        Import a legacy results/metrics_*.json file.
+
+        Args:
+            json_path: Path to the JSON file
+
+        Returns:
+            Run id, or None if the file was imported before
+        """
+        json_path = Path(json_path)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        run_info = {
+            key: value for key, value in data.items()
+            if key not in ('timestamp', 'text', 'reference_audio', 'models')
+        }
+        return self.add_run(
+            data.get('text', ''),
+            data.get('reference_audio', ''),
+            data.get('models', []),
+            run_info,
+            timestamp=data.get('timestamp', 'unknown'),
+            source=json_path.name
+        )
+
+    def generations(
+        self,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        text: Optional[str] = None,
+        successful_only: bool = True
+    ) -> List[Dict]:
+        """
+        Query generations with their run fields and recorded quality metrics.
+
+        Args:
+            model: Only this model (e.g. "YourTTS")
+            since: Only runs at or after this ISO timestamp
+            until: Only runs before this ISO timestamp
+            text: Only runs that synthesized this text
+            successful_only: Skip failed generations
+
+        Returns:
+            One row per generation, oldest first, with timestamp, model,
+            reference_audio, output_path, audio_duration, generation_time,
+            rtf, success, text, run_id, generation_id and any recorded
+            metrics (similarity, pesq, stoi, ...)
+        """
+        conditions, params = [], []
+        if model is not None:
+            conditions.append("g.model = ?")
+            params.append(model)
+        if since is not None:
+            conditions.append("r.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("r.timestamp < ?")
+            params.append(until)
+        if text is not None:
+            conditions.append("r.text_hash = ?")
+            params.append(text_hash(text))
+        if successful_only:
+            conditions.append("g.success = 1")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = []
+        for record in self._conn.execute(
+                "SELECT r.timestamp, g.model, r.reference_audio, g.output_path,"
+                " g.audio_duration, g.generation_time, g.load_time, g.encode_time,"
+                " g.output_size, g.rtf, g.success, g.error, r.text, r.id AS run_id,"
+                " g.id AS generation_id"
+                " FROM generations g JOIN runs r ON r.id = g.run_id "
+                f"{where} ORDER BY r.timestamp, g.id", params):
+            row = dict(record)
+            row['success'] = bool(row['success'])
+            rows.append(row)
+
+        metrics: Dict[int, Dict[str, float]] = {}
+        for generation_id, metric, value in self._conn.execute(
+                "SELECT q.generation_id, q.metric, q.value FROM quality_metrics q"
+                " JOIN generations g ON g.id = q.generation_id JOIN runs r ON r.id = g.run_id "
+                f"{where}", params):
+            metrics.setdefault(generation_id, {})[metric] = value
+        for row in rows:
+            row.update(metrics.get(row['generation_id'], {}))
+        return rows
+
+    def stage_timings(self, model: Optional[str] = None) -> List[Dict]:
+        """
+        Query per-stage timings.
+
+        Args:
+            model: Only this model
+
+        Returns:
+            One row per (generation, stage) with timestamp, model,
+            generation_id, stage and seconds
+        """
+        where, params = ("WHERE g.model = ?", [model]) if model is not None else ("", [])
+        return [dict(record) for record in self._conn.execute(
+            "SELECT r.timestamp, g.model, s.generation_id, s.stage, s.seconds"
+            " FROM stages s JOIN generations g ON g.id = s.generation_id"
+            " JOIN runs r ON r.id = g.run_id "
+            f"{where} ORDER BY r.timestamp, s.generation_id, s.stage", params)]
+
+    def record_quality(self, rows: Iterable[Dict], metrics: Iterable[str]) -> int:
+        """
+        Store quality metrics of evaluated generations.
+
+        A metric recorded earlier for the same generation is replaced.
+
+        Args:
+            rows: Evaluated rows with generation_id, the metric columns and
+                optionally reference_hash and generated_hash
+            metrics: Metric columns to store
+
+        Returns:
+            Number of metric values stored
+        """
+        metrics = list(metrics)
+        computed_at = datetime.datetime.now().isoformat()
+        values = []
+        for row in rows:
+            if row.get('generation_id') is None:
+                continue
+            for metric in metrics:
+                value = row.get(metric)
+                # Missing values (None / NaN) are not recorded
+                if value is None or value != value:
+                    continue
+                values.append((
+                    int(row['generation_id']), metric, float(value),
+                    row.get('reference_hash'), row.get('generated_hash'), computed_at
+                ))
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO quality_metrics (generation_id, metric, value,"
+                " reference_hash, generated_hash, computed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                values)
+        return len(values)
@@ -0,0 +1,46 @@
+"""
+Text utilities for splitting and normalizing synthesis input.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+
+# Sentence boundary: whitespace after terminal punctuation, optionally
+# followed by a closing quote or bracket
+_SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+
+# Runs of whitespace (including newlines and tabs)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of non-empty, stripped sentences
+    """
+    sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(text.strip())]
+    return [s for s in sentences if s]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for use in cache keys.
+
+    Applies Unicode NFC normalization and collapses whitespace, which do not
+    change what is synthesized. Case and punctuation are kept since they
+    affect prosody.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Normalized text
+    """
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()